@@ -0,0 +1,122 @@
+"""
+Relationship Adjacency Index
+CSR (compressed sparse row) index over converted UCO relationships for
+O(degree) neighbor queries, plus dangling-reference detection
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class _CSRDirection:
+    """One direction (outgoing or incoming) of the adjacency index"""
+
+    __slots__ = ('offsets', 'types', 'rels', 'peers')
+
+    def __init__(self, node_count: int, keys: Sequence[int], types: Sequence[int],
+                 peers: Sequence[int]):
+        # Relationships ordered by (node, type) so each node owns a contiguous,
+        # type-sorted segment of the arrays
+        order = sorted(range(len(keys)), key=lambda r: (keys[r], types[r]))
+
+        counts = array('l', [0]) * (node_count + 1)
+        for r in order:
+            counts[keys[r] + 1] += 1
+        for i in range(node_count):
+            counts[i + 1] += counts[i]
+
+        self.offsets = counts
+        self.rels = array('l', order)
+        self.types = array('l', (types[r] for r in order))
+        self.peers = array('l', (peers[r] for r in order))
+
+    def segment(self, node: int, type_code: Optional[int]) -> range:
+        lo, hi = self.offsets[node], self.offsets[node + 1]
+        if type_code is not None:
+            lo, hi = bisect_left(self.types, type_code, lo, hi), bisect_right(self.types, type_code, lo, hi)
+        return range(lo, hi)
+
+
+@dataclass
+class DanglingReferenceReport:
+    """Relationships whose endpoints are missing from the converted graph or revoked/deprecated"""
+    missing: List[Dict[str, Any]] = field(default_factory=list)
+    revoked: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def missing_relationship_ids(self) -> set:
+        return {entry['relationship_id'] for entry in self.missing}
+
+    def summary(self) -> Dict[str, int]:
+        return {'missing_endpoints': len(self.missing), 'revoked_endpoints': len(self.revoked)}
+
+
+class AdjacencyIndex:
+    """
+    Adjacency over ``converted_relationships`` keyed by node and relationship type.
+
+    Node ids and relationship types are mapped to dense integer codes and the
+    relationships are laid out in CSR form for both directions, so listing a
+    node's neighbors (optionally of one relationship type) costs O(degree)
+    plus a binary search, instead of a scan of every relationship.
+    """
+
+    def __init__(self, node_ids: Sequence[str], relationships: Sequence[Any]):
+        self.relationships = relationships
+        self.relationship_count = len(relationships)
+        self.node_codes: Dict[str, int] = {node_id: i for i, node_id in enumerate(node_ids)}
+        self.node_ids: List[str] = list(node_ids)
+        self.type_codes: Dict[str, int] = {}
+
+        sources, targets, types = array('l'), array('l'), array('l')
+        for rel in relationships:
+            sources.append(self._node_code(rel.source_ref))
+            targets.append(self._node_code(rel.target_ref))
+            type_code = self.type_codes.get(rel.relationship_type)
+            if type_code is None:
+                type_code = self.type_codes[rel.relationship_type] = len(self.type_codes)
+            types.append(type_code)
+
+        # Endpoints that are not converted nodes still get a code so queries work
+        self.known_node_count = len(node_ids)
+        node_count = len(self.node_ids)
+        self.outgoing = _CSRDirection(node_count, sources, types, targets)
+        self.incoming = _CSRDirection(node_count, targets, types, sources)
+
+    def _node_code(self, node_id: str) -> int:
+        code = self.node_codes.get(node_id)
+        if code is None:
+            code = self.node_codes[node_id] = len(self.node_ids)
+            self.node_ids.append(node_id)
+        return code
+
+    def _segment(self, node_id: str, relationship_type: Optional[str], direction: str):
+        if direction not in ('out', 'in'):
+            raise ValueError(f"direction must be 'out' or 'in', not {direction!r}")
+        csr = self.outgoing if direction == 'out' else self.incoming
+        node = self.node_codes.get(node_id)
+        if node is None:
+            return csr, range(0)
+        type_code = None
+        if relationship_type is not None:
+            type_code = self.type_codes.get(relationship_type)
+            if type_code is None:
+                return csr, range(0)
+        return csr, csr.segment(node, type_code)
+
+    def neighbors(self, node_id: str, relationship_type: Optional[str] = None,
+                  direction: str = 'out') -> List[str]:
+        """Ids at the other end of node_id's relationships ('out': node is source, 'in': node is target)"""
+        csr, segment = self._segment(node_id, relationship_type, direction)
+        return [self.node_ids[csr.peers[i]] for i in segment]
+
+    def relationships_of(self, node_id: str, relationship_type: Optional[str] = None,
+                         direction: str = 'out') -> List[Any]:
+        csr, segment = self._segment(node_id, relationship_type, direction)
+        return [self.relationships[csr.rels[i]] for i in segment]
+
+    def degree(self, node_id: str, relationship_type: Optional[str] = None,
+               direction: str = 'out') -> int:
+        return len(self._segment(node_id, relationship_type, direction)[1])
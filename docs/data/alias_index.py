@@ -0,0 +1,55 @@
+"""
+Actor Alias Inverted Index
+Maps normalized actor names and aliases to actor positions, built once per
+dataset, for alias-overlap detection and alias lookups
+"""
+
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
+
+
+def normalize_alias(alias: str) -> str:
+    """Normalization used for all name/alias comparisons (matches the analyzer's .lower())"""
+    return alias.lower()
+
+
+class AliasIndex:
+    """
+    Inverted index over a list of actors (intrusion-sets, campaigns, ...).
+
+    ``by_alias`` maps a normalized alias to the ascending positions of actors
+    listing it under ``aliases``; ``by_name`` does the same for the actor's
+    own name. ``alias_sets[i]`` is actor i's normalized alias set, kept so
+    overlap checks reuse it instead of rebuilding it per comparison.
+    ``names`` may pass in already-normalized actor names.
+    """
+
+    def __init__(self, actors: Sequence[Dict[str, Any]], names: Optional[Sequence[str]] = None):
+        self.actors = actors
+        self.names: List[str] = []
+        self.alias_sets: List[FrozenSet[str]] = []
+        self.by_alias: Dict[str, List[int]] = {}
+        self.by_name: Dict[str, List[int]] = {}
+
+        for position, actor in enumerate(actors):
+            name = names[position] if names is not None else normalize_alias(actor.get('name', ''))
+            aliases = frozenset(normalize_alias(alias) for alias in actor.get('aliases', []))
+            self.names.append(name)
+            self.alias_sets.append(aliases)
+            self.by_name.setdefault(name, []).append(position)
+            for alias in aliases:
+                self.by_alias.setdefault(alias, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.actors)
+
+    def positions_with_alias(self, alias: str) -> List[int]:
+        return self.by_alias.get(normalize_alias(alias), [])
+
+    def positions_with_name(self, name: str) -> List[int]:
+        return self.by_name.get(normalize_alias(name), [])
+
+    def lookup(self, alias: str) -> List[Dict[str, Any]]:
+        """Actors whose name or any alias matches alias after normalization, in dataset order"""
+        key = normalize_alias(alias)
+        positions = set(self.by_alias.get(key, ())) | set(self.by_name.get(key, ()))
+        return [self.actors[position] for position in sorted(positions)]
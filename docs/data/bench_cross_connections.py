@@ -0,0 +1,80 @@
+"""
+Cross-Dataset Connection Scaling Benchmark
+Compares the indexed technique-name matcher in get_cross_dataset_connections
+against the original nested-loop substring test on synthetic technique sets
+"""
+
+import random
+import time
+from typing import List, Tuple
+
+from mitre_uco_mapping import MitreUCOConverter, UCONode
+from substring_index import find_substring_pairs
+
+VOCABULARY = [
+    'access', 'account', 'alarm', 'application', 'automated', 'block', 'brute', 'collection',
+    'command', 'control', 'credential', 'data', 'default', 'denial', 'device', 'discovery',
+    'execution', 'exfiltration', 'exploit', 'firmware', 'force', 'hardware', 'injection',
+    'interface', 'lateral', 'loss', 'manipulation', 'modify', 'monitor', 'network', 'parameter',
+    'point', 'process', 'program', 'protocol', 'remote', 'replication', 'rogue', 'safety',
+    'scripting', 'service', 'spearphishing', 'system', 'transfer', 'unauthorized', 'view',
+]
+
+
+def brute_force_pairs(left: List[str], right: List[str]) -> List[Tuple[int, int]]:
+    """Reference implementation: the original O(N x M) substring loop"""
+    pairs = []
+    for i, a in enumerate(left):
+        for j, b in enumerate(right):
+            if a and b and (a.lower() in b.lower() or b.lower() in a.lower()):
+                pairs.append((i, j))
+    return pairs
+
+
+def synthetic_names(count: int, rng: random.Random) -> List[str]:
+    return [' '.join(rng.choice(VOCABULARY).title() for _ in range(rng.randint(1, 4)))
+            for _ in range(count)]
+
+
+def build_converter(enterprise_names: List[str], ics_names: List[str]) -> MitreUCOConverter:
+    converter = MitreUCOConverter()
+    for dataset, names, prefix in (('enterprise', enterprise_names, 'T'), ('ics', ics_names, 'T0')):
+        for i, name in enumerate(names):
+            node_id = f'attack-pattern--{dataset}-{i}'
+            converter.converted_nodes[node_id] = UCONode(
+                id=node_id, uco_type='uco-action:Action', mitre_type='attack-pattern',
+                name=name, source_dataset=dataset, mitre_id=f'{prefix}{i:04d}'
+            )
+    return converter
+
+
+def run(scales=(1, 4, 16), base_enterprise: int = 600, base_ics: int = 80, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    print(f"{'scale':>5} {'enterprise':>10} {'ics':>6} {'pairs':>7} {'brute (s)':>10} {'indexed (s)':>12} {'speedup':>8}")
+
+    for scale in scales:
+        enterprise = synthetic_names(base_enterprise * scale, rng)
+        ics = synthetic_names(base_ics * scale, rng)
+        ent_lower = [name.lower() for name in enterprise]
+        ics_lower = [name.lower() for name in ics]
+
+        start = time.perf_counter()
+        expected = brute_force_pairs(enterprise, ics)
+        brute_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = find_substring_pairs(ent_lower, ics_lower)
+        indexed_time = time.perf_counter() - start
+
+        assert actual == expected, "indexed matcher diverged from brute force"
+        print(f"{scale:>5} {len(enterprise):>10} {len(ics):>6} {len(actual):>7} "
+              f"{brute_time:>10.3f} {indexed_time:>12.3f} {brute_time / indexed_time:>7.1f}x")
+
+    # End-to-end check through the converter API at the base scale
+    converter = build_converter(synthetic_names(base_enterprise, rng), synthetic_names(base_ics, rng))
+    connections = converter.get_cross_dataset_connections()
+    print(f"Converter produced {len(connections)} connections at scale 1")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,182 @@
+"""
+Converter and Analyzer Benchmark Suite
+Times MitreUCOConverter.process_dataset, get_cross_dataset_connections and
+CrossDatasetAnalyzer.analyze_cross_references on the bundled ICS release and on
+synthetic ATT&CK-shaped bundles, recording wall time and peak memory to a JSON
+baseline and flagging regressions against a previous baseline
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cross_dataset_analysis import CrossDatasetAnalyzer
+from mitre_uco_mapping import MitreUCOConverter
+from synthetic_bundles import write_bundle
+
+ICS_BUNDLE = 'ics-attack-17.1.json'
+ENTERPRISE_BUNDLE = 'enterprise-attack-17.1.json'
+
+# Metrics checked by --compare; median_seconds is informational
+COMPARED_METRICS = ('seconds', 'peak_mb')
+# Timed runs per metric unless --repeats says otherwise
+REPEATS = 5
+
+
+def _measure(fn: Callable[[], Any], with_memory: bool, repeats: int = REPEATS) -> Dict[str, float]:
+    """Run fn ``repeats`` times untraced for wall time, then once under tracemalloc for peak memory.
+
+    ``seconds`` is the best run, which filters out scheduler and cache noise
+    better than a single timing; ``median_seconds`` is reported alongside.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        timings = []
+        for _ in range(max(1, repeats)):
+            gc.collect()
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+
+        result = {'seconds': round(timings[0], 4), 'median_seconds': round(timings[len(timings) // 2], 4)}
+        if with_memory:
+            gc.collect()
+            tracemalloc.start()
+            fn()
+            result['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+            tracemalloc.stop()
+    return result
+
+
+def _convert(bundles: List[Tuple[str, str]]) -> MitreUCOConverter:
+    converter = MitreUCOConverter()
+    for path, name in bundles:
+        converter.process_dataset(path, name)
+    return converter
+
+
+def run_workload(label: str, enterprise_path: Optional[str], ics_path: str, run_analyzer: bool,
+                 with_memory: bool, repeats: int = REPEATS) -> Dict[str, Dict[str, float]]:
+    bundles = [(ics_path, 'ics')]
+    if enterprise_path:
+        bundles.insert(0, (enterprise_path, 'enterprise'))
+
+    results = {}
+    results[f'process_dataset@{label}'] = _measure(lambda: _convert(bundles), with_memory, repeats)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        converter = _convert(bundles)
+    results[f'get_cross_dataset_connections@{label}'] = _measure(
+        converter.get_cross_dataset_connections, with_memory, repeats)
+
+    if run_analyzer and enterprise_path:
+        variants = [('brute_force', {'candidate_strategy': 'brute_force'}),
+                    ('brute_force_pool', {'candidate_strategy': 'brute_force', 'workers': None}),
+                    ('lsh', {'candidate_strategy': 'lsh'}),
+                    ('tfidf', {'scoring': 'tfidf'}),
+                    ('embedding', {'scoring': 'embedding', 'vector_cache_dir': None})]
+        for variant, options in variants:
+            def analyze():
+                analyzer = CrossDatasetAnalyzer(**options)
+                analyzer.load_datasets(enterprise_path, ics_path)
+                analyzer.analyze_cross_references()
+            results[f'analyze_cross_references[{variant}]@{label}'] = _measure(analyze, with_memory, repeats)
+
+    for name, metrics in results.items():
+        print(f"  {name:<52} {metrics['seconds']:>9.3f}s"
+              + (f" {metrics['peak_mb']:>9.1f} MB" if 'peak_mb' in metrics else ''))
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline_path: str, tolerance: float,
+            min_delta: Optional[Dict[str, float]] = None) -> List[str]:
+    """Return descriptions of metrics that regressed by more than tolerance versus the baseline.
+
+    A metric must also grow by at least its ``min_delta`` (seconds or MB), so
+    jitter on millisecond-scale timings is not reported as a regression.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    min_delta = min_delta or {}
+
+    regressions = []
+    for name, metrics in results.items():
+        for metric in COMPARED_METRICS:
+            value = metrics.get(metric)
+            old = baseline.get(name, {}).get(metric)
+            if value is None or not old or value - old < min_delta.get(metric, 0.0):
+                continue
+            if value > old * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {old} -> {value} (+{value / old - 1:.0%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scales', type=int, nargs='*', default=[1, 10, 100],
+                        help='synthetic bundle scales to run')
+    parser.add_argument('--analyzer-max-scale', type=int, default=1,
+                        help='largest synthetic scale to run the pairwise analyzer on')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--output', default='bench_results.json', help='where to write results')
+    parser.add_argument('--compare', help='baseline JSON to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown / memory growth before a metric counts as a regression')
+    parser.add_argument('--repeats', type=int, default=REPEATS,
+                        help='timed runs per metric; the best one is recorded')
+    parser.add_argument('--min-seconds-delta', type=float, default=0.05,
+                        help='ignore slowdowns smaller than this many seconds')
+    parser.add_argument('--min-mb-delta', type=float, default=1.0,
+                        help='ignore memory growth smaller than this many MB')
+    args = parser.parse_args(argv)
+
+    with_memory = not args.no_memory
+    results: Dict[str, Dict[str, float]] = {}
+
+    print("Real bundles")
+    enterprise = ENTERPRISE_BUNDLE if os.path.exists(ENTERPRISE_BUNDLE) else None
+    results.update(run_workload('attack-17.1', enterprise, ICS_BUNDLE, True, with_memory, args.repeats))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            print(f"Synthetic bundles at {scale}x")
+            enterprise_path = write_bundle(os.path.join(tmp, f'enterprise-{scale}x.json'), 'enterprise', scale)
+            ics_path = write_bundle(os.path.join(tmp, f'ics-{scale}x.json'), 'ics', scale)
+            results.update(run_workload(f'synthetic-{scale}x', enterprise_path, ics_path,
+                                        scale <= args.analyzer_max_scale, with_memory, args.repeats))
+            os.remove(enterprise_path)
+            os.remove(ics_path)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'meta': {
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'repeats': args.repeats,
+            },
+            'results': results,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance,
+                              {'seconds': args.min_seconds_delta, 'peak_mb': args.min_mb_delta})
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Converter Memory Report
+Measures memory retained by MitreUCOConverter output with the legacy plain-dict
+representation versus the compact interned representation
+"""
+
+import gc
+import sys
+import tracemalloc
+from typing import Dict
+
+from mitre_uco_mapping import MitreUCOConverter
+
+DEFAULT_BUNDLES = {
+    'enterprise': 'enterprise-attack-17.1.json',
+    'ics': 'ics-attack-17.1.json',
+}
+
+
+def measure_retained_memory(dataset_path: str, dataset_name: str, compact: bool) -> Dict[str, float]:
+    """Convert one bundle and return the bytes still held by the converter afterwards"""
+    gc.collect()
+    tracemalloc.start()
+    converter = MitreUCOConverter(compact=compact)
+    converter.process_dataset(dataset_path, dataset_name)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'nodes': len(converter.converted_nodes),
+        'relationships': len(converter.converted_relationships),
+        'retained_mb': retained / 1e6,
+        'peak_mb': peak / 1e6,
+    }
+
+
+def main(bundles: Dict[str, str]) -> None:
+    results = {}
+    for dataset_name, dataset_path in bundles.items():
+        try:
+            legacy = measure_retained_memory(dataset_path, dataset_name, compact=False)
+            compact = measure_retained_memory(dataset_path, dataset_name, compact=True)
+        except FileNotFoundError:
+            print(f"Skipping {dataset_name}: {dataset_path} not found")
+            continue
+        results[dataset_name] = (legacy, compact)
+
+    print("\nRetained converter memory (MB)")
+    print(f"{'dataset':<12} {'objects':>8} {'legacy':>10} {'compact':>10} {'reduction':>10}")
+    for dataset_name, (legacy, compact) in results.items():
+        objects = legacy['nodes'] + legacy['relationships']
+        reduction = 1 - compact['retained_mb'] / legacy['retained_mb']
+        print(f"{dataset_name:<12} {objects:>8} {legacy['retained_mb']:>10.2f} "
+              f"{compact['retained_mb']:>10.2f} {reduction:>9.1%}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Usage: python converter_memory_report.py name=path [name=path ...]
+        main(dict(arg.split('=', 1) for arg in sys.argv[1:]))
+    else:
+        main(DEFAULT_BUNDLES)
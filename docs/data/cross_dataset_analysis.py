@@ -3,12 +3,148 @@ Cross-Dataset Analysis and Relationship Mapping
 Advanced interconnection analysis between Enterprise and ICS MITRE ATT&CK datasets
 """
 
+import hashlib
+import heapq
+import itertools
 import json
-from typing import Dict, List, Set, Tuple, Any
+import os
+import time
+from typing import Callable, Dict, List, Set, Tuple, Any, Iterable, Iterator, Optional, TextIO
 from dataclasses import dataclass
 from difflib import SequenceMatcher
 import re
 
+from alias_index import AliasIndex
+from dataset_index import DatasetIndex
+from embedding_similarity import (HashedNgramEmbedder, VectorCache, center_vectors, encode_cached,
+                                  weighted_dense_cosine_topk)
+from minhash_lsh import MinHashLSH
+from report_writer import REPORT_TITLE, iter_markdown_sections, write_report
+from snapshot_cache import file_digest, load_snapshot, save_snapshot, source_digest
+from tfidf_similarity import TfidfVectorizer, char_ngrams, weighted_cosine_topk, word_tokens
+
+# Name/description weighting for combined technique similarity, shared by all scoring backends
+NAME_WEIGHT = 0.6
+DESCRIPTION_WEIGHT = 0.4
+TECHNIQUE_SIMILARITY_THRESHOLD = 0.7
+TOP_TECHNIQUE_SIMILARITIES = 50
+
+# Bump whenever the pair cache file layout changes; code and constant changes
+# are picked up by _pair_key through the module sources and scoring constants
+ANALYSIS_CACHE_VERSION = 1
+
+# Modules whose code decides a pair's CrossReferenceAnalysis
+ANALYSIS_MODULES = ('cross_dataset_analysis', 'dataset_index', 'alias_index', 'tfidf_similarity',
+                    'minhash_lsh', 'embedding_similarity')
+
+# (stix id, mitre id, name, lowercased name, lowercased description) per technique
+TechniqueFields = Tuple[str, Optional[str], str, str, str]
+
+
+class BoundedTopK:
+    """
+    Collects the ``limit`` highest-scoring results in a min-heap of that size.
+    
+    Ties keep insertion order, so ``items()`` equals a stable descending sort
+    of everything pushed followed by ``[:limit]``, without ever holding more
+    than ``limit`` results. ``limit=None`` keeps every result.
+    """
+    
+    def __init__(self, limit: Optional[int], key: Callable[[Dict[str, Any]], float] = lambda r: r['similarity_score']):
+        self.limit = limit
+        self.key = key
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._pushed = 0
+    
+    def push(self, result: Dict[str, Any]) -> None:
+        # Earlier results rank higher among equal scores; sequence numbers are
+        # unique, so the result dicts themselves are never compared
+        entry = (self.key(result), -self._pushed, result)
+        self._pushed += 1
+        if self.limit is None or len(self._heap) < self.limit:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+    
+    def extend(self, results: Iterable[Dict[str, Any]]) -> None:
+        for result in results:
+            self.push(result)
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def items(self) -> List[Dict[str, Any]]:
+        """Collected results, best first"""
+        return [result for _, _, result in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+def _score_field_pairs(ent_fields: List[TechniqueFields], ics_fields: List[TechniqueFields],
+                       pairs: Iterable[Tuple[int, int]], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Exact SequenceMatcher scoring of (enterprise index, ICS index) pairs; returns the
+    top_k matches above threshold (all of them if top_k is None), best first"""
+    similarities = BoundedTopK(top_k)
+    
+    for i, j in pairs:
+        ent_id, ent_mitre_id, ent_name, ent_name_lower, ent_desc_lower = ent_fields[i]
+        ics_id, ics_mitre_id, ics_name, ics_name_lower, ics_desc_lower = ics_fields[j]
+        
+        # Skip if already exact matches
+        if ent_mitre_id == ics_mitre_id:
+            continue
+        
+        name_similarity = SequenceMatcher(None, ent_name_lower, ics_name_lower).ratio()
+        
+        # quick_ratio() bounds ratio() from above, so pairs that cannot clear the
+        # threshold even with that bound skip the expensive description match
+        desc_matcher = SequenceMatcher(None, ent_desc_lower, ics_desc_lower)
+        name_part = name_similarity * NAME_WEIGHT
+        if (name_part + desc_matcher.real_quick_ratio() * DESCRIPTION_WEIGHT <= TECHNIQUE_SIMILARITY_THRESHOLD
+                or name_part + desc_matcher.quick_ratio() * DESCRIPTION_WEIGHT <= TECHNIQUE_SIMILARITY_THRESHOLD):
+            continue
+        desc_similarity = desc_matcher.ratio()
+        
+        # Combined similarity with weighting
+        combined_similarity = name_part + (desc_similarity * DESCRIPTION_WEIGHT)
+        
+        # Only include high-confidence similarities
+        if combined_similarity > TECHNIQUE_SIMILARITY_THRESHOLD:
+            similarities.push({
+                'enterprise_technique': {
+                    'id': ent_id,
+                    'mitre_id': ent_mitre_id,
+                    'name': ent_name
+                },
+                'ics_technique': {
+                    'id': ics_id,
+                    'mitre_id': ics_mitre_id,
+                    'name': ics_name
+                },
+                'similarity_score': round(combined_similarity, 3),
+                'name_similarity': round(name_similarity, 3),
+                'description_similarity': round(desc_similarity, 3),
+                'match_type': 'semantic_similarity'
+            })
+    
+    return similarities.items()
+
+
+# ICS technique fields, sent once to each scoring worker by the pool initializer
+_worker_ics_fields: List[TechniqueFields] = []
+
+
+def _init_scoring_worker(ics_fields: List[TechniqueFields]) -> None:
+    global _worker_ics_fields
+    _worker_ics_fields = ics_fields
+
+
+def _score_chunk(job: Tuple[List[TechniqueFields], Optional[List[Tuple[int, int]]], int]) -> List[Dict[str, Any]]:
+    """Score one chunk of enterprise techniques against every ICS technique (or the
+    given chunk-local pairs) and return only the chunk's top_k matches"""
+    ent_chunk, pairs, top_k = job
+    if pairs is None:
+        pairs = ((i, j) for i in range(len(ent_chunk)) for j in range(len(_worker_ics_fields)))
+    return _score_field_pairs(ent_chunk, _worker_ics_fields, pairs, top_k)
+
 @dataclass
 class CrossReferenceAnalysis:
     """Results of cross-dataset analysis"""
@@ -21,12 +157,75 @@ class CrossReferenceAnalysis:
     tactic_mappings: List[Dict[str, Any]]
 
 class CrossDatasetAnalyzer:
-    """Analyzes relationships and overlaps between Enterprise and ICS datasets"""
+    """Analyzes relationships and overlaps between Enterprise and ICS datasets
+
+    ``candidate_strategy`` controls which technique pairs reach exact
+    SequenceMatcher scoring: ``'brute_force'`` scores every enterprise x ICS
+    pair, ``'lsh'`` only pairs whose names collide in a MinHash LSH index over
+    character shingles. ``lsh_threshold`` is the approximate name Jaccard
+    similarity at which pairs start becoming candidates; lower it for higher
+    recall. ``report_lsh_recall`` measures recall against brute force.
+    
+    ``scoring`` selects the similarity backend for techniques and tactics:
+    ``'sequence_matcher'`` (difflib ratios over candidate pairs),
+    ``'tfidf'`` (sparse TF-IDF cosine over all pairs) or ``'embedding'``
+    (cosine between ``embedder`` vectors; an offline hashed n-gram embedder
+    by default, or e.g. a SentenceTransformerEmbedder). The vector backends
+    keep the best ``tfidf_top_k`` ICS matches per enterprise technique.
+    Embeddings are computed ``embedding_batch_size`` texts at a time and
+    cached in ``vector_cache_dir`` by model name and text hash, so a rerun
+    on an unchanged release only reads the cache. Vectors are mean-centered
+    per comparison (``center_embeddings``) so shared boilerplate does not
+    dominate cosine scores.
+    
+    ``workers`` > 1 runs exact SequenceMatcher scoring in a process pool:
+    enterprise techniques are split into chunks, the ICS side is sent to each
+    worker once, and each chunk returns only its local top matches before
+    the final merge. ``workers=None`` uses every CPU. Results are identical
+    to the serial path.
     
-    def __init__(self):
+    Beyond the enterprise/ICS pair of ``load_datasets``, any number of
+    matrices can be registered with ``add_dataset`` and compared pairwise
+    with ``analyze_all_pairs``. Pair results are cached on disk keyed by
+    both bundles' content hashes and the analyzer settings, so only pairs
+    involving a changed bundle are recomputed.
+    """
+    
+    def __init__(self, candidate_strategy: str = 'brute_force', lsh_threshold: float = 0.3,
+                 lsh_num_perm: int = 64, scoring: str = 'sequence_matcher', tfidf_top_k: int = 10,
+                 workers: Optional[int] = 1, embedder: Any = None,
+                 vector_cache_dir: Optional[str] = 'vector_cache', embedding_batch_size: int = 64,
+                 center_embeddings: bool = True):
+        if candidate_strategy not in ('brute_force', 'lsh'):
+            raise ValueError(f"Unknown candidate strategy: {candidate_strategy}")
+        if scoring not in ('sequence_matcher', 'tfidf', 'embedding'):
+            raise ValueError(f"Unknown scoring backend: {scoring}")
+        self.scoring = scoring
+        self.tfidf_top_k = tfidf_top_k
+        self.embedder = embedder or HashedNgramEmbedder()
+        self.vector_cache_dir = vector_cache_dir
+        self.embedding_batch_size = embedding_batch_size
+        self.center_embeddings = center_embeddings
+        self.embedding_stats = {'texts': 0, 'encoded': 0}
+        self._vector_cache: Optional[VectorCache] = None
         self.enterprise_data = None
         self.ics_data = None
         self.analysis_results = None
+        self.candidate_strategy = candidate_strategy
+        self.lsh_threshold = lsh_threshold
+        self.lsh_num_perm = lsh_num_perm
+        self.workers = workers or os.cpu_count() or 1
+        self.enterprise_index: Optional[DatasetIndex] = None
+        self.ics_index: Optional[DatasetIndex] = None
+        
+        # N-way registry: dataset name -> bundle path / content hash / lazily built index
+        self.dataset_paths: Dict[str, str] = {}
+        self.dataset_hashes: Dict[str, str] = {}
+        self._dataset_indexes: Dict[str, DatasetIndex] = {}
+        self.pair_results: Dict[Tuple[str, str], CrossReferenceAnalysis] = {}
+        self._pair_keys: Dict[Tuple[str, str], str] = {}
+        # Digest of ANALYSIS_MODULES sources, computed on first use
+        self._code_digest: Optional[str] = None
     
     def load_datasets(self, enterprise_path: str, ics_path: str) -> None:
         """Load both datasets for analysis"""
@@ -36,15 +235,106 @@ class CrossDatasetAnalyzer:
         with open(ics_path) as f:
             self.ics_data = json.load(f)
         
+        # Built once per load and shared by every analysis
+        self.enterprise_index = DatasetIndex(self.enterprise_data)
+        self.ics_index = DatasetIndex(self.ics_data)
+        self.add_dataset('enterprise', enterprise_path, self.enterprise_index)
+        self.add_dataset('ics', ics_path, self.ics_index)
+        
         print(f"Loaded Enterprise: {len(self.enterprise_data['objects'])} objects")
         print(f"Loaded ICS: {len(self.ics_data['objects'])} objects")
     
+    def add_dataset(self, name: str, path: str, index: Optional[DatasetIndex] = None) -> None:
+        """Register a bundle for N-way analysis; it is only parsed if one of its pairs must be recomputed"""
+        self.dataset_paths[name] = path
+        self.dataset_hashes[name] = file_digest(path)
+        if index is not None:
+            self._dataset_indexes[name] = index
+        else:
+            self._dataset_indexes.pop(name, None)
+    
+    def _dataset_index(self, name: str) -> DatasetIndex:
+        index = self._dataset_indexes.get(name)
+        if index is None:
+            with open(self.dataset_paths[name]) as f:
+                index = self._dataset_indexes[name] = DatasetIndex(json.load(f))
+            print(f"Loaded {name}: {len(index.objects)} objects")
+        return index
+    
+    def _pair_key(self, left: str, right: str) -> str:
+        """Cache key over both bundles' contents and every setting that affects the results"""
+        if self._code_digest is None:
+            self._code_digest = source_digest(ANALYSIS_MODULES)
+        settings = (f'{ANALYSIS_CACHE_VERSION}|{self._code_digest}|{NAME_WEIGHT}|{DESCRIPTION_WEIGHT}|'
+                    f'{TECHNIQUE_SIMILARITY_THRESHOLD}|{TOP_TECHNIQUE_SIMILARITIES}|'
+                    f'{self.scoring}|{self.candidate_strategy}|'
+                    f'{self.lsh_threshold}|{self.lsh_num_perm}|{self.tfidf_top_k}')
+        if self.scoring == 'embedding':
+            settings += f'|{self.embedder.name}|{self.center_embeddings}'
+        material = f'{settings}|{self.dataset_hashes[left]}|{self.dataset_hashes[right]}'
+        return hashlib.sha256(material.encode()).hexdigest()
+    
+    def iter_pair_analyses(self, cache_dir: Optional[str] = 'analysis_cache',
+                           keep: bool = True) -> Iterator[Tuple[str, str, CrossReferenceAnalysis]]:
+        """
+        Yield ``(left, right, analysis)`` for every pair of registered datasets,
+        in registration order.
+        
+        For a pair ``(left, right)`` the ``enterprise_*`` fields of the result
+        describe ``left`` and the ``ics_*`` fields ``right``. A pair is reused
+        from memory or ``cache_dir`` when neither bundle's content, the
+        analyzer settings, the scoring constants nor the source of
+        ANALYSIS_MODULES changed since it was computed; pass
+        ``cache_dir=None`` to skip the disk cache. With ``keep=False`` results
+        are not retained in ``pair_results``, so a consumer that streams them
+        out holds one pair's analysis at a time.
+        """
+        total = recomputed = 0
+        
+        for left, right in itertools.combinations(self.dataset_paths, 2):
+            key = self._pair_key(left, right)
+            path = os.path.join(cache_dir, f'pair-{left}--{right}.snap') if cache_dir else None
+            total += 1
+            
+            cached = self.pair_results.get((left, right))
+            if cached is not None and self._pair_keys.get((left, right)) == key:
+                yield left, right, cached
+                continue
+            
+            payload = load_snapshot(path, key) if path else None
+            if payload is not None:
+                analysis = payload['analysis']
+            else:
+                analysis = self.analyze_pair(self._dataset_index(left), self._dataset_index(right))
+                recomputed += 1
+                if path:
+                    save_snapshot(path, key, {'left': left, 'right': right, 'analysis': analysis})
+            
+            if keep:
+                self.pair_results[left, right] = analysis
+                self._pair_keys[left, right] = key
+            yield left, right, analysis
+        
+        print(f"Analyzed {total} dataset pairs: {recomputed} recomputed, {total - recomputed} reused")
+    
+    def analyze_all_pairs(self, cache_dir: Optional[str] = 'analysis_cache'
+                          ) -> Dict[Tuple[str, str], CrossReferenceAnalysis]:
+        """Analyze every pair of registered datasets; see iter_pair_analyses"""
+        return {(left, right): analysis for left, right, analysis in self.iter_pair_analyses(cache_dir)}
+    
+    def write_pairwise_report(self, out: TextIO, fmt: str = 'markdown',
+                              cache_dir: Optional[str] = 'analysis_cache') -> int:
+        """Stream a Markdown or JSON Lines report over every dataset pair to a text stream,
+        analyzing pairs as they are written; returns the number of lines written"""
+        return write_report(self.iter_pair_analyses(cache_dir, keep=False), out, fmt)
+    
     def analyze_cross_references(self) -> CrossReferenceAnalysis:
         """Perform comprehensive cross-dataset analysis"""
-        
-        # Extract objects by type from both datasets
-        enterprise_objects = self._extract_objects_by_type(self.enterprise_data)
-        ics_objects = self._extract_objects_by_type(self.ics_data)
+        self.analysis_results = self.analyze_pair(self.enterprise_index, self.ics_index)
+        return self.analysis_results
+    
+    def analyze_pair(self, enterprise_objects: DatasetIndex, ics_objects: DatasetIndex) -> CrossReferenceAnalysis:
+        """Cross-reference analysis of one dataset pair"""
         
         # Find exact matches and similarities
         shared_techniques = self._find_shared_techniques(enterprise_objects, ics_objects)
@@ -59,7 +349,7 @@ class CrossDatasetAnalyzer:
         platform_intersections = self._analyze_platform_intersections(enterprise_objects, ics_objects)
         tactic_mappings = self._map_tactics_across_datasets(enterprise_objects, ics_objects)
         
-        self.analysis_results = CrossReferenceAnalysis(
+        return CrossReferenceAnalysis(
             shared_techniques=shared_techniques,
             shared_actors=shared_actors,
             shared_malware=shared_malware,
@@ -68,27 +358,13 @@ class CrossDatasetAnalyzer:
             platform_intersections=platform_intersections,
             tactic_mappings=tactic_mappings
         )
-        
-        return self.analysis_results
     
-    def _extract_objects_by_type(self, dataset: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
-        """Extract and organize objects by type"""
-        objects_by_type = {}
-        
-        for obj in dataset['objects']:
-            obj_type = obj['type']
-            if obj_type not in objects_by_type:
-                objects_by_type[obj_type] = []
-            objects_by_type[obj_type].append(obj)
-        
-        return objects_by_type
-    
-    def _find_shared_techniques(self, enterprise_objs: Dict, ics_objs: Dict) -> List[Dict[str, Any]]:
+    def _find_shared_techniques(self, enterprise: DatasetIndex, ics: DatasetIndex) -> List[Dict[str, Any]]:
         """Find techniques that appear in both datasets"""
         shared = []
         
-        enterprise_techniques = {self._get_mitre_id(t): t for t in enterprise_objs.get('attack-pattern', [])}
-        ics_techniques = {self._get_mitre_id(t): t for t in ics_objs.get('attack-pattern', [])}
+        enterprise_techniques = enterprise.by_mitre_id.get('attack-pattern', {})
+        ics_techniques = ics.by_mitre_id.get('attack-pattern', {})
         
         # Find exact MITRE ID matches
         common_ids = set(enterprise_techniques.keys()) & set(ics_techniques.keys())
@@ -115,16 +391,13 @@ class CrossDatasetAnalyzer:
         
         return shared
     
-    def _find_shared_actors(self, enterprise_objs: Dict, ics_objs: Dict) -> List[Dict[str, Any]]:
+    def _find_shared_actors(self, enterprise: DatasetIndex, ics: DatasetIndex) -> List[Dict[str, Any]]:
         """Find threat actors that appear in both datasets"""
         shared = []
         
-        enterprise_actors = enterprise_objs.get('intrusion-set', [])
-        ics_actors = ics_objs.get('intrusion-set', [])
-        
-        # Create name-based mappings
-        ent_by_name = {actor.get('name', '').lower(): actor for actor in enterprise_actors}
-        ics_by_name = {actor.get('name', '').lower(): actor for actor in ics_actors}
+        # Name-based mappings
+        ent_by_name = enterprise.by_name.get('intrusion-set', {})
+        ics_by_name = ics.by_name.get('intrusion-set', {})
         
         # Find exact name matches
         common_names = set(ent_by_name.keys()) & set(ics_by_name.keys())
@@ -138,33 +411,30 @@ class CrossDatasetAnalyzer:
                 'name': name.title(),
                 'enterprise_actor': {
                     'id': ent_actor['id'],
-                    'mitre_id': self._get_mitre_id(ent_actor),
+                    'mitre_id': enterprise.mitre_id(ent_actor),
                     'aliases': ent_actor.get('aliases', [])
                 },
                 'ics_actor': {
                     'id': ics_actor['id'],
-                    'mitre_id': self._get_mitre_id(ics_actor),
+                    'mitre_id': ics.mitre_id(ics_actor),
                     'aliases': ics_actor.get('aliases', [])
                 },
                 'match_type': 'exact_name'
             })
         
         # Find alias-based matches
-        alias_matches = self._find_actor_alias_matches(enterprise_actors, ics_actors)
+        alias_matches = self._find_actor_alias_matches(enterprise, ics)
         shared.extend(alias_matches)
         
         return shared
     
-    def _find_shared_malware(self, enterprise_objs: Dict, ics_objs: Dict) -> List[Dict[str, Any]]:
+    def _find_shared_malware(self, enterprise: DatasetIndex, ics: DatasetIndex) -> List[Dict[str, Any]]:
         """Find malware that appears in both datasets"""
         shared = []
         
-        enterprise_malware = enterprise_objs.get('malware', [])
-        ics_malware = ics_objs.get('malware', [])
-        
-        # Create name-based mappings
-        ent_by_name = {mal.get('name', '').lower(): mal for mal in enterprise_malware}
-        ics_by_name = {mal.get('name', '').lower(): mal for mal in ics_malware}
+        # Name-based mappings
+        ent_by_name = enterprise.by_name.get('malware', {})
+        ics_by_name = ics.by_name.get('malware', {})
         
         # Find exact name matches
         common_names = set(ent_by_name.keys()) & set(ics_by_name.keys())
@@ -178,13 +448,13 @@ class CrossDatasetAnalyzer:
                 'name': name.title(),
                 'enterprise_malware': {
                     'id': ent_mal['id'],
-                    'mitre_id': self._get_mitre_id(ent_mal),
+                    'mitre_id': enterprise.mitre_id(ent_mal),
                     'is_family': ent_mal.get('is_family', False),
                     'platforms': ent_mal.get('x_mitre_platforms', [])
                 },
                 'ics_malware': {
                     'id': ics_mal['id'],
-                    'mitre_id': self._get_mitre_id(ics_mal),
+                    'mitre_id': ics.mitre_id(ics_mal),
                     'is_family': ics_mal.get('is_family', False),
                     'platforms': ics_mal.get('x_mitre_platforms', [])
                 },
@@ -193,114 +463,262 @@ class CrossDatasetAnalyzer:
         
         return shared
     
-    def _find_technique_similarities(self, enterprise_objs: Dict, ics_objs: Dict) -> List[Dict[str, Any]]:
+    def _find_technique_similarities(self, enterprise: DatasetIndex, ics: DatasetIndex) -> List[Dict[str, Any]]:
         """Find techniques with similar descriptions or names"""
-        similarities = []
-        
-        enterprise_techniques = enterprise_objs.get('attack-pattern', [])
-        ics_techniques = ics_objs.get('attack-pattern', [])
-        
-        # Compare all combinations for similarity
-        for ent_tech in enterprise_techniques:
-            ent_name = ent_tech.get('name', '')
-            ent_desc = ent_tech.get('description', '')
-            ent_mitre_id = self._get_mitre_id(ent_tech)
-            
-            for ics_tech in ics_techniques:
-                ics_name = ics_tech.get('name', '')
-                ics_desc = ics_tech.get('description', '')
-                ics_mitre_id = self._get_mitre_id(ics_tech)
-                
-                # Skip if already exact matches
-                if ent_mitre_id == ics_mitre_id:
-                    continue
-                
-                # Calculate similarity scores
-                name_similarity = SequenceMatcher(None, ent_name.lower(), ics_name.lower()).ratio()
-                desc_similarity = SequenceMatcher(None, ent_desc.lower(), ics_desc.lower()).ratio()
-                
-                # Combined similarity with weighting
-                combined_similarity = (name_similarity * 0.6) + (desc_similarity * 0.4)
-                
-                # Only include high-confidence similarities
-                if combined_similarity > 0.7:
-                    similarities.append({
-                        'enterprise_technique': {
-                            'id': ent_tech['id'],
-                            'mitre_id': ent_mitre_id,
-                            'name': ent_name
-                        },
-                        'ics_technique': {
-                            'id': ics_tech['id'],
-                            'mitre_id': ics_mitre_id,
-                            'name': ics_name
-                        },
-                        'similarity_score': round(combined_similarity, 3),
-                        'name_similarity': round(name_similarity, 3),
-                        'description_similarity': round(desc_similarity, 3),
-                        'match_type': 'semantic_similarity'
-                    })
-        
-        # Sort by similarity score
-        similarities.sort(key=lambda x: x['similarity_score'], reverse=True)
+        enterprise_techniques = enterprise.of_type('attack-pattern')
+        ics_techniques = ics.of_type('attack-pattern')
+        
+        # Each backend returns only the top 50 most similar, best first
+        if self.scoring in ('tfidf', 'embedding'):
+            return self._score_techniques_vectors(enterprise, ics, TOP_TECHNIQUE_SIMILARITIES)
+        if self.workers > 1:
+            return self._score_technique_pairs_parallel(enterprise, ics, TOP_TECHNIQUE_SIMILARITIES)
+        candidates = self._technique_candidate_pairs(enterprise_techniques, ics_techniques, self.candidate_strategy)
+        return self._score_technique_pairs(enterprise, ics, candidates, TOP_TECHNIQUE_SIMILARITIES)
+    
+    def _technique_candidate_pairs(self, enterprise_techniques: List, ics_techniques: List,
+                                   strategy: str) -> Iterable[Tuple[int, int]]:
+        """Yield (enterprise index, ICS index) pairs to score, in row-major order"""
+        if strategy == 'brute_force':
+            for i in range(len(enterprise_techniques)):
+                for j in range(len(ics_techniques)):
+                    yield i, j
+            return
+        
+        lsh = MinHashLSH(threshold=self.lsh_threshold, num_perm=self.lsh_num_perm)
+        lsh.index([tech.get('name', '') for tech in ics_techniques])
+        for i, ent_tech in enumerate(enterprise_techniques):
+            for j in lsh.query(ent_tech.get('name', '')):
+                yield i, j
+    
+    def _technique_fields(self, index: DatasetIndex) -> List[TechniqueFields]:
+        return [(t['id'], index.mitre_id(t), t.get('name', ''), index.name(t), index.description(t))
+                for t in index.of_type('attack-pattern')]
+    
+    def _score_technique_pairs(self, enterprise: DatasetIndex, ics: DatasetIndex,
+                               pairs: Iterable[Tuple[int, int]], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Exact SequenceMatcher scoring of candidate pairs; returns the top_k matches above
+        threshold, or every one of them if top_k is None"""
+        return _score_field_pairs(self._technique_fields(enterprise), self._technique_fields(ics), pairs, top_k)
+    
+    def _score_technique_pairs_parallel(self, enterprise: DatasetIndex, ics: DatasetIndex,
+                                        top_k: int) -> List[Dict[str, Any]]:
+        """Chunked process-pool variant of _score_technique_pairs keeping each chunk's top matches"""
+        from concurrent.futures import ProcessPoolExecutor
+        
+        enterprise_techniques = enterprise.of_type('attack-pattern')
+        ics_techniques = ics.of_type('attack-pattern')
+        ent_fields = self._technique_fields(enterprise)
+        ics_fields = self._technique_fields(ics)
+        
+        # A few chunks per worker evens out chunks with many near-threshold pairs
+        chunk_size = max(1, -(-len(ent_fields) // (self.workers * 4)))
+        bounds = [(lo, min(lo + chunk_size, len(ent_fields))) for lo in range(0, len(ent_fields), chunk_size)]
+        
+        chunk_pairs: List[Optional[List[Tuple[int, int]]]] = [None] * len(bounds)
+        if self.candidate_strategy != 'brute_force':
+            chunk_pairs = [[] for _ in bounds]
+            for i, j in self._technique_candidate_pairs(enterprise_techniques, ics_techniques,
+                                                        self.candidate_strategy):
+                chunk = i // chunk_size
+                chunk_pairs[chunk].append((i - bounds[chunk][0], j))
+        
+        jobs = [(ent_fields[lo:hi], pairs, top_k) for (lo, hi), pairs in zip(bounds, chunk_pairs)]
+        
+        similarities = BoundedTopK(top_k)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_scoring_worker,
+                                 initargs=(ics_fields,)) as pool:
+            # map() yields chunks in enterprise order, so ties break exactly
+            # as they do for the serial pair order
+            for chunk in pool.map(_score_chunk, jobs):
+                similarities.extend(chunk)
+        
+        return similarities.items()
+    
+    def _embed(self, texts: List[str]) -> List[Any]:
+        """Embedder vectors for texts, through the on-disk vector cache"""
+        if self._vector_cache is None and self.vector_cache_dir:
+            self._vector_cache = VectorCache(self.vector_cache_dir, self.embedder.name)
+        vectors, encoded = encode_cached(self.embedder, texts, self._vector_cache, self.embedding_batch_size)
+        self.embedding_stats['texts'] += len(texts)
+        self.embedding_stats['encoded'] += encoded
+        return vectors
+    
+    def _pairwise_cosine_topk(self, fields: List[Tuple[float, List[str], List[str], Callable[[str], List[str]]]],
+                              top_k: int, threshold: float,
+                              exclude: Callable[[int, int], bool]) -> List[List[Tuple[float, int, List[float]]]]:
+        """
+        Weighted cosine top-k between left and right texts with the configured
+        vector backend. ``fields`` holds ``(weight, left_texts, right_texts,
+        tfidf_tokenizer)``; the tokenizer is only used by the TF-IDF backend.
+        """
+        vector_fields = []
+        for weight, left, right, tokenizer in fields:
+            if self.scoring == 'tfidf':
+                # IDF is fitted over both datasets so the vectors share one term space
+                vectorizer = TfidfVectorizer(tokenizer).fit(left + right)
+                vector_fields.append((weight, vectorizer.transform(left), vectorizer.transform(right)))
+            else:
+                vectors = self._embed(left + right)
+                if self.center_embeddings:
+                    vectors = center_vectors(vectors)
+                vector_fields.append((weight, vectors[:len(left)], vectors[len(left):]))
+        
+        topk = weighted_cosine_topk if self.scoring == 'tfidf' else weighted_dense_cosine_topk
+        return topk(vector_fields, top_k=top_k, threshold=threshold, exclude=exclude)
+    
+    def _score_techniques_vectors(self, enterprise: DatasetIndex, ics: DatasetIndex,
+                                  top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """TF-IDF or embedding cosine scoring of all technique pairs"""
+        similarities = BoundedTopK(top_k)
+        
+        enterprise_techniques = enterprise.of_type('attack-pattern')
+        ics_techniques = ics.of_type('attack-pattern')
+        ent_names = [t.get('name', '') for t in enterprise_techniques]
+        ics_names = [t.get('name', '') for t in ics_techniques]
+        ent_descs = [t.get('description', '') for t in enterprise_techniques]
+        ics_descs = [t.get('description', '') for t in ics_techniques]
+        ent_ids = [enterprise.mitre_id(t) for t in enterprise_techniques]
+        ics_ids = [ics.mitre_id(t) for t in ics_techniques]
+        
+        top_matches = self._pairwise_cosine_topk(
+            [(NAME_WEIGHT, ent_names, ics_names, char_ngrams),
+             (DESCRIPTION_WEIGHT, ent_descs, ics_descs, word_tokens)],
+            top_k=self.tfidf_top_k,
+            threshold=TECHNIQUE_SIMILARITY_THRESHOLD,
+            exclude=lambda i, j: ent_ids[i] == ics_ids[j]
+        )
         
-        return similarities[:50]  # Top 50 most similar
+        for i, row in enumerate(top_matches):
+            for score, j, (name_similarity, desc_similarity) in row:
+                similarities.push({
+                    'enterprise_technique': {
+                        'id': enterprise_techniques[i]['id'],
+                        'mitre_id': ent_ids[i],
+                        'name': ent_names[i]
+                    },
+                    'ics_technique': {
+                        'id': ics_techniques[j]['id'],
+                        'mitre_id': ics_ids[j],
+                        'name': ics_names[j]
+                    },
+                    'similarity_score': round(score, 3),
+                    'name_similarity': round(name_similarity, 3),
+                    'description_similarity': round(desc_similarity, 3),
+                    'match_type': 'semantic_similarity'
+                })
+        
+        return similarities.items()
+    
+    def report_lsh_recall(self) -> Dict[str, Any]:
+        """Compare LSH candidate generation against the brute-force baseline on the loaded datasets"""
+        if not self.enterprise_data or not self.ics_data:
+            raise ValueError("Must call load_datasets() first")
+        
+        enterprise_techniques = self.enterprise_index.of_type('attack-pattern')
+        ics_techniques = self.ics_index.of_type('attack-pattern')
+        
+        def run(strategy: str) -> Tuple[List[Dict[str, Any]], int, float]:
+            start = time.perf_counter()
+            pairs = list(self._technique_candidate_pairs(enterprise_techniques, ics_techniques, strategy))
+            matches = self._score_technique_pairs(self.enterprise_index, self.ics_index, pairs)
+            return matches, len(pairs), time.perf_counter() - start
+        
+        exact, exact_pairs, exact_seconds = run('brute_force')
+        approx, approx_pairs, approx_seconds = run('lsh')
+        
+        def key(match: Dict[str, Any]) -> Tuple[str, str]:
+            return match['enterprise_technique']['id'], match['ics_technique']['id']
+        
+        exact_keys = {key(m) for m in exact}
+        found = exact_keys & {key(m) for m in approx}
+        top = sorted(exact, key=lambda x: x['similarity_score'], reverse=True)[:50]
+        
+        return {
+            'lsh_threshold': self.lsh_threshold,
+            'lsh_num_perm': self.lsh_num_perm,
+            'brute_force_pairs': exact_pairs,
+            'candidate_pairs': approx_pairs,
+            'matches': len(exact_keys),
+            'recall': len(found) / len(exact_keys) if exact_keys else 1.0,
+            'top50_recall': (sum(1 for m in top if key(m) in found) / len(top)) if top else 1.0,
+            'brute_force_seconds': round(exact_seconds, 3),
+            'lsh_seconds': round(approx_seconds, 3),
+        }
+    
+    def actor_alias_index(self, dataset: str) -> AliasIndex:
+        """Alias index over a loaded dataset's intrusion-sets ('enterprise' or 'ics')"""
+        index = {'enterprise': self.enterprise_index, 'ics': self.ics_index}.get(dataset)
+        if index is None:
+            raise ValueError(f"Dataset {dataset!r} is not loaded")
+        return index.alias_index('intrusion-set')
     
-    def _find_actor_overlaps(self, enterprise_objs: Dict, ics_objs: Dict) -> List[Dict[str, Any]]:
+    def lookup_actor(self, alias: str) -> List[Dict[str, Any]]:
+        """Actors in any loaded dataset whose name or aliases match alias (case-insensitive)"""
+        found = []
+        for dataset, index in (('enterprise', self.enterprise_index), ('ics', self.ics_index)):
+            if index is None:
+                continue
+            for actor in index.alias_index('intrusion-set').lookup(alias):
+                found.append({
+                    'dataset': dataset,
+                    'id': actor['id'],
+                    'name': actor.get('name'),
+                    'mitre_id': index.mitre_id(actor),
+                    'aliases': actor.get('aliases', [])
+                })
+        return found
+    
+    def _find_actor_overlaps(self, enterprise: DatasetIndex, ics: DatasetIndex) -> List[Dict[str, Any]]:
         """Find potential actor overlaps based on aliases and descriptions"""
         overlaps = []
         
-        enterprise_actors = enterprise_objs.get('intrusion-set', [])
-        ics_actors = ics_objs.get('intrusion-set', [])
+        enterprise_actors = enterprise.of_type('intrusion-set')
+        ics_actors = ics.of_type('intrusion-set')
+        ent_index = enterprise.alias_index('intrusion-set')
+        ics_index = ics.alias_index('intrusion-set')
         
-        for ent_actor in enterprise_actors:
-            ent_aliases = set(alias.lower() for alias in ent_actor.get('aliases', []))
-            ent_name = ent_actor.get('name', '').lower()
+        for i, ent_actor in enumerate(enterprise_actors):
+            ent_aliases = ent_index.alias_sets[i]
+            ent_name = ent_index.names[i]
+            
+            # ICS actors sharing at least one alias, in ICS dataset order
+            candidates = set()
+            for alias in ent_aliases:
+                candidates.update(ics_index.by_alias.get(alias, ()))
             
-            for ics_actor in ics_actors:
-                ics_aliases = set(alias.lower() for alias in ics_actor.get('aliases', []))
-                ics_name = ics_actor.get('name', '').lower()
+            for j in sorted(candidates):
+                ics_actor = ics_actors[j]
                 
                 # Skip exact name matches (already found)
-                if ent_name == ics_name:
+                if ent_name == ics_index.names[j]:
                     continue
                 
-                # Check for alias overlaps
-                common_aliases = ent_aliases & ics_aliases
-                
-                if common_aliases:
-                    overlaps.append({
-                        'enterprise_actor': {
-                            'id': ent_actor['id'],
-                            'name': ent_actor.get('name'),
-                            'mitre_id': self._get_mitre_id(ent_actor)
-                        },
-                        'ics_actor': {
-                            'id': ics_actor['id'],
-                            'name': ics_actor.get('name'),
-                            'mitre_id': self._get_mitre_id(ics_actor)
-                        },
-                        'common_aliases': list(common_aliases),
-                        'match_type': 'alias_overlap'
-                    })
+                common_aliases = ent_aliases & ics_index.alias_sets[j]
+                overlaps.append({
+                    'enterprise_actor': {
+                        'id': ent_actor['id'],
+                        'name': ent_actor.get('name'),
+                        'mitre_id': enterprise.mitre_id(ent_actor)
+                    },
+                    'ics_actor': {
+                        'id': ics_actor['id'],
+                        'name': ics_actor.get('name'),
+                        'mitre_id': ics.mitre_id(ics_actor)
+                    },
+                    'common_aliases': list(common_aliases),
+                    'match_type': 'alias_overlap'
+                })
         
         return overlaps
     
-    def _analyze_platform_intersections(self, enterprise_objs: Dict, ics_objs: Dict) -> List[Dict[str, Any]]:
+    def _analyze_platform_intersections(self, enterprise: DatasetIndex, ics: DatasetIndex) -> List[Dict[str, Any]]:
         """Analyze platform coverage intersections"""
         intersections = []
         
         # Get platforms from techniques
-        ent_platforms = set()
-        ics_platforms = set()
-        
-        for tech in enterprise_objs.get('attack-pattern', []):
-            platforms = tech.get('x_mitre_platforms', [])
-            ent_platforms.update(platform.lower() for platform in platforms)
-        
-        for tech in ics_objs.get('attack-pattern', []):
-            platforms = tech.get('x_mitre_platforms', [])
-            ics_platforms.update(platform.lower() for platform in platforms)
+        ent_platforms = set(enterprise.by_platform.get('attack-pattern', {}))
+        ics_platforms = set(ics.by_platform.get('attack-pattern', {}))
         
         # Find common platforms
         common_platforms = ent_platforms & ics_platforms
@@ -312,17 +730,19 @@ class CrossDatasetAnalyzer:
             'common_platforms': sorted(list(common_platforms)),
             'enterprise_only_platforms': sorted(list(enterprise_only)),
             'ics_only_platforms': sorted(list(ics_only)),
-            'overlap_percentage': len(common_platforms) / len(ent_platforms | ics_platforms) * 100
+            # Custom matrices may carry no platforms at all
+            'overlap_percentage': (len(common_platforms) / len(ent_platforms | ics_platforms) * 100
+                                   if ent_platforms | ics_platforms else 0.0)
         })
         
         return intersections
     
-    def _map_tactics_across_datasets(self, enterprise_objs: Dict, ics_objs: Dict) -> List[Dict[str, Any]]:
+    def _map_tactics_across_datasets(self, enterprise: DatasetIndex, ics: DatasetIndex) -> List[Dict[str, Any]]:
         """Map tactics between Enterprise and ICS frameworks"""
         mappings = []
         
-        enterprise_tactics = {t.get('name', '').lower(): t for t in enterprise_objs.get('x-mitre-tactic', [])}
-        ics_tactics = {t.get('name', '').lower(): t for t in ics_objs.get('x-mitre-tactic', [])}
+        enterprise_tactics = enterprise.by_name.get('x-mitre-tactic', {})
+        ics_tactics = ics.by_name.get('x-mitre-tactic', {})
         
         # Find exact tactic name matches
         common_tactics = set(enterprise_tactics.keys()) & set(ics_tactics.keys())
@@ -336,39 +756,45 @@ class CrossDatasetAnalyzer:
                 'tactic_name': tactic_name.title(),
                 'enterprise_tactic': {
                     'id': ent_tactic['id'],
-                    'mitre_id': self._get_mitre_id(ent_tactic),
+                    'mitre_id': enterprise.mitre_id(ent_tactic),
                     'shortname': ent_tactic.get('x_mitre_shortname')
                 },
                 'ics_tactic': {
                     'id': ics_tactic['id'],
-                    'mitre_id': self._get_mitre_id(ics_tactic),
+                    'mitre_id': ics.mitre_id(ics_tactic),
                     'shortname': ics_tactic.get('x_mitre_shortname')
                 },
                 'match_type': 'exact_name'
             })
         
         # Find similar tactics by description
-        similarity_mappings = self._find_similar_tactics(enterprise_tactics, ics_tactics)
+        similarity_mappings = self._find_similar_tactics(enterprise, ics)
         mappings.extend(similarity_mappings)
         
         return mappings
     
-    def _find_similar_tactics(self, enterprise_tactics: Dict, ics_tactics: Dict) -> List[Dict[str, Any]]:
+    def _find_similar_tactics(self, enterprise: DatasetIndex, ics: DatasetIndex) -> List[Dict[str, Any]]:
         """Find tactics with similar descriptions"""
         similar = []
         
+        enterprise_tactics = enterprise.by_name.get('x-mitre-tactic', {})
+        ics_tactics = ics.by_name.get('x-mitre-tactic', {})
+        
+        if self.scoring in ('tfidf', 'embedding'):
+            return self._find_similar_tactics_vectors(enterprise_tactics, ics_tactics)
+        
         for ent_name, ent_tactic in enterprise_tactics.items():
-            ent_desc = ent_tactic.get('description', '')
+            ent_desc = enterprise.description(ent_tactic)
             
             for ics_name, ics_tactic in ics_tactics.items():
                 # Skip if exact name match
                 if ent_name == ics_name:
                     continue
                 
-                ics_desc = ics_tactic.get('description', '')
+                ics_desc = ics.description(ics_tactic)
                 
                 # Calculate description similarity
-                desc_similarity = SequenceMatcher(None, ent_desc.lower(), ics_desc.lower()).ratio()
+                desc_similarity = SequenceMatcher(None, ent_desc, ics_desc).ratio()
                 
                 if desc_similarity > 0.5:  # Moderate similarity threshold
                     similar.append({
@@ -388,103 +814,100 @@ class CrossDatasetAnalyzer:
         
         return similar
     
-    def _find_actor_alias_matches(self, enterprise_actors: List, ics_actors: List) -> List[Dict[str, Any]]:
+    def _find_similar_tactics_vectors(self, enterprise_tactics: Dict, ics_tactics: Dict) -> List[Dict[str, Any]]:
+        """TF-IDF / embedding cosine variant of _find_similar_tactics"""
+        similar = []
+        
+        ent_items = list(enterprise_tactics.items())
+        ics_items = list(ics_tactics.items())
+        ent_descs = [tactic.get('description', '') for _, tactic in ent_items]
+        ics_descs = [tactic.get('description', '') for _, tactic in ics_items]
+        
+        matches = self._pairwise_cosine_topk(
+            [(1.0, ent_descs, ics_descs, word_tokens)],
+            top_k=len(ics_items),
+            threshold=0.5,
+            exclude=lambda i, j: ent_items[i][0] == ics_items[j][0]
+        )
+        
+        for i, row in enumerate(matches):
+            ent_tactic = ent_items[i][1]
+            # Keep the sequence_matcher output order: ICS tactics in dataset order
+            for score, j, _ in sorted(row, key=lambda match: match[1]):
+                ics_tactic = ics_items[j][1]
+                similar.append({
+                    'enterprise_tactic': {
+                        'id': ent_tactic['id'],
+                        'name': ent_tactic.get('name'),
+                        'shortname': ent_tactic.get('x_mitre_shortname')
+                    },
+                    'ics_tactic': {
+                        'id': ics_tactic['id'],
+                        'name': ics_tactic.get('name'),
+                        'shortname': ics_tactic.get('x_mitre_shortname')
+                    },
+                    'similarity_score': round(score, 3),
+                    'match_type': 'description_similarity'
+                })
+        
+        return similar
+    
+    def _find_actor_alias_matches(self, enterprise: DatasetIndex, ics: DatasetIndex) -> List[Dict[str, Any]]:
         """Find actors that share aliases"""
         matches = []
         
-        for ent_actor in enterprise_actors:
-            ent_aliases = set(alias.lower() for alias in ent_actor.get('aliases', []))
-            ent_name = ent_actor.get('name', '').lower()
+        enterprise_actors = enterprise.of_type('intrusion-set')
+        ics_actors = ics.of_type('intrusion-set')
+        ent_index = enterprise.alias_index('intrusion-set')
+        ics_index = ics.alias_index('intrusion-set')
+        
+        for i, ent_actor in enumerate(enterprise_actors):
+            ent_aliases = ent_index.alias_sets[i]
+            ent_name = ent_index.names[i]
+            
+            # ICS actors listing this name as an alias, or named by one of this actor's aliases
+            candidates = set(ics_index.by_alias.get(ent_name, ()))
+            for alias in ent_aliases:
+                candidates.update(ics_index.by_name.get(alias, ()))
             
-            for ics_actor in ics_actors:
-                ics_aliases = set(alias.lower() for alias in ics_actor.get('aliases', []))
-                ics_name = ics_actor.get('name', '').lower()
+            for j in sorted(candidates):
+                ics_actor = ics_actors[j]
+                ics_name = ics_index.names[j]
+                
+                if ent_name == ics_name:
+                    continue
                 
                 # Check if enterprise actor name appears in ICS aliases
-                if ent_name in ics_aliases and ent_name != ics_name:
-                    matches.append({
-                        'enterprise_actor': {
-                            'id': ent_actor['id'],
-                            'name': ent_actor.get('name'),
-                            'mitre_id': self._get_mitre_id(ent_actor)
-                        },
-                        'ics_actor': {
-                            'id': ics_actor['id'],
-                            'name': ics_actor.get('name'),
-                            'mitre_id': self._get_mitre_id(ics_actor)
-                        },
-                        'match_basis': f"Enterprise name '{ent_name}' found in ICS aliases",
-                        'match_type': 'name_in_aliases'
-                    })
+                if ent_name in ics_index.alias_sets[j]:
+                    match_basis = f"Enterprise name '{ent_name}' found in ICS aliases"
+                # Otherwise the ICS actor name appears in enterprise aliases
+                else:
+                    match_basis = f"ICS name '{ics_name}' found in Enterprise aliases"
                 
-                # Check if ICS actor name appears in enterprise aliases
-                elif ics_name in ent_aliases and ent_name != ics_name:
-                    matches.append({
-                        'enterprise_actor': {
-                            'id': ent_actor['id'],
-                            'name': ent_actor.get('name'),
-                            'mitre_id': self._get_mitre_id(ent_actor)
-                        },
-                        'ics_actor': {
-                            'id': ics_actor['id'],
-                            'name': ics_actor.get('name'),
-                            'mitre_id': self._get_mitre_id(ics_actor)
-                        },
-                        'match_basis': f"ICS name '{ics_name}' found in Enterprise aliases",
-                        'match_type': 'name_in_aliases'
-                    })
+                matches.append({
+                    'enterprise_actor': {
+                        'id': ent_actor['id'],
+                        'name': ent_actor.get('name'),
+                        'mitre_id': enterprise.mitre_id(ent_actor)
+                    },
+                    'ics_actor': {
+                        'id': ics_actor['id'],
+                        'name': ics_actor.get('name'),
+                        'mitre_id': ics.mitre_id(ics_actor)
+                    },
+                    'match_basis': match_basis,
+                    'match_type': 'name_in_aliases'
+                })
         
         return matches
     
-    def _get_mitre_id(self, obj: Dict[str, Any]) -> str:
-        """Extract MITRE ID from object's external references"""
-        for ref in obj.get('external_references', []):
-            if ref.get('source_name') == 'mitre-attack':
-                return ref.get('external_id')
-        return None
-    
     def generate_cross_reference_report(self) -> str:
         """Generate a comprehensive cross-reference report"""
         if not self.analysis_results:
             raise ValueError("Must run analyze_cross_references() first")
         
-        report = []
-        report.append("# MITRE ATT&CK Cross-Dataset Analysis Report\n")
-        
-        # Shared Techniques
-        report.append(f"## Shared Techniques ({len(self.analysis_results.shared_techniques)})")
-        for tech in self.analysis_results.shared_techniques[:10]:  # Top 10
-            report.append(f"- **{tech['mitre_id']}**: {tech['enterprise_technique']['name']}")
-        
-        # Shared Actors
-        report.append(f"\n## Shared Threat Actors ({len(self.analysis_results.shared_actors)})")
-        for actor in self.analysis_results.shared_actors:
-            report.append(f"- **{actor['name']}** ({actor['match_type']})")
-        
-        # Shared Malware
-        report.append(f"\n## Shared Malware ({len(self.analysis_results.shared_malware)})")
-        for malware in self.analysis_results.shared_malware:
-            report.append(f"- **{malware['name']}** ({malware['match_type']})")
-        
-        # Similar Techniques
-        report.append(f"\n## Similar Techniques ({len(self.analysis_results.technique_similarities)})")
-        for sim in self.analysis_results.technique_similarities[:5]:  # Top 5
-            report.append(f"- **Enterprise**: {sim['enterprise_technique']['name']} ({sim['enterprise_technique']['mitre_id']})")
-            report.append(f"  **ICS**: {sim['ics_technique']['name']} ({sim['ics_technique']['mitre_id']})")
-            report.append(f"  **Similarity**: {sim['similarity_score']}")
-        
-        # Platform Analysis
-        if self.analysis_results.platform_intersections:
-            platform_analysis = self.analysis_results.platform_intersections[0]
-            report.append(f"\n## Platform Coverage Analysis")
-            report.append(f"- **Common Platforms**: {', '.join(platform_analysis['common_platforms'])}")
-            report.append(f"- **Overlap Percentage**: {platform_analysis['overlap_percentage']:.1f}%")
-        
-        # Tactic Mappings
-        report.append(f"\n## Tactic Mappings ({len(self.analysis_results.tactic_mappings)})")
-        for mapping in self.analysis_results.tactic_mappings:
-            report.append(f"- **{mapping['tactic_name']}** ({mapping['match_type']})")
-        
+        report = [f"# {REPORT_TITLE}\n"]
+        report.extend(iter_markdown_sections(self.analysis_results))
         return "\n".join(report)
 
 def main():
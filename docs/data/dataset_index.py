@@ -0,0 +1,87 @@
+"""
+Per-Dataset Lookup Index
+Groups a loaded STIX bundle's objects by type, MITRE external id, normalized
+name and platform, normalizing each field once for all analyses
+"""
+
+from typing import Any, Dict, List, Optional
+
+from alias_index import AliasIndex
+
+
+def normalize_name(text: str) -> str:
+    """Normalization used for name, description and platform comparisons"""
+    return text.lower()
+
+
+def extract_mitre_id(obj: Dict[str, Any]) -> Optional[str]:
+    """MITRE ATT&CK external id from an object's external references, if any"""
+    for ref in obj.get('external_references', []):
+        if ref.get('source_name') == 'mitre-attack':
+            return ref.get('external_id')
+    return None
+
+
+class DatasetIndex:
+    """
+    Lookup tables over one MITRE ATT&CK bundle, built once per load.
+
+    ``by_type`` lists objects per STIX type in bundle order. ``by_mitre_id``,
+    ``by_name`` and ``by_platform`` are keyed by STIX type first, then by
+    MITRE id, normalized name or normalized platform; like a dict built in
+    bundle order, the last object wins for a repeated id or name. Objects
+    without a MITRE id or name are stored under ``None`` / ``''``. MITRE
+    ids and normalized names are computed for every object up front;
+    lowercased descriptions only on first use.
+    """
+
+    def __init__(self, dataset: Dict[str, Any]):
+        self.objects: List[Dict[str, Any]] = dataset['objects']
+        self.by_type: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_mitre_id: Dict[str, Dict[Optional[str], Dict[str, Any]]] = {}
+        self.by_name: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.by_platform: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._mitre_ids: Dict[str, Optional[str]] = {}
+        self._names: Dict[str, str] = {}
+        self._descriptions: Dict[str, str] = {}
+        self._alias_indexes: Dict[str, AliasIndex] = {}
+
+        for obj in self.objects:
+            obj_type = obj['type']
+            self.by_type.setdefault(obj_type, []).append(obj)
+            if obj_type == 'relationship':
+                continue
+
+            mitre_id = self._mitre_ids[obj['id']] = extract_mitre_id(obj)
+            name = self._names[obj['id']] = normalize_name(obj.get('name', ''))
+            self.by_mitre_id.setdefault(obj_type, {})[mitre_id] = obj
+            self.by_name.setdefault(obj_type, {})[name] = obj
+            for platform in obj.get('x_mitre_platforms', []):
+                self.by_platform.setdefault(obj_type, {}).setdefault(normalize_name(platform), []).append(obj)
+
+    def of_type(self, obj_type: str) -> List[Dict[str, Any]]:
+        return self.by_type.get(obj_type, [])
+
+    def mitre_id(self, obj: Dict[str, Any]) -> Optional[str]:
+        mitre_id = self._mitre_ids.get(obj['id'], False)
+        return extract_mitre_id(obj) if mitre_id is False else mitre_id
+
+    def name(self, obj: Dict[str, Any]) -> str:
+        """Normalized name"""
+        name = self._names.get(obj['id'])
+        return normalize_name(obj.get('name', '')) if name is None else name
+
+    def description(self, obj: Dict[str, Any]) -> str:
+        """Normalized description, computed on first request"""
+        description = self._descriptions.get(obj['id'])
+        if description is None:
+            description = self._descriptions[obj['id']] = normalize_name(obj.get('description', ''))
+        return description
+
+    def alias_index(self, obj_type: str = 'intrusion-set') -> AliasIndex:
+        """Alias inverted index over the objects of one type, built on first request"""
+        index = self._alias_indexes.get(obj_type)
+        if index is None:
+            objects = self.of_type(obj_type)
+            index = self._alias_indexes[obj_type] = AliasIndex(objects, [self.name(obj) for obj in objects])
+        return index
@@ -0,0 +1,246 @@
+"""
+Embedding Similarity Backend
+Pluggable text embedders (an offline hashed n-gram default, sentence-transformers
+when installed) with an on-disk vector cache keyed by model and text content
+"""
+
+import hashlib
+import heapq
+import math
+import operator
+import os
+import re
+import zlib
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from snapshot_cache import load_snapshot, save_snapshot
+from tfidf_similarity import TopKRows
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the pure-Python product is always available
+    np = None
+
+Vector = Sequence[float]
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Upper bound on the entries of one dense block of left x right^T scores
+_BLOCK_ENTRIES = 1 << 20
+
+
+class HashedNgramEmbedder:
+    """
+    Offline embedder: character n-grams and words hashed into a fixed number
+    of signed buckets (the hashing trick), L2-normalized. Deterministic across
+    runs and machines, so its vectors are safe to cache.
+    """
+
+    def __init__(self, dimensions: int = 256, ngram: int = 3):
+        self.dimensions = dimensions
+        self.ngram = ngram
+        self.name = f'hashed-ngram-{ngram}-{dimensions}'
+
+    def _features(self, text: str) -> List[str]:
+        lowered = text.lower()
+        padded = f' {lowered} '
+        grams = [padded[i:i + self.ngram] for i in range(max(1, len(padded) - self.ngram + 1))]
+        return grams + [f'w:{word}' for word in _WORD_RE.findall(lowered)]
+
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        vectors = []
+        for text in texts:
+            vector = [0.0] * self.dimensions
+            for feature in self._features(text):
+                h = zlib.crc32(feature.encode('utf-8'))
+                # Low bits pick the bucket, the top bit the sign, so colliding
+                # features tend to cancel instead of accumulating
+                vector[h % self.dimensions] += 1.0 if h & 0x80000000 else -1.0
+            norm = math.sqrt(sum(v * v for v in vector))
+            vectors.append([v / norm for v in vector] if norm else vector)
+        return vectors
+
+
+class SentenceTransformerEmbedder:
+    """sentence-transformers model loaded from a local path or the local model cache"""
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', device: Optional[str] = None):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as exc:
+            raise ImportError("SentenceTransformerEmbedder requires the sentence-transformers package") from exc
+        self.model = SentenceTransformer(model_name, device=device)
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        self.name = f'sentence-transformers/{model_name}'
+
+    def encode(self, texts: Sequence[str]) -> List[List[float]]:
+        return self.model.encode(list(texts), normalize_embeddings=True, show_progress_bar=False).tolist()
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class VectorCache:
+    """
+    Persistent vectors for one embedder, keyed by the SHA-256 of each text.
+
+    The whole cache for a model is one snapshot file (see snapshot_cache)
+    whose header key is derived from the model name, so switching models
+    never returns stale vectors. ``save`` rewrites it atomically, and only
+    when new vectors were added. Without a ``cache_dir`` it is memory-only.
+    """
+
+    def __init__(self, cache_dir: Optional[str], model_name: str):
+        self.model_key = hashlib.sha256(model_name.encode('utf-8')).hexdigest()
+        self.path = os.path.join(cache_dir, f'vectors-{self.model_key[:16]}.snap') if cache_dir else None
+        payload = load_snapshot(self.path, self.model_key) if self.path else None
+        self.vectors: Dict[str, bytes] = payload['vectors'] if payload else {}
+        self.dirty = False
+
+    def get(self, key: str) -> Optional[array]:
+        raw = self.vectors.get(key)
+        if raw is None:
+            return None
+        vector = array('f')
+        vector.frombytes(raw)
+        return vector
+
+    def put(self, key: str, vector: array) -> None:
+        self.vectors[key] = vector.tobytes()
+        self.dirty = True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.vectors
+
+    def save(self) -> None:
+        if self.dirty and self.path:
+            save_snapshot(self.path, self.model_key, {'vectors': self.vectors})
+            self.dirty = False
+
+
+def encode_cached(embedder, texts: Sequence[str], cache: Optional[VectorCache] = None,
+                  batch_size: int = 64, save: bool = True) -> Tuple[List[Vector], int]:
+    """
+    Vectors for texts, aligned with the input. Cached texts are read from the
+    cache; the remaining distinct texts are encoded ``batch_size`` at a time.
+    Returns the vectors and how many texts had to be encoded. Long-running
+    callers pass ``save=False`` and save the cache themselves.
+    """
+    keys = [text_key(text) for text in texts]
+    found: Dict[str, Vector] = {}
+    missing: Dict[str, str] = {}
+
+    for key, text in zip(keys, texts):
+        if key in found or key in missing:
+            continue
+        vector = cache.get(key) if cache else None
+        if vector is None:
+            missing[key] = text
+        else:
+            found[key] = vector
+
+    pending = list(missing.items())
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        for (key, _), vector in zip(batch, embedder.encode([text for _, text in batch])):
+            # Stored as float32 either way, so a fresh run scores exactly like a cached one
+            found[key] = array('f', vector)
+            if cache:
+                cache.put(key, found[key])
+
+    if cache and save:
+        cache.save()
+    return [found[key] for key in keys], len(pending)
+
+
+def center_vectors(vectors: Sequence[Vector]) -> List[List[float]]:
+    """
+    Subtract the mean vector and re-normalize. Text shared by most of a corpus
+    (ATT&CK's "The adversary is trying to ..." boilerplate) otherwise puts
+    every pair above threshold; centering plays the role IDF plays for TF-IDF.
+    """
+    if not vectors:
+        return []
+    n = len(vectors)
+    mean = [total / n for total in map(sum, zip(*vectors))]
+    centered = []
+    for vector in vectors:
+        shifted = [v - m for v, m in zip(vector, mean)]
+        norm = math.sqrt(sum(v * v for v in shifted))
+        centered.append([v / norm for v in shifted] if norm else shifted)
+    return centered
+
+
+def weighted_dense_cosine_topk(fields: Sequence[Tuple[float, Sequence[Vector], Sequence[Vector]]],
+                               top_k: int, threshold: float,
+                               exclude: Optional[Callable[[int, int], bool]] = None,
+                               backend: str = 'auto') -> TopKRows:
+    """
+    Dense counterpart of tfidf_similarity.weighted_cosine_topk for unit-length
+    vectors (cosine == dot product), with the same arguments, backends and
+    result shape.
+    """
+    if backend == 'auto':
+        backend = 'python' if np is None else 'numpy'
+    if backend == 'numpy':
+        if np is None:
+            raise ImportError("The numpy backend requires the numpy package")
+        return _weighted_dense_cosine_topk_numpy(fields, top_k, threshold, exclude)
+    if backend == 'python':
+        return _weighted_dense_cosine_topk_python(fields, top_k, threshold, exclude)
+    raise ValueError(f"Unknown cosine backend: {backend}")
+
+
+def _weighted_dense_cosine_topk_python(fields, top_k: int, threshold: float,
+                                       exclude: Optional[Callable[[int, int], bool]]) -> TopKRows:
+    """Every left x right dot product, one pair at a time"""
+    n_left = len(fields[0][1])
+    n_right = len(fields[0][2])
+    results = []
+
+    for i in range(n_left):
+        scored = []
+        for j in range(n_right):
+            if exclude and exclude(i, j):
+                continue
+            cosines = [sum(map(operator.mul, left[i], right[j])) for _, left, right in fields]
+            score = sum(weight * cosine for (weight, _, _), cosine in zip(fields, cosines))
+            if score > threshold:
+                scored.append((score, j, cosines))
+        results.append(heapq.nlargest(top_k, scored, key=lambda item: (item[0], -item[1])))
+
+    return results
+
+
+def _weighted_dense_cosine_topk_numpy(fields, top_k: int, threshold: float,
+                                      exclude: Optional[Callable[[int, int], bool]]) -> TopKRows:
+    """Matrix product left x right^T per field, in blocks of left rows"""
+    n_left, n_right = len(fields[0][1]), len(fields[0][2])
+    if not n_right:
+        return [[] for _ in range(n_left)]
+    matrices = [(weight, np.asarray(left, dtype=np.float64), np.asarray(right, dtype=np.float64).T)
+                for weight, left, right in fields]
+    block_rows = max(1, _BLOCK_ENTRIES // n_right)
+    results: TopKRows = []
+
+    for start in range(0, n_left, block_rows):
+        stop = min(n_left, start + block_rows)
+        per_field = [left[start:stop] @ right_t for _, left, right_t in matrices]
+        combined = np.zeros((stop - start, n_right))
+        for (field_weight, _, _), dots in zip(matrices, per_field):
+            combined += field_weight * dots
+
+        for r in range(stop - start):
+            i = start + r
+            scores = combined[r]
+            js = np.flatnonzero(scores > threshold)
+            if exclude is not None:
+                js = js[[not exclude(i, int(j)) for j in js]] if len(js) else js
+            # Best score first, lower right index breaks ties
+            best = js[np.lexsort((js, -scores[js]))[:top_k]]
+            results.append([(float(scores[j]), int(j), [float(dots[r, j]) for dots in per_field])
+                            for j in best])
+
+    return results
@@ -0,0 +1,226 @@
+"""
+Ingestion Event Bus
+Batched, pipelined publishing of change events with a bounded in-flight
+window, over an in-process asyncio backend or Redis Streams
+"""
+
+import asyncio
+import itertools
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (entry id, event fields)
+StreamEntry = Tuple[str, Dict[str, str]]
+
+
+def _entry_order(entry_id: str) -> Tuple[int, int]:
+    milliseconds, _, sequence = entry_id.partition('-')
+    return int(milliseconds), int(sequence or 0)
+
+
+def encode_event(event: Dict[str, Any]) -> Dict[str, str]:
+    """Stream entry fields are flat strings; None becomes '' as Redis has no null"""
+    return {key: '' if value is None else str(value) for key, value in event.items()}
+
+
+class InMemoryEventBus:
+    """
+    asyncio backend with Redis Streams semantics for tests and single-node
+    runs: append-only streams, consumer groups that each see every entry
+    once, and per-group pending entries until acknowledged.
+
+    ``latency`` (seconds per publish call) simulates a network round trip
+    for exercising the publisher's in-flight window.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.streams: Dict[str, List[StreamEntry]] = {}
+        self.publish_calls = 0
+        # (stream, group) -> [next offset to deliver, {pending entry id: consumer}]
+        self._groups: Dict[Tuple[str, str], List[Any]] = {}
+        self._ids = itertools.count(1)
+        self._appended = asyncio.Condition()
+
+    async def ensure_group(self, stream: str, group: str) -> None:
+        self.streams.setdefault(stream, [])
+        self._groups.setdefault((stream, group), [0, {}])
+
+    async def publish_batch(self, stream: str, events: Sequence[Dict[str, Any]]) -> List[str]:
+        self.publish_calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        entries = self.streams.setdefault(stream, [])
+        ids = []
+        for event in events:
+            entry_id = f'{next(self._ids)}-0'
+            entries.append((entry_id, encode_event(event)))
+            ids.append(entry_id)
+        async with self._appended:
+            self._appended.notify_all()
+        return ids
+
+    async def read_group(self, stream: str, group: str, consumer: str, count: int = 10,
+                         block_ms: int = 1000, pending_after: Optional[str] = None) -> List[StreamEntry]:
+        """
+        Up to ``count`` undelivered entries, waiting up to ``block_ms`` for new
+        ones. With ``pending_after`` (an entry id, '0' for all), returns
+        instead the entries already delivered to ``consumer`` and not yet
+        acknowledged, after that id, without waiting.
+        """
+        await self.ensure_group(stream, group)
+        state = self._groups[(stream, group)]
+        entries = self.streams[stream]
+        if pending_after is not None:
+            after = _entry_order(pending_after)
+            return [entry for entry in entries[:state[0]]
+                    if state[1].get(entry[0]) == consumer and _entry_order(entry[0]) > after][:count]
+        if state[0] >= len(entries) and block_ms:
+            async with self._appended:
+                try:
+                    await asyncio.wait_for(self._appended.wait_for(lambda: state[0] < len(entries)),
+                                           block_ms / 1000)
+                except asyncio.TimeoutError:
+                    return []
+        delivered = entries[state[0]:state[0] + count]
+        state[0] += len(delivered)
+        for entry_id, _ in delivered:
+            state[1][entry_id] = consumer
+        return delivered
+
+    async def ack(self, stream: str, group: str, entry_ids: Sequence[str]) -> int:
+        pending = self._groups.get((stream, group), [0, {}])[1]
+        return sum(pending.pop(entry_id, None) is not None for entry_id in entry_ids)
+
+    def pending(self, stream: str, group: str) -> int:
+        return len(self._groups.get((stream, group), [0, {}])[1])
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisStreamsEventBus:
+    """
+    Redis Streams backend. A batch is sent as one non-transactional pipeline
+    of XADDs, i.e. one round trip however many events it holds. The client
+    is created on first use, so building a pipeline does not require the
+    redis package or a reachable server.
+    """
+
+    def __init__(self, url: str, maxlen: Optional[int] = None):
+        self.url = url
+        self.maxlen = maxlen
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                from redis.asyncio import Redis
+            except ImportError as exc:
+                raise ImportError("RedisStreamsEventBus requires the redis package") from exc
+            self._client = Redis.from_url(self.url, decode_responses=True)
+        return self._client
+
+    async def ensure_group(self, stream: str, group: str) -> None:
+        try:
+            await self._get_client().xgroup_create(stream, group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def publish_batch(self, stream: str, events: Sequence[Dict[str, Any]]) -> List[str]:
+        pipe = self._get_client().pipeline(transaction=False)
+        for event in events:
+            pipe.xadd(stream, encode_event(event), maxlen=self.maxlen, approximate=True)
+        return await pipe.execute()
+
+    async def read_group(self, stream: str, group: str, consumer: str, count: int = 10,
+                         block_ms: int = 1000, pending_after: Optional[str] = None) -> List[StreamEntry]:
+        """XREADGROUP from '>' (new entries), or from ``pending_after`` for the consumer's
+        own pending entries, which Redis returns without blocking"""
+        if pending_after is None:
+            response = await self._get_client().xreadgroup(group, consumer, {stream: ">"},
+                                                           count=count, block=block_ms)
+        else:
+            response = await self._get_client().xreadgroup(group, consumer, {stream: pending_after}, count=count)
+        # Pending entries trimmed from the stream come back without fields
+        return [(entry_id, fields or {}) for _, entries in response or [] for entry_id, fields in entries]
+
+    async def ack(self, stream: str, group: str, entry_ids: Sequence[str]) -> int:
+        if not entry_ids:
+            return 0
+        return await self._get_client().xack(stream, group, *entry_ids)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class EventPublisher:
+    """
+    Buffers events per stream and hands full batches of ``batch_size`` to a
+    bus (InMemoryEventBus or RedisStreamsEventBus) without waiting for them.
+
+    At most ``max_in_flight`` batches are outstanding at once; ``publish``
+    waits for a free slot when the window is full, which pushes back on
+    the graph writer instead of queueing unbounded events in memory.
+    ``flush`` sends partial batches and waits for everything in flight,
+    re-raising the first delivery error.
+    """
+
+    def __init__(self, bus: Any, batch_size: int = 500, max_in_flight: int = 4):
+        self.bus = bus
+        self.batch_size = batch_size
+        self._window = asyncio.Semaphore(max_in_flight)
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._in_flight: set = set()
+        self._errors: List[BaseException] = []
+        self.stats = {'events': 0, 'batches': 0, 'backpressure_seconds': 0.0}
+
+    async def publish(self, streams: Iterable[str], event: Dict[str, Any]) -> None:
+        """Queue one event on each of the given streams"""
+        for stream in streams:
+            buffer = self._buffers.setdefault(stream, [])
+            buffer.append(event)
+            if len(buffer) >= self.batch_size:
+                await self._send(stream)
+
+    async def _send(self, stream: str) -> None:
+        batch = self._buffers.pop(stream, None)
+        if not batch:
+            return
+        if self._window.locked():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await self._window.acquire()
+            self.stats['backpressure_seconds'] += loop.time() - started
+        else:
+            await self._window.acquire()
+        task = asyncio.ensure_future(self._deliver(stream, batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _deliver(self, stream: str, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await self.bus.publish_batch(stream, batch)
+            self.stats['events'] += len(batch)
+            self.stats['batches'] += 1
+        except Exception as e:
+            self._errors.append(e)
+        finally:
+            self._window.release()
+
+    async def flush(self) -> None:
+        for stream in list(self._buffers):
+            await self._send(stream)
+        if self._in_flight:
+            await asyncio.gather(*list(self._in_flight))
+        if self._errors:
+            error, self._errors = self._errors[0], []
+            raise error
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            await self.bus.close()
@@ -0,0 +1,100 @@
+"""
+Ingestion Checkpoints
+Durable per-dataset record of which write batches of each ingestion phase
+have committed, so an interrupted run can resume instead of starting over
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from snapshot_cache import file_digest
+
+CHECKPOINT_VERSION = 1
+
+
+def run_key(dataset_path: str, dataset_name: str) -> str:
+    """Identity of an ingestion run: the dataset name and the bundle's contents"""
+    return hashlib.sha256(f'{CHECKPOINT_VERSION}:{dataset_name}:{file_digest(dataset_path)}'.encode()).hexdigest()
+
+
+def phase_fingerprint(entity_ids: Iterable[str], batch_size: int) -> str:
+    """Batch boundaries are only comparable for the same ordered ids cut at the same size"""
+    hasher = hashlib.sha256(f'{batch_size}\0'.encode())
+    for entity_id in entity_ids:
+        hasher.update(entity_id.encode() + b'\0')
+    return hasher.hexdigest()
+
+
+class IngestionCheckpoint:
+    """
+    JSON checkpoint for one dataset's ingestion, rewritten atomically (temp
+    file, fsync, rename) after every committed batch.
+
+    Each phase ('deletes', 'nodes', 'relationships', 'cross_references')
+    records a fingerprint of its batches and the indexes of those done.
+    With ``resume=True`` a checkpoint with the same run key is picked up;
+    a phase whose fingerprint changed (different entities or batch size)
+    starts over. Otherwise any previous checkpoint is discarded.
+    """
+
+    def __init__(self, path: str, key: str, resume: bool = False):
+        self.path = path
+        self.key = key
+        state = self._load() if resume else None
+        self.resumed = state is not None
+        self.state: Dict[str, Any] = state or {'version': CHECKPOINT_VERSION, 'run_key': key,
+                                               'complete': False, 'phases': {}}
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('version') != CHECKPOINT_VERSION or state.get('run_key') != self.key:
+            return None
+        return state
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    @property
+    def complete(self) -> bool:
+        return self.state['complete']
+
+    def begin_phase(self, phase: str, fingerprint: str, batches: int) -> int:
+        """Start or resume a phase; returns how many of its batches are already done"""
+        entry = self.state['phases'].get(phase)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            entry = self.state['phases'][phase] = {'fingerprint': fingerprint, 'batches': batches, 'done': []}
+            self.save()
+        return len(entry['done'])
+
+    def is_done(self, phase: str, index: int) -> bool:
+        return index in self.state['phases'][phase]['done']
+
+    def mark_done(self, phase: str, index: int) -> None:
+        self.state['phases'][phase]['done'].append(index)
+        self.save()
+
+    def mark_complete(self) -> None:
+        self.state['complete'] = True
+        self.save()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'resumed': self.resumed,
+            'complete': self.complete,
+            'phases': {phase: f"{len(entry['done'])}/{entry['batches']}"
+                       for phase, entry in self.state['phases'].items()}
+        }
@@ -0,0 +1,86 @@
+"""
+MinHash / LSH Candidate Generation
+Locality-sensitive hashing over character shingles to pick plausibly similar
+string pairs before exact (quadratic) similarity scoring
+"""
+
+import random
+import zlib
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def char_shingles(text: str, k: int = 3) -> Set[str]:
+    """Lowercased character k-grams of text, padded so short strings still shingle"""
+    padded = f' {text.lower()} '
+    if len(padded) <= k:
+        return {padded}
+    return {padded[i:i + k] for i in range(len(padded) - k + 1)}
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) with bands * rows == num_perm whose S-curve midpoint
+    (1/bands) ** (1/rows) is closest to the requested Jaccard threshold"""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        distance = abs(midpoint - threshold)
+        if best is None or distance < best[0]:
+            best = (distance, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    """MinHash signatures from a family of universal hash functions"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+
+    def signature(self, shingles: Iterable[str]) -> Tuple[int, ...]:
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.params
+        )
+
+
+class MinHashLSH:
+    """
+    Banded LSH index: two strings become candidates when all rows of at least
+    one band of their MinHash signatures agree. Lowering the threshold raises
+    recall at the cost of more candidates to score exactly.
+    """
+
+    def __init__(self, threshold: float = 0.3, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self.buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(self.bands)]
+
+    def _band_keys(self, text: str) -> List[Tuple[int, ...]]:
+        signature = self.hasher.signature(char_shingles(text, self.shingle_size))
+        rows = self.rows
+        return [signature[band * rows:(band + 1) * rows] for band in range(self.bands)]
+
+    def index(self, texts: Sequence[str]) -> None:
+        for position, text in enumerate(texts):
+            for band, key in enumerate(self._band_keys(text)):
+                self.buckets[band].setdefault(key, []).append(position)
+
+    def query(self, text: str) -> List[int]:
+        """Positions of indexed texts sharing at least one band with text, ascending"""
+        found = set()
+        for band, key in enumerate(self._band_keys(text)):
+            found.update(self.buckets[band].get(key, ()))
+        return sorted(found)
@@ -3,11 +3,17 @@ Comprehensive UCO Mapping for MITRE ATT&CK Enterprise and ICS Datasets
 Implements unified schema based on Unified Cyber Ontology (UCO) specifications
 """
 
-from typing import Dict, List, Any, Optional
+import os
+import sys
+from collections.abc import MutableMapping
+from typing import Dict, List, Any, Optional, Tuple, Iterator
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
+from adjacency_index import AdjacencyIndex, DanglingReferenceReport
+from substring_index import find_substring_pairs
+
 class UCOMapping:
     """Complete UCO mapping for all MITRE ATT&CK object types"""
     
@@ -121,7 +127,214 @@ class UCOMapping:
         'revoked-by': 'uco-core:hasState'
     }
 
-@dataclass
+class ConversionPlan:
+    """Precompiled conversion recipe for one MITRE object type"""
+
+    __slots__ = ('mitre_type', 'uco_type', 'property_keys')
+
+    def __init__(self, mitre_type: str, uco_type: str, property_keys: Tuple[Tuple[str, str], ...]):
+        self.mitre_type = mitre_type
+        self.uco_type = uco_type
+        # (mitre_prop, uco_prop) pairs in PROPERTY_MAPPINGS order
+        self.property_keys = property_keys
+
+
+def compile_conversion_plans(mapping: 'UCOMapping') -> Dict[str, ConversionPlan]:
+    """Compile UCOMapping tables into one ConversionPlan per mapped MITRE type"""
+    plans = {}
+    for mitre_type, uco_type in mapping.MITRE_TO_UCO_BASE_MAPPING.items():
+        property_keys = tuple(
+            (sys.intern(mitre_prop), sys.intern(uco_prop))
+            for mitre_prop, uco_prop in mapping.PROPERTY_MAPPINGS.get(mitre_type, {}).items()
+        )
+        plans[mitre_type] = ConversionPlan(sys.intern(mitre_type), sys.intern(uco_type), property_keys)
+    return plans
+
+
+# Keys that are exposed as node/relationship attributes rather than mitre: properties
+NODE_ATTRIBUTE_KEYS = frozenset(['id', 'type', 'name', 'description'])
+RELATIONSHIP_ATTRIBUTE_KEYS = frozenset(['id', 'type', 'source_ref', 'target_ref', 'relationship_type'])
+
+# Short raw STIX fields whose string values repeat across objects (platforms,
+# domains, marking refs, versions, timestamps, relationship types and refs).
+# These are interned at conversion time so each distinct value is stored once;
+# free text such as descriptions is nearly unique and is left alone.
+INTERNED_FIELDS = frozenset([
+    'type', 'created', 'modified', 'created_by_ref', 'object_marking_refs', 'spec_version',
+    'x_mitre_version', 'x_mitre_attack_spec_version', 'x_mitre_modified_by_ref',
+    'x_mitre_domains', 'x_mitre_platforms', 'x_mitre_data_sources', 'x_mitre_sectors',
+    'x_mitre_collection_layers', 'x_mitre_data_source_ref', 'x_mitre_contributors',
+    'labels', 'relationship_type', 'source_ref', 'target_ref'
+])
+
+_PREFIXED_KEYS: Dict[str, str] = {}
+
+
+def _mitre_key(key: str) -> str:
+    """Return the shared 'mitre:'-prefixed form of a STIX key"""
+    prefixed = _PREFIXED_KEYS.get(key)
+    if prefixed is None:
+        prefixed = _PREFIXED_KEYS[key] = sys.intern(f'mitre:{key}')
+    return prefixed
+
+
+def intern_stix_strings(mitre_obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a raw STIX object with its repeated short strings interned
+
+    The caller's object is left untouched: the top-level dict and every list
+    or reference dict holding an interned value are copied, other values are
+    shared.
+    """
+    intern = sys.intern
+    interned = dict(mitre_obj)
+    for key, value in mitre_obj.items():
+        if key in INTERNED_FIELDS:
+            if value.__class__ is str:
+                interned[key] = intern(value)
+            elif value.__class__ is list:
+                interned[key] = [intern(v) if v.__class__ is str else v for v in value]
+        elif key == 'external_references':
+            # Citation names, urls and texts repeat across the objects citing them
+            interned[key] = [_intern_fields(ref, ('source_name', 'url', 'description')) for ref in value]
+        elif key == 'kill_chain_phases':
+            interned[key] = [_intern_fields(phase, ('kill_chain_name', 'phase_name')) for phase in value]
+
+    return interned
+
+
+def _intern_fields(entry: Dict[str, Any], keys: Tuple[str, ...]) -> Dict[str, Any]:
+    entry = dict(entry)
+    for key in keys:
+        value = entry.get(key)
+        if value.__class__ is str:
+            entry[key] = sys.intern(value)
+    return entry
+
+
+class PropertyLayout:
+    """Ordered STIX key layout shared by every object with the same set of fields"""
+
+    __slots__ = ('keys', 'index')
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+
+    @classmethod
+    def for_keys(cls, keys: Tuple[str, ...],
+                 pool: Optional[Dict[Tuple[str, ...], 'PropertyLayout']] = None) -> 'PropertyLayout':
+        """Layout for ``keys``, shared through ``pool`` (a converter's layout table) when given"""
+        if pool is None:
+            return cls(keys)
+        layout = pool.get(keys)
+        if layout is None:
+            layout = pool[keys] = cls(keys)
+        return layout
+
+    def __getstate__(self):
+        # Tuple-wrapped: pickle skips __setstate__ for a falsy state such as ()
+        return (self.keys,)
+
+    def __setstate__(self, state: Tuple[Tuple[str, ...]]) -> None:
+        keys, = state
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+
+
+class PropertyStore(MutableMapping):
+    """
+    Deduplicated property mapping backed by the raw STIX field values.
+
+    Each STIX field value is stored once, in a tuple whose key layout is shared
+    between objects. UCO property names and mitre:-prefixed names are derived
+    on access from the shared per-type mapping, so a node no longer carries
+    three copies of its field table. The first write materializes a private
+    dict and the store behaves like a plain dict from then on.
+
+    ``layouts`` is the owning converter's table of shared key layouts.
+    """
+
+    __slots__ = ('_layout', '_values', '_uco_keys', '_excluded', '_data')
+
+    def __init__(self, raw: Dict[str, Any], uco_keys: Tuple[Tuple[str, str], ...], excluded: frozenset,
+                 layouts: Optional[Dict[Tuple[str, ...], PropertyLayout]] = None):
+        self._layout = PropertyLayout.for_keys(tuple(raw), layouts)
+        self._values = tuple(raw.values())
+        self._uco_keys = uco_keys
+        self._excluded = excluded
+        self._data = None
+
+    def raw_get(self, key: str, default: Any = None) -> Any:
+        """Return an original STIX field by its unprefixed key"""
+        if self._data is not None:
+            return self._data.get(_mitre_key(key), default)
+        i = self._layout.index.get(key)
+        return default if i is None else self._values[i]
+
+    def _iter_items(self) -> Iterator[Tuple[str, Any]]:
+        index, values = self._layout.index, self._values
+        for mitre_prop, uco_prop in self._uco_keys:
+            i = index.get(mitre_prop)
+            if i is not None:
+                yield uco_prop, values[i]
+        for key, value in zip(self._layout.keys, values):
+            if key not in self._excluded:
+                yield _mitre_key(key), value
+
+    def _materialize(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = dict(self._iter_items())
+            self._layout = self._values = None
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        if self._data is not None:
+            return self._data[key]
+        index = self._layout.index
+        if key.startswith('mitre:'):
+            raw_key = key[6:]
+            if raw_key in index and raw_key not in self._excluded:
+                return self._values[index[raw_key]]
+        else:
+            for mitre_prop, uco_prop in self._uco_keys:
+                if uco_prop == key and mitre_prop in index:
+                    return self._values[index[mitre_prop]]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._data is not None:
+            return iter(self._data)
+        return (key for key, _ in self._iter_items())
+
+    def __len__(self) -> int:
+        if self._data is not None:
+            return len(self._data)
+        return sum(1 for _ in self._iter_items())
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._materialize()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._materialize()[key]
+
+    def items(self):
+        if self._data is not None:
+            return self._data.items()
+        return list(self._iter_items())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __deepcopy__(self, memo):
+        # dataclasses.asdict() deep-copies mapping fields; hand back a plain dict
+        import copy
+        return copy.deepcopy(self.to_dict(), memo)
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+@dataclass(slots=True)
 class UCONode:
     """Represents a UCO-compliant node in the knowledge graph"""
     id: str
@@ -137,7 +350,88 @@ class UCONode:
         if self.properties is None:
             self.properties = {}
 
-@dataclass
+class LazyUCONode(UCONode):
+    """
+    UCONode that keeps only id, name, types and mitre_id decoded.
+
+    ``description`` and ``properties`` are decoded from a memory-mapped copy
+    of the source bundle, using the object's byte span, the first time
+    either is read, and kept from then on, so writes to ``properties``
+    stick. Holding several ATT&CK releases costs little more than their ids
+    and names until their fields are read. Assigning either field pins the
+    assigned value.
+    """
+
+    __slots__ = ('_source', '_start', '_end', '_property_keys')
+
+    def __init__(self, id: str, uco_type: str, mitre_type: str, name: Optional[str],
+                 source_dataset: str, mitre_id: Optional[str], source: Any, start: int, end: int,
+                 property_keys: Tuple[Tuple[str, str], ...]):
+        self.id = id
+        self.uco_type = uco_type
+        self.mitre_type = mitre_type
+        self.name = name
+        self.source_dataset = source_dataset
+        self.mitre_id = mitre_id
+        self._source = source
+        self._start = start
+        self._end = end
+        self._property_keys = property_keys
+
+    def _load(self) -> None:
+        """Decode the object once and pin whichever of description and properties is unset"""
+        raw = self._source.read_object(self._start, self._end)
+        for slot, value in ((_NODE_DESCRIPTION_SLOT, raw.get('description')),
+                            (_NODE_PROPERTIES_SLOT, PropertyStore(raw, self._property_keys, NODE_ATTRIBUTE_KEYS))):
+            try:
+                slot.__get__(self, UCONode)
+            except AttributeError:
+                slot.__set__(self, value)
+
+    @property
+    def description(self) -> Optional[str]:
+        try:
+            return _NODE_DESCRIPTION_SLOT.__get__(self, UCONode)
+        except AttributeError:
+            self._load()
+            return _NODE_DESCRIPTION_SLOT.__get__(self, UCONode)
+
+    @description.setter
+    def description(self, value: Optional[str]) -> None:
+        _NODE_DESCRIPTION_SLOT.__set__(self, value)
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+        try:
+            return _NODE_PROPERTIES_SLOT.__get__(self, UCONode)
+        except AttributeError:
+            self._load()
+            return _NODE_PROPERTIES_SLOT.__get__(self, UCONode)
+
+    @properties.setter
+    def properties(self, value: Dict[str, Any]) -> None:
+        _NODE_PROPERTIES_SLOT.__set__(self, value)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {name: getattr(self, name) for name in _LAZY_NODE_STATE}
+        for name, slot in (('description', _NODE_DESCRIPTION_SLOT), ('properties', _NODE_PROPERTIES_SLOT)):
+            try:
+                state[name] = slot.__get__(self, UCONode)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+_NODE_DESCRIPTION_SLOT = UCONode.__dict__['description']
+_NODE_PROPERTIES_SLOT = UCONode.__dict__['properties']
+_LAZY_NODE_STATE = ('id', 'uco_type', 'mitre_type', 'name', 'source_dataset', 'mitre_id',
+                    '_source', '_start', '_end', '_property_keys')
+
+@dataclass(slots=True)
 class UCORelationship:
     """Represents a UCO-compliant relationship in the knowledge graph"""
     id: str
@@ -152,70 +446,174 @@ class UCORelationship:
         if self.properties is None:
             self.properties = {}
 
+# STIX fields that decide whether an object changed between ATT&CK releases
+CHANGE_FIELDS = ('modified', 'x_mitre_version', 'revoked', 'x_mitre_deprecated')
+
+
+def change_fingerprint(entity: Any) -> List[Any]:
+    """Return [source_dataset, modified, x_mitre_version, revoked, deprecated] for a node or relationship"""
+    props = entity.properties
+    modified, version, revoked, deprecated = (props.get(_mitre_key(key)) for key in CHANGE_FIELDS)
+    return [entity.source_dataset, modified, version, bool(revoked), bool(deprecated)]
+
+
+@dataclass
+class UCOChangeset:
+    """Nodes and relationships that differ between two converted ATT&CK releases"""
+    added_nodes: List[UCONode] = field(default_factory=list)
+    changed_nodes: List[UCONode] = field(default_factory=list)
+    removed_nodes: List[str] = field(default_factory=list)
+    added_relationships: List[UCORelationship] = field(default_factory=list)
+    changed_relationships: List[UCORelationship] = field(default_factory=list)
+    removed_relationships: List[str] = field(default_factory=list)
+    # Removed relationship id -> [relationship_type, source_ref, target_ref], where the
+    # previous release recorded them, so deletes can seek by endpoint instead of scanning
+    removed_relationship_endpoints: Dict[str, List[str]] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not any((self.added_nodes, self.changed_nodes, self.removed_nodes,
+                        self.added_relationships, self.changed_relationships,
+                        self.removed_relationships))
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'added_nodes': len(self.added_nodes),
+            'changed_nodes': len(self.changed_nodes),
+            'removed_nodes': len(self.removed_nodes),
+            'added_relationships': len(self.added_relationships),
+            'changed_relationships': len(self.changed_relationships),
+            'removed_relationships': len(self.removed_relationships),
+        }
+
+
 class MitreUCOConverter:
-    """Converts MITRE ATT&CK objects to UCO-compliant format"""
+    """Converts MITRE ATT&CK objects to UCO-compliant format
+
+    With ``compact=True`` (the default) raw STIX strings are interned and node
+    and relationship properties are served from a deduplicated
+    ``PropertyStore``; ``compact=False`` builds the original plain dicts.
+    With ``lazy=True`` datasets are memory-mapped and nodes are
+    ``LazyUCONode`` instances that decode description and properties from
+    the bundle on first access.
+    """
     
-    def __init__(self):
+    def __init__(self, compact: bool = True, lazy: bool = False):
         self.mapping = UCOMapping()
+        self.compact = compact
+        self.lazy = lazy
+        self.plans = compile_conversion_plans(self.mapping)
+        # MITRE type -> number of objects skipped because the type has no UCO mapping
+        self.unmapped_types: Dict[str, int] = {}
+        self._adjacency: Optional[AdjacencyIndex] = None
+        # Bumped on every node or relationship change; the adjacency index records the version it was built at
+        self._graph_version = 0
+        self._adjacency_version = -1
+        # Key tuple -> PropertyLayout shared by this converter's PropertyStores
+        self._layouts: Dict[Tuple[str, ...], PropertyLayout] = {}
         self.converted_nodes: Dict[str, UCONode] = {}
         self.converted_relationships: List[UCORelationship] = []
+        # STIX id -> datasets it was converted from, for ids found in more than one
+        self.node_provenance: Dict[str, List[str]] = {}
         
-    def convert_mitre_object(self, mitre_obj: Dict[str, Any], source_dataset: str) -> Optional[UCONode]:
-        """Convert a MITRE object to UCO format"""
+    def _register_node(self, node: UCONode) -> None:
+        """Store a converted node, recording provenance when an id repeats across datasets"""
+        existing = self.converted_nodes.get(node.id)
+        if existing is not None and existing.source_dataset != node.source_dataset:
+            datasets = self.node_provenance.setdefault(node.id, [existing.source_dataset])
+            if node.source_dataset not in datasets:
+                datasets.append(node.source_dataset)
+        self.converted_nodes[node.id] = node
+        self._graph_version += 1
+        
+    def convert_mitre_object(self, mitre_obj: Dict[str, Any], source_dataset: str,
+                             span: Optional[Tuple[Any, int, int]] = None) -> Optional[UCONode]:
+        """Convert a MITRE object to UCO format
+
+        ``span`` is ``(BundleSource, start, end)`` locating the object in its
+        bundle; when given, a ``LazyUCONode`` is built instead of a full node.
+        """
         
         mitre_type = mitre_obj['type']
         
-        if mitre_type not in self.mapping.MITRE_TO_UCO_BASE_MAPPING:
-            print(f"Warning: No UCO mapping for type {mitre_type}")
+        plan = self.plans.get(mitre_type)
+        if plan is None:
+            self.unmapped_types[mitre_type] = self.unmapped_types.get(mitre_type, 0) + 1
             return None
         
-        uco_type = self.mapping.MITRE_TO_UCO_BASE_MAPPING[mitre_type]
-        
         # Extract MITRE ID from external references if available
         mitre_id = None
-        if 'external_references' in mitre_obj:
-            for ref in mitre_obj['external_references']:
-                if ref.get('source_name') == 'mitre-attack':
-                    mitre_id = ref.get('external_id')
-                    break
+        for ref in mitre_obj.get('external_references', ()):
+            if ref.get('source_name') == 'mitre-attack':
+                mitre_id = ref.get('external_id')
+                break
+        
+        if span is not None:
+            source, start, end = span
+            node = LazyUCONode(
+                id=mitre_obj['id'],
+                uco_type=plan.uco_type,
+                mitre_type=plan.mitre_type,
+                name=mitre_obj.get('name'),
+                source_dataset=sys.intern(source_dataset),
+                mitre_id=mitre_id,
+                source=source,
+                start=start,
+                end=end,
+                property_keys=plan.property_keys
+            )
+            self._register_node(node)
+            return node
         
         # Map properties
-        mapped_properties = {}
-        if mitre_type in self.mapping.PROPERTY_MAPPINGS:
-            for mitre_prop, uco_prop in self.mapping.PROPERTY_MAPPINGS[mitre_type].items():
+        if self.compact:
+            mitre_obj = intern_stix_strings(mitre_obj)
+            mapped_properties = PropertyStore(mitre_obj, plan.property_keys, NODE_ATTRIBUTE_KEYS, self._layouts)
+        else:
+            mapped_properties = {}
+            for mitre_prop, uco_prop in plan.property_keys:
                 if mitre_prop in mitre_obj:
                     mapped_properties[uco_prop] = mitre_obj[mitre_prop]
-        
-        # Add all original MITRE properties with mitre: prefix
-        for key, value in mitre_obj.items():
-            if key not in ['id', 'type', 'name', 'description']:
-                mapped_properties[f'mitre:{key}'] = value
+            
+            # Add all original MITRE properties with mitre: prefix
+            for key, value in mitre_obj.items():
+                if key not in NODE_ATTRIBUTE_KEYS:
+                    mapped_properties[f'mitre:{key}'] = value
         
         node = UCONode(
             id=mitre_obj['id'],
-            uco_type=uco_type,
-            mitre_type=mitre_type,
+            uco_type=plan.uco_type,
+            mitre_type=plan.mitre_type,
             name=mitre_obj.get('name'),
             description=mitre_obj.get('description'),
             properties=mapped_properties,
-            source_dataset=source_dataset,
+            source_dataset=sys.intern(source_dataset),
             mitre_id=mitre_id
         )
         
-        self.converted_nodes[node.id] = node
+        self._register_node(node)
         return node
     
-    def convert_mitre_relationship(self, mitre_rel: Dict[str, Any], source_dataset: str) -> Optional[UCORelationship]:
-        """Convert a MITRE relationship to UCO format"""
+    def convert_mitre_relationship(self, mitre_rel: Dict[str, Any], source_dataset: str,
+                                   retain: bool = True) -> Optional[UCORelationship]:
+        """Convert a MITRE relationship to UCO format
+
+        With ``retain=False`` the relationship is only returned, not added to
+        ``converted_relationships``, for callers that write it out and drop it.
+        """
         
         rel_type = mitre_rel['relationship_type']
         uco_rel_type = self.mapping.RELATIONSHIP_MAPPINGS.get(rel_type, 'uco-core:relationship')
         
         # Map relationship properties  
-        mapped_properties = {}
-        for key, value in mitre_rel.items():
-            if key not in ['id', 'type', 'source_ref', 'target_ref', 'relationship_type']:
-                mapped_properties[f'mitre:{key}'] = value
+        if self.compact:
+            mitre_rel = intern_stix_strings(mitre_rel)
+            rel_type = mitre_rel['relationship_type']
+            mapped_properties = PropertyStore(mitre_rel, (), RELATIONSHIP_ATTRIBUTE_KEYS, self._layouts)
+        else:
+            mapped_properties = {}
+            for key, value in mitre_rel.items():
+                if key not in RELATIONSHIP_ATTRIBUTE_KEYS:
+                    mapped_properties[f'mitre:{key}'] = value
         
         relationship = UCORelationship(
             id=mitre_rel['id'],
@@ -224,33 +622,309 @@ class MitreUCOConverter:
             relationship_type=rel_type,
             uco_relationship_type=uco_rel_type,
             properties=mapped_properties,
-            source_dataset=source_dataset
+            source_dataset=sys.intern(source_dataset)
         )
         
-        self.converted_relationships.append(relationship)
+        if retain:
+            self.converted_relationships.append(relationship)
+            self._graph_version += 1
         return relationship
     
-    def process_dataset(self, dataset_path: str, dataset_name: str) -> None:
-        """Process entire MITRE dataset and convert to UCO"""
-        
-        import json
-        with open(dataset_path) as f:
-            data = json.load(f)
-        
-        print(f"Processing {dataset_name} dataset: {len(data['objects'])} objects")
-        
-        # First pass: convert all nodes
-        for obj in data['objects']:
-            if obj['type'] != 'relationship':
-                self.convert_mitre_object(obj, dataset_name)
-        
-        # Second pass: convert all relationships
-        for obj in data['objects']:
+    def process_dataset(self, dataset_path: str, dataset_name: str, decoder: str = 'auto') -> None:
+        """Process entire MITRE dataset and convert to UCO
+
+        Objects are streamed from the bundle and converted in a single pass.
+        Relationships whose endpoints have not been seen yet wait in a small
+        side buffer keyed by the missing endpoint, and are converted as soon as
+        that endpoint arrives (or at the end of the bundle if it never does).
+        """
+
+        from stix_stream import BundleSource, iter_bundle_objects_with_spans
+
+        seen_ids = set()
+        pending: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        object_count = 0
+        unmapped_before = dict(self.unmapped_types)
+
+        def is_known(ref: str) -> bool:
+            return ref in seen_ids or ref in self.converted_nodes
+
+        def missing_endpoint(rel: Dict[str, Any]) -> Optional[str]:
+            for ref in (rel['source_ref'], rel['target_ref']):
+                if not is_known(ref):
+                    return ref
+            return None
+
+        source = BundleSource.open(dataset_path) if self.lazy else None
+
+        for obj, start, end in iter_bundle_objects_with_spans(dataset_path, decoder=decoder):
+            object_count += 1
+
             if obj['type'] == 'relationship':
-                self.convert_mitre_relationship(obj, dataset_name)
-        
+                missing = missing_endpoint(obj)
+                if missing is None:
+                    self.convert_mitre_relationship(obj, dataset_name)
+                else:
+                    pending.setdefault(missing, []).append((object_count, obj))
+                continue
+
+            self.convert_mitre_object(obj, dataset_name, span=(source, start, end) if source else None)
+            seen_ids.add(obj['id'])
+
+            # Release relationships that were waiting on this object
+            for seq, rel in pending.pop(obj['id'], ()):
+                missing = missing_endpoint(rel)
+                if missing is None:
+                    self.convert_mitre_relationship(rel, dataset_name)
+                else:
+                    pending.setdefault(missing, []).append((seq, rel))
+
+        # Relationships with dangling endpoints are still converted, in bundle order
+        leftovers = sorted(
+            (item for waiting in pending.values() for item in waiting),
+            key=lambda item: item[0]
+        )
+        for _, rel in leftovers:
+            self.convert_mitre_relationship(rel, dataset_name)
+
+        print(f"Processed {dataset_name} dataset: {object_count} objects")
+        # unmapped_types accumulates across datasets; report this dataset's share
+        unmapped = {mitre_type: count - unmapped_before.get(mitre_type, 0)
+                    for mitre_type, count in self.unmapped_types.items()
+                    if count > unmapped_before.get(mitre_type, 0)}
+        if unmapped:
+            print(f"Skipped objects with no UCO mapping: {unmapped}")
         print(f"Converted {len(self.converted_nodes)} nodes and {len(self.converted_relationships)} relationships")
 
+    def process_datasets(self, bundles: List[Tuple[str, str]], workers: Optional[int] = None,
+                         decoder: str = 'auto') -> None:
+        """Convert several MITRE bundles in a process pool and merge the results
+
+        ``bundles`` is a list of ``(dataset_path, dataset_name)`` pairs. Each
+        worker converts one bundle into a partial result; partials are merged
+        in the order given, never in completion order. The merged nodes,
+        ``node_provenance``, ``unmapped_types`` and set of relationships are
+        the same as calling ``process_dataset`` on each bundle in turn, and
+        ids converted from more than one dataset keep the last bundle's node.
+
+        Relationship order differs for relationships whose endpoint is only
+        in an earlier bundle: a worker starts without the earlier bundles'
+        nodes, so it treats them as dangling and appends them after the rest
+        of its bundle, in bundle order. Relationships are grouped by bundle,
+        each group in the order of ``process_dataset`` on that bundle alone.
+        """
+
+        workers = min(workers or os.cpu_count() or 1, len(bundles))
+        jobs = [(path, name, decoder, self.compact, self.lazy) for path, name in bundles]
+
+        if workers <= 1:
+            partials = [_convert_bundle(job) for job in jobs]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # map() yields results in submission order regardless of completion
+                partials = list(pool.map(_convert_bundle, jobs))
+
+        for nodes, relationships, unmapped_types in partials:
+            for node in nodes:
+                self._register_node(node)
+            self.converted_relationships.extend(relationships)
+            self._graph_version += 1
+            self._merge_unmapped_types(unmapped_types)
+
+        print(f"Merged {len(bundles)} datasets: {len(self.converted_nodes)} nodes and "
+              f"{len(self.converted_relationships)} relationships")
+
+    def _merge_unmapped_types(self, unmapped_types: Dict[str, int]) -> None:
+        for mitre_type, count in unmapped_types.items():
+            self.unmapped_types[mitre_type] = self.unmapped_types.get(mitre_type, 0) + count
+
+    def process_datasets_cached(self, bundles: List[Tuple[str, str]], cache_dir: str = 'uco_snapshots',
+                                workers: Optional[int] = None) -> List[UCORelationship]:
+        """Load converted bundles from a snapshot, converting them only when needed
+
+        Snapshots are keyed by the SHA-256 of the bundle files, the mapping
+        tables in ``UCOMapping`` and the converter source; any change to them
+        misses the cache, as does a snapshot that no longer unpickles, and
+        falls back to ``process_datasets`` followed by
+        ``get_cross_dataset_connections``, after which a new snapshot is
+        written. Returns the cross-dataset connections.
+        """
+
+        from snapshot_cache import snapshot_key, snapshot_path, load_snapshot, save_snapshot
+
+        key = snapshot_key(bundles, self.mapping, variant=f'compact={self.compact},lazy={self.lazy}')
+        path = snapshot_path(cache_dir, key)
+
+        payload = load_snapshot(path, key)
+        if payload is not None:
+            for node in payload['nodes']:
+                self._register_node(node)
+            self.converted_relationships.extend(payload['relationships'])
+            self._graph_version += 1
+            for node_id, datasets in payload['node_provenance'].items():
+                self.node_provenance.setdefault(node_id, datasets)
+            self._merge_unmapped_types(payload.get('unmapped_types', {}))
+            print(f"Loaded snapshot {path}: {len(payload['nodes'])} nodes, "
+                  f"{len(payload['relationships'])} relationships")
+            return payload['cross_connections']
+
+        partial = MitreUCOConverter(compact=self.compact, lazy=self.lazy)
+        partial.process_datasets(bundles, workers=workers)
+        cross_connections = partial.get_cross_dataset_connections()
+
+        save_snapshot(path, key, {
+            'nodes': list(partial.converted_nodes.values()),
+            'relationships': partial.converted_relationships,
+            'node_provenance': partial.node_provenance,
+            'unmapped_types': partial.unmapped_types,
+            'cross_connections': cross_connections,
+        })
+
+        for node in partial.converted_nodes.values():
+            self._register_node(node)
+        self.converted_relationships.extend(partial.converted_relationships)
+        self._graph_version += 1
+        for node_id, datasets in partial.node_provenance.items():
+            self.node_provenance.setdefault(node_id, datasets)
+        self._merge_unmapped_types(partial.unmapped_types)
+        return cross_connections
+
+    def get_adjacency_index(self) -> AdjacencyIndex:
+        """Return the CSR adjacency index over converted relationships, rebuilding it if they changed
+
+        Changes made through the converter bump its graph version, which
+        covers overwritten nodes and re-converted relationships. Appends made
+        directly to ``converted_relationships`` (cross-dataset connections)
+        are caught by the length check.
+        """
+        index = self._adjacency
+        if (index is None or self._adjacency_version != self._graph_version
+                or index.relationships is not self.converted_relationships
+                or len(index.relationships) != index.relationship_count):
+            index = self._adjacency = AdjacencyIndex(list(self.converted_nodes), self.converted_relationships)
+            self._adjacency_version = self._graph_version
+        return index
+
+    def get_neighbors(self, node_id: str, relationship_type: Optional[str] = None,
+                      direction: str = 'out') -> List[UCONode]:
+        """Converted nodes linked to node_id, e.g. get_neighbors(group_id, 'uses') for a group's
+        techniques and software, or get_neighbors(technique_id, 'mitigates', 'in') for mitigations"""
+        return [self.converted_nodes[neighbor_id]
+                for neighbor_id in self.get_adjacency_index().neighbors(node_id, relationship_type, direction)
+                if neighbor_id in self.converted_nodes]
+
+    def find_dangling_references(self, relationships: Optional[List[UCORelationship]] = None) -> DanglingReferenceReport:
+        """Single pass over relationships reporting endpoints that are missing or revoked/deprecated"""
+        report = DanglingReferenceReport()
+        revoked_key, deprecated_key = _mitre_key('revoked'), _mitre_key('x_mitre_deprecated')
+        endpoint_state: Dict[str, Optional[str]] = {}
+
+        def state_of(ref: str) -> Optional[str]:
+            if ref not in endpoint_state:
+                node = self.converted_nodes.get(ref)
+                if node is None:
+                    endpoint_state[ref] = 'missing'
+                elif node.properties.get(revoked_key):
+                    endpoint_state[ref] = 'revoked'
+                elif node.properties.get(deprecated_key):
+                    endpoint_state[ref] = 'deprecated'
+                else:
+                    endpoint_state[ref] = None
+            return endpoint_state[ref]
+
+        for rel in self.converted_relationships if relationships is None else relationships:
+            for end, ref in (('source', rel.source_ref), ('target', rel.target_ref)):
+                state = state_of(ref)
+                if state is None:
+                    continue
+                entry = {'relationship_id': rel.id, 'relationship_type': rel.relationship_type,
+                         'endpoint': end, 'ref': ref, 'state': state}
+                if state == 'missing':
+                    report.missing.append(entry)
+                else:
+                    report.revoked.append(entry)
+
+        return report
+
+    def get_release_manifest(self) -> Dict[str, Dict[str, List[Any]]]:
+        """Return the change fingerprint of every converted node and relationship, and each
+        relationship's [relationship_type, source_ref, target_ref]"""
+        return {
+            'nodes': {node_id: change_fingerprint(node) for node_id, node in self.converted_nodes.items()},
+            'relationships': {rel.id: change_fingerprint(rel) for rel in self.converted_relationships},
+            'relationship_endpoints': {rel.id: [rel.relationship_type, rel.source_ref, rel.target_ref]
+                                       for rel in self.converted_relationships},
+        }
+
+    def save_release_manifest(self, manifest_path: str) -> None:
+        """Save the release manifest so the next release can be diffed without reconverting this one"""
+        import json
+        with open(manifest_path, 'w') as f:
+            json.dump(self.get_release_manifest(), f)
+
+    def compute_changeset(self, previous: Any, datasets: Optional[List[str]] = None) -> UCOChangeset:
+        """Diff this converter's output against a previous ATT&CK release
+
+        ``previous`` may be another ``MitreUCOConverter``, a manifest dict from
+        ``get_release_manifest`` or the path of a saved manifest. An object is
+        changed when its ``modified`` timestamp, ``x_mitre_version`` or
+        revoked/deprecated state differs. When ``datasets`` is given only
+        objects from those datasets are compared on either side.
+        """
+
+        if isinstance(previous, MitreUCOConverter):
+            manifest = previous.get_release_manifest()
+        elif isinstance(previous, dict):
+            manifest = previous
+        else:
+            import json
+            with open(previous) as f:
+                manifest = json.load(f)
+
+        def in_scope(fingerprint: List[Any]) -> bool:
+            return datasets is None or fingerprint[0] in datasets
+
+        changeset = UCOChangeset()
+
+        old_nodes = manifest['nodes']
+        current_node_ids = set()
+        for node_id, node in self.converted_nodes.items():
+            fingerprint = change_fingerprint(node)
+            if not in_scope(fingerprint):
+                continue
+            current_node_ids.add(node_id)
+            old = old_nodes.get(node_id)
+            if old is None or not in_scope(old):
+                changeset.added_nodes.append(node)
+            elif old != fingerprint:
+                changeset.changed_nodes.append(node)
+        changeset.removed_nodes = [node_id for node_id, old in old_nodes.items()
+                                   if in_scope(old) and node_id not in current_node_ids]
+
+        old_rels = manifest['relationships']
+        current_rel_ids = set()
+        for rel in self.converted_relationships:
+            fingerprint = change_fingerprint(rel)
+            if not in_scope(fingerprint):
+                continue
+            current_rel_ids.add(rel.id)
+            old = old_rels.get(rel.id)
+            if old is None or not in_scope(old):
+                changeset.added_relationships.append(rel)
+            elif old != fingerprint:
+                changeset.changed_relationships.append(rel)
+        changeset.removed_relationships = [rel_id for rel_id, old in old_rels.items()
+                                           if in_scope(old) and rel_id not in current_rel_ids]
+        # Manifests saved before endpoints were recorded lack this section
+        old_endpoints = manifest.get('relationship_endpoints', {})
+        changeset.removed_relationship_endpoints = {rel_id: old_endpoints[rel_id]
+                                                    for rel_id in changeset.removed_relationships
+                                                    if rel_id in old_endpoints}
+
+        print(f"Changeset vs previous release: {changeset.summary()}")
+        return changeset
+
     def get_cross_dataset_connections(self) -> List[UCORelationship]:
         """Identify potential connections between Enterprise and ICS datasets"""
         
@@ -263,22 +937,27 @@ class MitreUCOConverter:
         ics_techniques = {node.mitre_id: node for node in self.converted_nodes.values()
                          if node.mitre_type == 'attack-pattern' and node.source_dataset == 'ics'}
         
-        # Create cross-references for similar techniques
-        for ent_id, ent_node in enterprise_techniques.items():
-            for ics_id, ics_node in ics_techniques.items():
-                if ent_node.name and ics_node.name:
-                    # Simple name similarity check
-                    if ent_node.name.lower() in ics_node.name.lower() or ics_node.name.lower() in ent_node.name.lower():
-                        connection = UCORelationship(
-                            id=f"cross-ref-{ent_id}-{ics_id}",
-                            source_ref=ent_node.id,
-                            target_ref=ics_node.id,
-                            relationship_type='related-to',
-                            uco_relationship_type='uco-core:similarity',
-                            properties={'similarity_basis': 'technique_name', 'confidence': 0.8},
-                            source_dataset='cross-reference'
-                        )
-                        connections.append(connection)
+        # Create cross-references for similar techniques. Names are lowercased
+        # once and substring matches are found with an Aho-Corasick index in
+        # both directions instead of testing every enterprise x ICS pair.
+        ent_items = list(enterprise_techniques.items())
+        ics_items = list(ics_techniques.items())
+        ent_names = [(node.name or '').lower() for _, node in ent_items]
+        ics_names = [(node.name or '').lower() for _, node in ics_items]
+        
+        for i, j in find_substring_pairs(ent_names, ics_names):
+            ent_id, ent_node = ent_items[i]
+            ics_id, ics_node = ics_items[j]
+            connection = UCORelationship(
+                id=f"cross-ref-{ent_id}-{ics_id}",
+                source_ref=ent_node.id,
+                target_ref=ics_node.id,
+                relationship_type='related-to',
+                uco_relationship_type='uco-core:similarity',
+                properties={'similarity_basis': 'technique_name', 'confidence': 0.8},
+                source_dataset='cross-reference'
+            )
+            connections.append(connection)
         
         # Find common actors/groups between datasets
         enterprise_groups = {node.name: node for node in self.converted_nodes.values() 
@@ -304,12 +983,21 @@ class MitreUCOConverter:
         print(f"Generated {len(connections)} cross-dataset connections")
         return connections
 
+def _convert_bundle(job: Tuple[str, str, str, bool, bool]) -> Tuple[List[UCONode], List[UCORelationship], Dict[str, int]]:
+    """Process-pool entry point: convert one bundle into a partial result"""
+    dataset_path, dataset_name, decoder, compact, lazy = job
+    converter = MitreUCOConverter(compact=compact, lazy=lazy)
+    converter.process_dataset(dataset_path, dataset_name, decoder=decoder)
+    return list(converter.converted_nodes.values()), converter.converted_relationships, converter.unmapped_types
+
 if __name__ == "__main__":
     converter = MitreUCOConverter()
     
     # Process both datasets
-    converter.process_dataset('enterprise-attack-17.1.json', 'enterprise')
-    converter.process_dataset('ics-attack-17.1.json', 'ics')
+    converter.process_datasets([
+        ('enterprise-attack-17.1.json', 'enterprise'),
+        ('ics-attack-17.1.json', 'ics'),
+    ])
     
     # Generate cross-dataset connections
     cross_connections = converter.get_cross_dataset_connections()
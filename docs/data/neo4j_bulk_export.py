@@ -0,0 +1,210 @@
+"""
+Neo4j Bulk Import Export
+Streams converted UCO nodes and relationships into neo4j-admin import CSV
+files (a header and a data file per label and per relationship type) for
+offline cold loads of an empty database, plus the schema DDL to apply once
+the loaded database is started
+"""
+
+import csv
+import json
+import os
+import shlex
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from neo4j_writer import (BASE_LABEL, SCHEMA_PATH, load_schema_statements, neo4j_label, neo4j_relationship_type,
+                          node_row, relationship_row)
+
+# Every node shares one id space, since relationships cross labels freely
+ID_SPACE = 'UcoObject'
+# Unit separator: never appears in ATT&CK text, unlike ';' or '|'
+ARRAY_DELIMITER = '\x1f'
+
+_SCALAR_TYPES = ((bool, 'boolean'), (int, 'long'), (float, 'double'), (str, 'string'))
+
+
+def _value_type(value: Any) -> Optional[str]:
+    """neo4j-admin column type for a value, '[]' for an empty list, None for a missing value"""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return _value_type(value[0]) + '[]' if value else '[]'
+    for python_type, column_type in _SCALAR_TYPES:
+        if isinstance(value, python_type):
+            return column_type
+    return 'string'
+
+
+def _merge_types(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    if current is None or current == new:
+        return new if current is None else current
+    if new is None:
+        return current
+    # An empty list fits any array column
+    if current == '[]' and new.endswith('[]'):
+        return new
+    if new == '[]' and current.endswith('[]'):
+        return current
+    return 'string'
+
+
+def _format_scalar(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _format_value(value: Any, column_type: str) -> str:
+    """Field text for a value in a column of the given type; '' leaves the property unset"""
+    if value is None:
+        return ''
+    if column_type.endswith('[]'):
+        return ARRAY_DELIMITER.join(_format_scalar(item) for item in value)
+    if column_type == 'string' and not isinstance(value, str):
+        # Column widened to string because rows disagree on the type
+        return json.dumps(value, sort_keys=True)
+    return _format_scalar(value)
+
+
+def _column_types(rows: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    types: Dict[str, Optional[str]] = {}
+    for row in rows:
+        for key, value in row['props'].items():
+            types[key] = _merge_types(types.get(key), _value_type(value))
+    # Columns that only ever held empty lists or nulls
+    return {key: ('string[]' if column_type == '[]' else column_type or 'string')
+            for key, column_type in types.items()}
+
+
+@dataclass
+class BulkImportExport:
+    """Files written by export_bulk_import, keyed by node label / relationship type"""
+    out_dir: str
+    node_files: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    relationship_files: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    node_counts: Dict[str, int] = field(default_factory=dict)
+    relationship_counts: Dict[str, int] = field(default_factory=dict)
+    schema_file: Optional[str] = None
+
+    def import_command(self, database: str = 'neo4j') -> List[str]:
+        """neo4j-admin (5.x) arguments that load these files into an empty database"""
+        command = ['neo4j-admin', 'database', 'import', 'full', database]
+        # Labels come from each file's :LABEL column; BASE_LABEL contains ':',
+        # which --nodes=Label=... cannot express
+        for header, data in self.node_files.values():
+            command.append(f'--nodes={header},{data}')
+        for rel_type, (header, data) in self.relationship_files.items():
+            command.append(f'--relationships={rel_type}={header},{data}')
+        command += [f'--array-delimiter=U+{ord(ARRAY_DELIMITER):04X}', '--multiline-fields=true',
+                    '--overwrite-destination=true']
+        return command
+
+    def schema_command(self, database: str = 'neo4j') -> List[str]:
+        """
+        cypher-shell arguments that create the constraints and indexes once the
+        imported database is started; neo4j-admin import creates none, and
+        every MERGE on an id relies on them. Credentials come from
+        NEO4J_USERNAME / NEO4J_PASSWORD. --fail-at-end keeps going past
+        statements the edition rejects (existence constraints on Community).
+        """
+        return ['cypher-shell', '-d', database, '--fail-at-end', '-f', self.schema_file]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'nodes': sum(self.node_counts.values()),
+            'relationships': sum(self.relationship_counts.values()),
+            'node_files': len(self.node_files),
+            'relationship_files': len(self.relationship_files),
+        }
+
+
+def _write_header(path: str, columns: Sequence[str]) -> None:
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow(columns)
+
+
+def _property_columns(types: Dict[str, str]) -> Tuple[List[str], List[str]]:
+    """Property keys in a stable order and their header entries. Types are always
+    explicit, so keys containing ':' ('mitre:modified') still parse as names."""
+    keys = sorted(types)
+    return keys, [f'{key}:{types[key]}' for key in keys]
+
+
+def export_bulk_import(nodes: Sequence[Any], relationships: Sequence[Any], out_dir: str,
+                       created: Optional[datetime] = None) -> BulkImportExport:
+    """
+    Write neo4j-admin import files for UCO nodes and relationships.
+
+    Two passes over the inputs: the first settles each label's and
+    relationship type's columns and types, the second streams rows straight
+    to the data files. Node and relationship properties match what
+    Neo4jBatchWriter would MERGE. Empty strings and empty lists leave the
+    property unset, as neo4j-admin does not distinguish them from missing
+    values. Relationships must not reference missing nodes (see
+    MitreUCOConverter.find_dangling_references). The schema DDL is written
+    alongside as schema.cypher, with apply_schema.sh to run it once the
+    imported database is started.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    created_text = (created or datetime.now(timezone.utc)).isoformat()
+    export = BulkImportExport(out_dir)
+
+    nodes_by_label: Dict[str, List[Any]] = {}
+    for node in nodes:
+        nodes_by_label.setdefault(neo4j_label(node.mitre_type), []).append(node)
+    rels_by_type: Dict[str, List[Any]] = {}
+    for rel in relationships:
+        rels_by_type.setdefault(neo4j_relationship_type(rel.relationship_type), []).append(rel)
+
+    for label, label_nodes in sorted(nodes_by_label.items()):
+        types = _column_types(node_row(node) for node in label_nodes)
+        keys, columns = _property_columns(types)
+        header = os.path.join(out_dir, f'nodes-{label}-header.csv')
+        data = os.path.join(out_dir, f'nodes-{label}.csv')
+        node_labels = ARRAY_DELIMITER.join((label, BASE_LABEL))
+        _write_header(header, [f'id:ID({ID_SPACE})', ':LABEL', 'created:datetime'] + columns)
+        with open(data, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            for node in label_nodes:
+                row = node_row(node)
+                props = row['props']
+                writer.writerow([row['id'], node_labels, created_text] +
+                                [_format_value(props.get(key), types[key]) for key in keys])
+        export.node_files[label] = (header, data)
+        export.node_counts[label] = len(label_nodes)
+
+    for rel_type, type_rels in sorted(rels_by_type.items()):
+        types = _column_types(relationship_row(rel) for rel in type_rels)
+        keys, columns = _property_columns(types)
+        header = os.path.join(out_dir, f'relationships-{rel_type}-header.csv')
+        data = os.path.join(out_dir, f'relationships-{rel_type}.csv')
+        _write_header(header, [f':START_ID({ID_SPACE})', f':END_ID({ID_SPACE})', 'id:string',
+                               'created:datetime'] + columns)
+        with open(data, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            for rel in type_rels:
+                row = relationship_row(rel)
+                props = row['props']
+                writer.writerow([row['source'], row['target'], row['id'], created_text] +
+                                [_format_value(props.get(key), types[key]) for key in keys])
+        export.relationship_files[rel_type] = (header, data)
+        export.relationship_counts[rel_type] = len(type_rels)
+
+    # neo4j-admin import creates no constraints or indexes: ship the DDL for after startup
+    export.schema_file = os.path.join(out_dir, 'schema.cypher')
+    with open(export.schema_file, 'w', encoding='utf-8') as f:
+        for statement in load_schema_statements(SCHEMA_PATH):
+            f.write(statement + ';\n')
+
+    with open(os.path.join(out_dir, 'import.sh'), 'w', encoding='utf-8') as f:
+        f.write('#!/bin/sh\n# Offline load into an empty (stopped) database; start it and run\n'
+                '# apply_schema.sh before any MERGE-based ingestion\n')
+        f.write(' \\\n    '.join(shlex.quote(arg) for arg in export.import_command()) + '\n')
+    with open(os.path.join(out_dir, 'apply_schema.sh'), 'w', encoding='utf-8') as f:
+        f.write('#!/bin/sh\n# Constraints and indexes for the imported, started database\n'
+                '# (credentials from NEO4J_USERNAME / NEO4J_PASSWORD)\n')
+        f.write(' '.join(shlex.quote(arg) for arg in export.schema_command()) + '\n')
+
+    return export
@@ -0,0 +1,503 @@
+"""
+Batched Neo4j Writer
+Idempotent UNWIND ... MERGE writes keyed on indexed ids, run concurrently
+across labels with commit-latency-driven batch sizes and transient-error retry
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from stream_stages import gather_or_cancel
+
+# Properties every node and relationship row carries besides its properties map
+NODE_FIELDS = ('mitre_id', 'name', 'description', 'mitre_type', 'uco_type', 'source_dataset')
+RELATIONSHIP_FIELDS = ('relationship_type', 'uco_relationship_type', 'source_dataset')
+
+NEO4J_LABELS = {
+    'attack-pattern': 'AttackPattern',
+    'malware': 'Malware',
+    'intrusion-set': 'ThreatActor',
+    'course-of-action': 'Mitigation',
+    'tool': 'Tool',
+    'campaign': 'Campaign',
+    'x-mitre-tactic': 'Tactic',
+    'x-mitre-asset': 'ICSAsset',
+    'x-mitre-data-source': 'DataSource',
+    'x-mitre-data-component': 'DataComponent',
+    'x-mitre-matrix': 'Matrix',
+    'x-mitre-collection': 'Collection'
+}
+DEFAULT_LABEL = 'MitreObject'
+# Shared by every node, with a uniqueness constraint on id (uco_object_id in
+# neo4j_schema_ddl.cypher): nodes are merged on it, and endpoints of unknown
+# label are looked up through it, so once the schema is applied every id
+# lookup is an index seek rather than a label scan
+BASE_LABEL = 'uco-core:UcoObject'
+# Constraints the MERGE queries cannot do without; see Neo4jBatchWriter.verify_schema
+REQUIRED_CONSTRAINTS = ('uco_object_id',)
+
+# Constraints and indexes, shipped next to this module
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'neo4j_schema_ddl.cypher')
+
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CONSTRAINT_NAME_RE = re.compile(r'CREATE\s+CONSTRAINT\s+(\w+)', re.I)
+
+
+def neo4j_label(mitre_type: str) -> str:
+    """Neo4j node label for a MITRE object type"""
+    return NEO4J_LABELS.get(mitre_type, DEFAULT_LABEL)
+
+
+def node_label_map(nodes: Iterable[Any]) -> Dict[str, str]:
+    """Node id -> Neo4j label, used to resolve relationship endpoints"""
+    return {node.id: neo4j_label(node.mitre_type) for node in nodes}
+
+
+def neo4j_relationship_type(relationship_type: str) -> str:
+    """Neo4j relationship type for a STIX relationship type ('subtechnique-of' -> SUBTECHNIQUE_OF)"""
+    return relationship_type.upper().replace('-', '_')
+
+
+def _storable(value: Any) -> bool:
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(isinstance(item, (str, bool, int, float)) for item in value) and \
+            len({type(item) for item in value}) <= 1
+    return False
+
+
+def neo4j_property(value: Any) -> Any:
+    """
+    Value as Neo4j can store it: primitives and homogeneous lists of primitives
+    pass through, anything else (external references, kill chain phases, ...)
+    is stored as its JSON text.
+    """
+    if _storable(value):
+        return list(value) if isinstance(value, tuple) else value
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def node_row(node: Any) -> Dict[str, Any]:
+    """UNWIND row for a UCONode: its id plus a flat map of storable properties"""
+    props = {key: neo4j_property(value) for key, value in node.properties.items()}
+    for name in NODE_FIELDS:
+        props[name] = getattr(node, name)
+    return {'id': node.id, 'props': props}
+
+
+def relationship_row(rel: Any) -> Dict[str, Any]:
+    """UNWIND row for a UCORelationship: id, endpoint ids and a flat property map"""
+    props = {key: neo4j_property(value) for key, value in rel.properties.items()}
+    for name in RELATIONSHIP_FIELDS:
+        props[name] = getattr(rel, name)
+    return {'id': rel.id, 'source': rel.source_ref, 'target': rel.target_ref, 'props': props}
+
+
+def load_schema_statements(path: str = SCHEMA_PATH) -> List[str]:
+    """Statements of a Cypher schema file, without /* */ blocks or whole-line // comments"""
+    with open(path, encoding='utf-8') as f:
+        text = _BLOCK_COMMENT_RE.sub('', f.read())
+    lines = [line for line in text.splitlines() if not line.lstrip().startswith('//')]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def build_node_merge_query(label: str) -> str:
+    """MERGE on the base label's unique id, so replaying a batch never duplicates nodes"""
+    return f"""
+    UNWIND $rows AS row
+    MERGE (n:`{BASE_LABEL}` {{id: row.id}})
+    ON CREATE SET n.created = datetime()
+    SET n:`{label}`, n += row.props
+    """
+
+
+def build_relationship_merge_query(rel_type: str, source_label: str = BASE_LABEL,
+                                   target_label: str = BASE_LABEL) -> str:
+    """MERGE on the relationship id between endpoints matched through their labels' id constraints"""
+    return f"""
+    UNWIND $rows AS row
+    MATCH (source:`{source_label}` {{id: row.source}})
+    MATCH (target:`{target_label}` {{id: row.target}})
+    MERGE (source)-[r:`{rel_type}` {{id: row.id}}]->(target)
+    ON CREATE SET r.created = datetime()
+    SET r += row.props
+    """
+
+
+NODE_DELETE_QUERY = f"""
+    UNWIND $rows AS nodeId
+    MATCH (n:`{BASE_LABEL}` {{id: nodeId}})
+    DETACH DELETE n
+    """
+
+
+
+def build_relationship_delete_query(rel_type: str) -> str:
+    """Delete by id, reaching the relationship from its source node's id constraint"""
+    return f"""
+    UNWIND $rows AS row
+    MATCH (:`{BASE_LABEL}` {{id: row.source}})-[r:`{rel_type}` {{id: row.id}}]->()
+    DELETE r
+    """
+
+
+# Fallback for relationships whose type and endpoints are unknown (manifests
+# saved before they were recorded): untyped, so it scans every relationship
+RELATIONSHIP_DELETE_QUERY = """
+    UNWIND $rows AS relId
+    MATCH ()-[r {id: relId}]->()
+    DELETE r
+    """
+
+
+@dataclass
+class WriteBatch:
+    """One transaction's worth of work: a query, its UNWIND rows and what they are"""
+    kind: str          # 'node', 'relationship', 'delete_node', 'delete_relationship' or 'schema'
+    key: str           # node label or relationship type ('' for schema, node and untyped relationship deletes)
+    query: str
+    rows: List[Any]
+    source_label: Optional[str] = None   # endpoint labels of a relationship batch
+    target_label: Optional[str] = None
+
+
+class TransientWriteError(Exception):
+    """A write failed in a way that may succeed when retried (deadlock, leader switch, timeout)"""
+
+
+class MissingConstraintError(Exception):
+    """The database lacks a constraint the writer's MERGE queries rely on"""
+
+
+class Neo4jSink:
+    """
+    Executes write batches against a Neo4j server with the official async driver.
+
+    The driver is created on the first write, so building a pipeline does
+    not require the neo4j package or a reachable server. Each batch runs in
+    its own explicit transaction; retrying is left to Neo4jBatchWriter so
+    the retry budget is the pipeline's ``max_retries``.
+    """
+
+    def __init__(self, uri: str, user: str, password: str, database: Optional[str] = None):
+        self.uri = uri
+        self.auth = (user, password)
+        self.database = database
+        self._driver = None
+        self.transient_errors: Tuple[type, ...] = (TransientWriteError,)
+
+    def _get_driver(self):
+        if self._driver is None:
+            try:
+                from neo4j import AsyncGraphDatabase
+                from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+            except ImportError as exc:
+                raise ImportError("Neo4jSink requires the neo4j package") from exc
+            self.transient_errors = (TransientWriteError, TransientError, ServiceUnavailable, SessionExpired)
+            self._driver = AsyncGraphDatabase.driver(self.uri, auth=self.auth)
+        return self._driver
+
+    async def execute(self, batch: WriteBatch) -> None:
+        async with self._get_driver().session(database=self.database) as session:
+            tx = await session.begin_transaction()
+            try:
+                result = await tx.run(batch.query, rows=batch.rows)
+                await result.consume()
+                await tx.commit()
+            finally:
+                # Rolls back unless the commit above went through
+                await tx.close()
+
+    async def constraint_names(self) -> Set[str]:
+        async with self._get_driver().session(database=self.database) as session:
+            result = await session.run("SHOW CONSTRAINTS YIELD name RETURN name")
+            return {record['name'] async for record in result}
+
+    async def close(self) -> None:
+        if self._driver is not None:
+            await self._driver.close()
+            self._driver = None
+
+
+class FakeNeo4jSink:
+    """
+    In-process stand-in for Neo4jSink with MERGE semantics: nodes are keyed
+    by id and relationships by (type, id), so a rerun updates in place
+    exactly like the server would. Relationship endpoints only match nodes
+    carrying the batch's endpoint labels.
+
+    Schema statements are recorded in ``schema_statements``, and the names
+    of the constraints they create in ``constraints``.
+
+    ``latency`` (seconds per row) simulates commit time for exercising batch
+    sizing, and ``fail_batches`` makes the first N data writes raise a
+    TransientWriteError for exercising retries.
+    """
+
+    def __init__(self, latency: float = 0.0, fail_batches: int = 0):
+        self.latency = latency
+        self.fail_batches = fail_batches
+        self.transient_errors: Tuple[type, ...] = (TransientWriteError,)
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.node_labels: Dict[str, Set[str]] = {}
+        self.relationships: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.schema_statements: List[str] = []
+        self.constraints: Set[str] = set()
+        self.transactions = 0
+        self.failed_transactions = 0
+        self.batch_sizes: List[int] = []
+
+    async def execute(self, batch: WriteBatch) -> None:
+        self.transactions += 1
+        if batch.kind == 'schema':
+            self.schema_statements.append(batch.query)
+            match = _CONSTRAINT_NAME_RE.match(batch.query)
+            if match:
+                self.constraints.add(match.group(1))
+            return
+        if self.fail_batches:
+            self.fail_batches -= 1
+            self.failed_transactions += 1
+            raise TransientWriteError(f"simulated transient failure on {batch.kind} {batch.key}")
+        if self.latency:
+            await asyncio.sleep(self.latency * len(batch.rows))
+        self.batch_sizes.append(len(batch.rows))
+
+        if batch.kind == 'node':
+            for row in batch.rows:
+                self.nodes.setdefault(row['id'], {'id': row['id']}).update(row['props'])
+                self.node_labels.setdefault(row['id'], {BASE_LABEL}).add(batch.key)
+        elif batch.kind == 'relationship':
+            for row in batch.rows:
+                # MATCH on a missing endpoint yields no row, so nothing is merged
+                if batch.source_label in self.node_labels.get(row['source'], ()) and \
+                        batch.target_label in self.node_labels.get(row['target'], ()):
+                    rel = self.relationships.setdefault((batch.key, row['id']), {'id': row['id']})
+                    rel.update(row['props'], source=row['source'], target=row['target'])
+        elif batch.kind == 'delete_relationship' and batch.key:
+            for row in batch.rows:
+                rel = self.relationships.get((batch.key, row['id']))
+                if rel is not None and rel['source'] == row['source']:
+                    del self.relationships[(batch.key, row['id'])]
+        elif batch.kind == 'delete_relationship':
+            ids = set(batch.rows)
+            self.relationships = {key: rel for key, rel in self.relationships.items() if key[1] not in ids}
+        elif batch.kind == 'delete_node':
+            ids = set(batch.rows)
+            self.nodes = {key: node for key, node in self.nodes.items() if key not in ids}
+            self.node_labels = {key: labels for key, labels in self.node_labels.items() if key not in ids}
+            self.relationships = {key: rel for key, rel in self.relationships.items()
+                                  if rel['source'] not in ids and rel['target'] not in ids}
+
+    async def constraint_names(self) -> Set[str]:
+        return set(self.constraints)
+
+    async def close(self) -> None:
+        pass
+
+
+class AdaptiveBatchSize:
+    """
+    Batch size steered by commit latency: grown by half while commits finish
+    well under ``target_seconds``, halved when one overruns it or fails.
+    """
+
+    def __init__(self, initial: int, minimum: int = 10, maximum: int = 5000, target_seconds: float = 0.5):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.size = max(minimum, min(maximum, initial))
+
+    def record(self, rows: int, seconds: float) -> None:
+        if rows < self.size:
+            return  # a short tail batch says nothing about a full one
+        if seconds > self.target_seconds:
+            self.size = max(self.minimum, self.size // 2)
+        elif seconds < self.target_seconds / 2:
+            self.size = min(self.maximum, self.size + max(1, self.size // 2))
+
+    def record_failure(self) -> None:
+        self.size = max(self.minimum, self.size // 2)
+
+
+@dataclass
+class WriteStats:
+    """Counters for one writer, per node label / relationship type"""
+    rows: Dict[str, int] = field(default_factory=dict)
+    transactions: int = 0
+    retries: int = 0
+    commit_seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'rows': sum(self.rows.values()),
+            'transactions': self.transactions,
+            'retries': self.retries,
+            'commit_seconds': round(self.commit_seconds, 3),
+            'by_key': dict(self.rows),
+        }
+
+
+class Neo4jBatchWriter:
+    """
+    Writes UCO nodes and relationships through a sink (Neo4jSink or
+    FakeNeo4jSink) using idempotent UNWIND ... MERGE batches.
+
+    Nodes are grouped per label and relationships per (source label, type,
+    target label), with endpoint labels resolved from a node id -> label
+    map, so each endpoint MATCH uses that label's id constraint (see
+    apply_schema and verify_schema: without the constraints every MERGE
+    and MATCH scans its label). The groups
+    are written concurrently, at most ``concurrency`` transactions at a time,
+    while batches within a group run in order with their own
+    AdaptiveBatchSize. A batch raising one of the sink's transient errors
+    is retried with exponential backoff up to ``max_retries`` times, which
+    is safe because MERGE makes replays idempotent.
+    """
+
+    def __init__(self, sink: Any, batch_size: int = 100, max_retries: int = 3, concurrency: int = 4,
+                 max_batch_size: int = 5000, target_commit_seconds: float = 0.5,
+                 retry_backoff: float = 0.1):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.max_batch_size = max_batch_size
+        self.target_commit_seconds = target_commit_seconds
+        self.retry_backoff = retry_backoff
+        self.stats = WriteStats()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._batch_sizes: Dict[Tuple[Optional[str], ...], AdaptiveBatchSize] = {}
+
+    def _sizer(self, *group: Optional[str]) -> AdaptiveBatchSize:
+        sizer = self._batch_sizes.get(group)
+        if sizer is None:
+            sizer = self._batch_sizes[group] = AdaptiveBatchSize(
+                self.batch_size, minimum=min(10, self.batch_size), maximum=self.max_batch_size,
+                target_seconds=self.target_commit_seconds)
+        return sizer
+
+    async def _execute(self, batch: WriteBatch, sizer: AdaptiveBatchSize) -> None:
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                started = time.perf_counter()
+                try:
+                    await self.sink.execute(batch)
+                except self.sink.transient_errors:
+                    if attempt >= self.max_retries:
+                        raise
+                    failed = True
+                else:
+                    failed = False
+                elapsed = time.perf_counter() - started
+            self.stats.transactions += 1
+            self.stats.commit_seconds += elapsed
+            if not failed:
+                sizer.record(len(batch.rows), elapsed)
+                return
+            attempt += 1
+            self.stats.retries += 1
+            sizer.record_failure()
+            await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
+    async def _write_group(self, kind: str, key: str, query: str, rows: List[Any],
+                           source_label: Optional[str] = None, target_label: Optional[str] = None) -> None:
+        sizer = self._sizer(kind, source_label, key, target_label)
+        start = 0
+        while start < len(rows):
+            size = sizer.size
+            batch = WriteBatch(kind, key, query, rows[start:start + size], source_label, target_label)
+            await self._execute(batch, sizer)
+            start += size
+        stat_key = key if kind in ('node', 'relationship') else kind
+        self.stats.rows[stat_key] = self.stats.rows.get(stat_key, 0) + len(rows)
+
+    async def write_nodes(self, nodes: Iterable[Any]) -> int:
+        """MERGE nodes grouped by label; returns the number of rows written"""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for node in nodes:
+            groups.setdefault(neo4j_label(node.mitre_type), []).append(node_row(node))
+        await gather_or_cancel([self._write_group('node', label, build_node_merge_query(label), rows)
+                                for label, rows in groups.items()])
+        return sum(len(rows) for rows in groups.values())
+
+    async def write_relationships(self, relationships: Iterable[Any],
+                                  labels: Optional[Mapping[str, str]] = None) -> int:
+        """
+        MERGE relationships grouped by (source label, type, target label);
+        endpoints must already be written. ``labels`` maps node ids to labels
+        (see node_label_map); endpoints missing from it are matched through
+        BASE_LABEL.
+        """
+        labels = labels or {}
+        groups: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        for rel in relationships:
+            group = (labels.get(rel.source_ref, BASE_LABEL), neo4j_relationship_type(rel.relationship_type),
+                     labels.get(rel.target_ref, BASE_LABEL))
+            groups.setdefault(group, []).append(relationship_row(rel))
+        await gather_or_cancel([
+            self._write_group('relationship', rel_type,
+                              build_relationship_merge_query(rel_type, source_label, target_label),
+                              rows, source_label, target_label)
+            for (source_label, rel_type, target_label), rows in groups.items()
+        ])
+        return sum(len(rows) for rows in groups.values())
+
+    async def delete(self, node_ids: Sequence[str], relationship_ids: Sequence[str],
+                     relationship_endpoints: Optional[Mapping[str, Sequence[str]]] = None) -> None:
+        """
+        Delete relationships, then detach-delete nodes, by id.
+        ``relationship_endpoints`` maps relationship ids to (relationship_type,
+        source_ref, target_ref) (see UCOChangeset); those are deleted per type
+        through their source node's index, the rest with an untyped scan.
+        """
+        relationship_endpoints = relationship_endpoints or {}
+        groups: Dict[str, List[Dict[str, str]]] = {}
+        untyped = []
+        for rel_id in relationship_ids:
+            endpoints = relationship_endpoints.get(rel_id)
+            if endpoints is None:
+                untyped.append(rel_id)
+            else:
+                rel_type, source, _ = endpoints
+                groups.setdefault(neo4j_relationship_type(rel_type), []).append({'id': rel_id, 'source': source})
+        await gather_or_cancel([
+            self._write_group('delete_relationship', rel_type, build_relationship_delete_query(rel_type), rows)
+            for rel_type, rows in groups.items()
+        ])
+        if untyped:
+            await self._write_group('delete_relationship', '', RELATIONSHIP_DELETE_QUERY, untyped)
+        if node_ids:
+            await self._write_group('delete_node', '', NODE_DELETE_QUERY, list(node_ids))
+
+    async def apply_schema(self, statements: Sequence[str]) -> List[Tuple[str, str]]:
+        """
+        Run schema statements one transaction each, in order. A failing
+        statement (an Enterprise-only constraint on Community Edition, say)
+        does not stop the rest; returns the (statement, error) failures.
+        """
+        failures = []
+        for statement in statements:
+            try:
+                await self.sink.execute(WriteBatch('schema', '', statement, []))
+            except Exception as exc:
+                failures.append((statement, str(exc)))
+        return failures
+
+    async def verify_schema(self, required: Sequence[str] = REQUIRED_CONSTRAINTS) -> None:
+        """Raise MissingConstraintError unless every ``required`` constraint exists"""
+        missing = sorted(set(required) - await self.sink.constraint_names())
+        if missing:
+            raise MissingConstraintError(
+                f"Neo4j is missing constraints {', '.join(missing)}; apply {os.path.basename(SCHEMA_PATH)} "
+                f"before writing")
+
+    async def close(self) -> None:
+        await self.sink.close()
+
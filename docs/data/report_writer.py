@@ -0,0 +1,97 @@
+"""
+Streaming Cross-Dataset Report Writer
+Emits CrossReferenceAnalysis results as Markdown or JSON Lines one line at a
+time, so reports over many dataset pairs never exist whole in memory
+"""
+
+import json
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Iterator, TextIO, Tuple
+
+REPORT_TITLE = 'MITRE ATT&CK Cross-Dataset Analysis Report'
+REPORT_FORMATS = ('markdown', 'jsonl')
+
+# (left dataset name, right dataset name, CrossReferenceAnalysis)
+PairAnalysis = Tuple[str, str, Any]
+
+
+def _record_label(record: Dict[str, Any], name_key: str, kind: str) -> str:
+    """Display name of a match; alias and similarity matches carry no shared name, so
+    they are labelled with both sides' names"""
+    if name_key in record:
+        return record[name_key]
+    return f"{record[f'enterprise_{kind}'].get('name')} / {record[f'ics_{kind}'].get('name')}"
+
+
+def iter_markdown_sections(analysis: Any, left_label: str = 'Enterprise', right_label: str = 'ICS',
+                           level: int = 2) -> Iterator[str]:
+    """Markdown lines (without newlines) for one pair's analysis, section headings at the given level"""
+    heading = '#' * level
+
+    # Shared Techniques
+    yield f"{heading} Shared Techniques ({len(analysis.shared_techniques)})"
+    for tech in analysis.shared_techniques[:10]:  # Top 10
+        yield f"- **{tech['mitre_id']}**: {tech['enterprise_technique']['name']}"
+
+    # Shared Actors
+    yield f"\n{heading} Shared Threat Actors ({len(analysis.shared_actors)})"
+    for actor in analysis.shared_actors:
+        yield f"- **{_record_label(actor, 'name', 'actor')}** ({actor['match_type']})"
+
+    # Shared Malware
+    yield f"\n{heading} Shared Malware ({len(analysis.shared_malware)})"
+    for malware in analysis.shared_malware:
+        yield f"- **{malware['name']}** ({malware['match_type']})"
+
+    # Similar Techniques
+    yield f"\n{heading} Similar Techniques ({len(analysis.technique_similarities)})"
+    for sim in analysis.technique_similarities[:5]:  # Top 5
+        yield f"- **{left_label}**: {sim['enterprise_technique']['name']} ({sim['enterprise_technique']['mitre_id']})"
+        yield f"  **{right_label}**: {sim['ics_technique']['name']} ({sim['ics_technique']['mitre_id']})"
+        yield f"  **Similarity**: {sim['similarity_score']}"
+
+    # Platform Analysis
+    if analysis.platform_intersections:
+        platform_analysis = analysis.platform_intersections[0]
+        yield f"\n{heading} Platform Coverage Analysis"
+        yield f"- **Common Platforms**: {', '.join(platform_analysis['common_platforms'])}"
+        yield f"- **Overlap Percentage**: {platform_analysis['overlap_percentage']:.1f}%"
+
+    # Tactic Mappings
+    yield f"\n{heading} Tactic Mappings ({len(analysis.tactic_mappings)})"
+    for mapping in analysis.tactic_mappings:
+        yield f"- **{_record_label(mapping, 'tactic_name', 'tactic')}** ({mapping['match_type']})"
+
+
+def iter_markdown_report(pairs: Iterable[PairAnalysis]) -> Iterator[str]:
+    """Markdown report over any number of dataset pairs, one ``##`` section per pair"""
+    yield f"# {REPORT_TITLE}\n"
+    for left, right, analysis in pairs:
+        yield f"## {left} vs {right}\n"
+        yield from iter_markdown_sections(analysis, left, right, level=3)
+        yield ''
+
+
+def iter_jsonl_records(pairs: Iterable[PairAnalysis]) -> Iterator[str]:
+    """One JSON object per result record, tagged with its dataset pair and section"""
+    for left, right, analysis in pairs:
+        for section in fields(analysis):
+            for record in getattr(analysis, section.name):
+                yield json.dumps({'left': left, 'right': right, 'section': section.name, 'record': record})
+
+
+def stream_report(pairs: Iterable[PairAnalysis], fmt: str = 'markdown') -> Iterator[str]:
+    """Newline-terminated report lines, e.g. as the body of a streaming HTTP response"""
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    lines = iter_markdown_report(pairs) if fmt == 'markdown' else iter_jsonl_records(pairs)
+    for line in lines:
+        yield line + '\n'
+
+
+def write_report(pairs: Iterable[PairAnalysis], out: TextIO, fmt: str = 'markdown') -> int:
+    """Write the report incrementally to a text stream; returns the number of lines written"""
+    count = 0
+    for count, line in enumerate(stream_report(pairs, fmt), 1):
+        out.write(line)
+    return count
@@ -0,0 +1,101 @@
+"""
+Converted Graph Snapshot Cache
+Content-addressed binary snapshots of MitreUCOConverter output so startup can
+skip reparsing and reconverting unchanged ATT&CK bundles
+"""
+
+import hashlib
+import importlib
+import json
+import mmap
+import os
+import pickle
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Bump whenever the snapshot file format changes; conversion code changes are
+# picked up by the source digest in snapshot_key
+SNAPSHOT_VERSION = 1
+
+# Modules whose code decides what a converted graph and its pickled classes look like
+CONVERTER_MODULES = ('mitre_uco_mapping', 'stix_stream')
+
+_MAGIC = b'UCOSNAP\0'
+_HEADER = struct.Struct('<8sH64s')  # magic, format version, hex sha-256 key
+
+
+def _hash_file(path: str, hasher) -> None:
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(chunk)
+
+
+def file_digest(path: str) -> str:
+    """Hex SHA-256 of a file's contents"""
+    hasher = hashlib.sha256()
+    _hash_file(path, hasher)
+    return hasher.hexdigest()
+
+
+def source_digest(module_names: Sequence[str]) -> str:
+    """Hex SHA-256 over the source files of the named modules, so cache keys follow code changes"""
+    hasher = hashlib.sha256()
+    for module_name in module_names:
+        hasher.update(module_name.encode() + b'\0')
+        _hash_file(importlib.import_module(module_name).__file__, hasher)
+    return hasher.hexdigest()
+
+
+def snapshot_key(bundles: List[Tuple[str, str]], mapping: Any, variant: str = '') -> str:
+    """SHA-256 over the bundle contents, their dataset names, the UCO mapping tables,
+    the converter source code and the converter variant (node representation) the
+    snapshot was produced with"""
+    hasher = hashlib.sha256()
+    hasher.update(f'{SNAPSHOT_VERSION}:{variant}'.encode())
+
+    hasher.update(source_digest(CONVERTER_MODULES).encode())
+
+    tables = {
+        'base': mapping.MITRE_TO_UCO_BASE_MAPPING,
+        'properties': mapping.PROPERTY_MAPPINGS,
+        'relationships': mapping.RELATIONSHIP_MAPPINGS,
+    }
+    hasher.update(json.dumps(tables, sort_keys=True).encode())
+
+    for dataset_path, dataset_name in bundles:
+        hasher.update(dataset_name.encode() + b'\0')
+        _hash_file(dataset_path, hasher)
+
+    return hasher.hexdigest()
+
+
+def snapshot_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, f'uco-{key[:32]}.snap')
+
+
+def save_snapshot(path: str, key: str, payload: Dict[str, Any]) -> None:
+    """Write payload atomically under a header carrying the format version and content key"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, SNAPSHOT_VERSION, key.encode('ascii')))
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str, key: str) -> Optional[Dict[str, Any]]:
+    """Return the snapshot payload, or None if it is missing, stale or unreadable"""
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            if len(view) < _HEADER.size:
+                return None
+            magic, version, stored_key = _HEADER.unpack_from(view, 0)
+            if magic != _MAGIC or version != SNAPSHOT_VERSION or stored_key.decode('ascii') != key:
+                return None
+            with memoryview(view)[_HEADER.size:] as body:
+                return pickle.loads(body)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        return None
+    except (AttributeError, ImportError, TypeError):
+        # Pickled classes were renamed, moved or reshaped since the snapshot was written
+        return None
@@ -0,0 +1,266 @@
+"""
+Streaming STIX Bundle Reader
+Decodes the objects of a MITRE ATT&CK STIX bundle one at a time without
+loading the whole document into memory
+"""
+
+import json
+import os
+import re
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib decoder is always available
+    orjson = None
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB of text per read
+
+_WHITESPACE = ' \t\n\r'
+
+# Matches a complete JSON string or a single structural bracket
+_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]', re.S)
+
+
+class IncompleteValue(Exception):
+    """Raised by a decoder backend when the buffer ends inside a JSON value"""
+
+
+class StdlibJSONBackend:
+    """Decoder backend built on the C scanner of the standard json module"""
+
+    name = 'json'
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+
+    def raw_decode(self, buffer: str, pos: int) -> Tuple[Any, int]:
+        try:
+            return self._decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            raise IncompleteValue(str(e)) from e
+
+
+class OrjsonBackend:
+    """Decoder backend that locates value boundaries with a regex scanner and decodes with orjson"""
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self._fallback = StdlibJSONBackend()
+
+    def raw_decode(self, buffer: str, pos: int) -> Tuple[Any, int]:
+        if buffer[pos] not in '{[':
+            # Scalars never appear inside the objects array, defer to stdlib
+            return self._fallback.raw_decode(buffer, pos)
+
+        depth = 0
+        for match in _TOKEN_RE.finditer(buffer, pos):
+            ch = buffer[match.start()]
+            if ch in '{[':
+                depth += 1
+            elif ch in '}]':
+                depth -= 1
+                if depth == 0:
+                    end = match.end()
+                    try:
+                        return orjson.loads(buffer[pos:end]), end
+                    except orjson.JSONDecodeError as e:
+                        raise IncompleteValue(str(e)) from e
+        raise IncompleteValue("buffer ends inside value")
+
+
+DECODER_BACKENDS: Dict[str, Callable[[], Any]] = {
+    'json': StdlibJSONBackend,
+    'orjson': OrjsonBackend,
+}
+
+
+def get_decoder_backend(name: str = 'auto'):
+    """Return a decoder backend instance by name
+
+    'auto' resolves to the stdlib backend: its C scanner finds value boundaries
+    itself, which measured faster on ATT&CK bundles than scanning boundaries in
+    Python for orjson. Select 'orjson' explicitly for bundles with very large
+    objects, where decode cost dominates.
+    """
+    if name == 'auto':
+        name = 'json'
+    if name not in DECODER_BACKENDS:
+        raise ValueError(f"Unknown JSON decoder backend: {name}")
+    return DECODER_BACKENDS[name]()
+
+
+class _BufferedText:
+    """Sliding text window over a file that is refilled on demand"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        # UTF-8 byte offset of buffer[mark_pos], advanced monotonically by byte_offset()
+        self.mark_pos = 0
+        self.mark_bytes = 0
+
+    def fill(self) -> bool:
+        """Append the next chunk, discarding consumed text; returns False at EOF"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.byte_offset(self.pos)
+        self.mark_pos -= self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def byte_offset(self, pos: int) -> int:
+        """Return the file byte offset of buffer position pos (pos must not move backwards)"""
+        if pos != self.mark_pos:
+            self.mark_bytes += len(self.buffer[self.mark_pos:pos].encode('utf-8'))
+            self.mark_pos = pos
+        return self.mark_bytes
+
+    def skip_whitespace(self) -> None:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return
+
+    def peek(self) -> str:
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError("Unexpected end of STIX bundle")
+        return self.buffer[self.pos]
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"Expected '{ch}' at offset {self.pos} of STIX bundle buffer")
+        self.pos += 1
+
+    def decode(self, backend) -> Any:
+        self.skip_whitespace()
+        while True:
+            try:
+                value, self.pos = backend.raw_decode(self.buffer, self.pos)
+                return value
+            except IncompleteValue:
+                if not self.fill():
+                    raise ValueError("Malformed or truncated STIX bundle")
+
+
+def iter_bundle_objects(dataset_path: str, decoder: str = 'auto',
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield each entry of a STIX bundle's ``objects`` array in file order.
+
+    Only the current object and one read chunk are held in memory, so peak
+    usage no longer scales with bundle size. Other top-level bundle keys are
+    decoded and discarded.
+    """
+    for obj, _, _ in _iter_objects(dataset_path, decoder, chunk_size, track_offsets=False):
+        yield obj
+
+
+def iter_bundle_objects_with_spans(dataset_path: str, decoder: str = 'auto',
+                                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[Dict[str, Any], int, int]]:
+    """Like iter_bundle_objects, but also yield each object's [start, end) byte span in the file"""
+    return _iter_objects(dataset_path, decoder, chunk_size, track_offsets=True)
+
+
+def _iter_objects(dataset_path: str, decoder: str, chunk_size: int,
+                  track_offsets: bool) -> Iterator[Tuple[Dict[str, Any], int, int]]:
+    backend = get_decoder_backend(decoder)
+
+    # newline='' keeps character positions aligned with the bytes on disk
+    with open(dataset_path, encoding='utf-8', newline='') as f:
+        reader = _BufferedText(f, chunk_size)
+        reader.expect('{')
+
+        if reader.peek() == '}':
+            return
+
+        while True:
+            key = reader.decode(backend)
+            reader.expect(':')
+
+            if key == 'objects':
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.pos += 1
+                else:
+                    while True:
+                        if track_offsets:
+                            reader.skip_whitespace()
+                            start = reader.byte_offset(reader.pos)
+                            obj = reader.decode(backend)
+                            yield obj, start, reader.byte_offset(reader.pos)
+                        else:
+                            yield reader.decode(backend), -1, -1
+                        if reader.peek() == ',':
+                            reader.pos += 1
+                            continue
+                        reader.expect(']')
+                        break
+            else:
+                reader.decode(backend)
+
+            if reader.peek() == ',':
+                reader.pos += 1
+                continue
+            reader.expect('}')
+            return
+
+
+class BundleSource:
+    """
+    Read-only memory map of a STIX bundle for decoding single objects by byte span.
+
+    Instances are shared per path within a process for as long as the file
+    is unchanged. A file replaced or rewritten at the same path gets a new
+    source, while objects holding the old one keep reading the old mapping.
+    Sources pickle as their path and file identity, so objects that
+    reference them can cross process boundaries; unpickling fails if the
+    file changed in between.
+    """
+
+    _open_sources: Dict[str, 'BundleSource'] = {}
+
+    def __init__(self, dataset_path: str):
+        import mmap
+        self.path = dataset_path
+        with open(dataset_path, 'rb') as f:
+            self.identity = _file_identity(os.fstat(f.fileno()))
+            self._view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def open(cls, dataset_path: str) -> 'BundleSource':
+        source = cls._open_sources.get(dataset_path)
+        if source is None or source.identity != _file_identity(os.stat(dataset_path)):
+            source = cls._open_sources[dataset_path] = cls(dataset_path)
+        return source
+
+    @classmethod
+    def _reopen(cls, dataset_path: str, identity: Tuple[int, int, int]) -> 'BundleSource':
+        source = cls.open(dataset_path)
+        if source.identity != tuple(identity):
+            raise ValueError(f"STIX bundle {dataset_path} changed since its objects were located")
+        return source
+
+    def read_object(self, start: int, end: int) -> Dict[str, Any]:
+        return json.loads(self._view[start:end])
+
+    def __reduce__(self):
+        return (BundleSource._reopen, (self.path, self.identity))
+
+
+def _file_identity(st: os.stat_result) -> Tuple[int, int, int]:
+    """(inode, mtime ns, size): changes when a file is replaced or rewritten in place"""
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
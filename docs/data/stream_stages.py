@@ -0,0 +1,133 @@
+"""
+Streaming Pipeline Stages
+Building blocks for overlapped ingestion: a bounded feed from a blocking
+iterator in a worker thread, a gate that releases relationships once their
+endpoint nodes are committed, and fail-fast task gathering
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+# Marks the end of a ThreadFeed
+FEED_DONE = object()
+
+
+async def gather_or_cancel(awaitables: Iterable[Awaitable[Any]]) -> List[Any]:
+    """asyncio.gather that cancels the remaining tasks as soon as one fails"""
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class ThreadFeed:
+    """
+    Runs a blocking iterable (file parsing) in a worker thread and hands its
+    items to the event loop. At most ``maxsize`` items are outstanding: the
+    thread blocks until consumers take one, so a slow consumer bounds how
+    far parsing runs ahead. Consumers call ``get`` until it returns
+    FEED_DONE; a ThreadFeed is consumed once.
+    """
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._slots = threading.Semaphore(maxsize)
+        self._stop = threading.Event()
+        self.items = 0
+
+    async def run(self, make_iterable: Callable[[], Iterable[Any]]) -> None:
+        loop = asyncio.get_running_loop()
+
+        def pump() -> None:
+            try:
+                for item in make_iterable():
+                    while not self._slots.acquire(timeout=0.1):
+                        if self._stop.is_set():
+                            return
+                    self.items += 1
+                    loop.call_soon_threadsafe(self._queue.put_nowait, item)
+            finally:
+                if not self._stop.is_set():
+                    loop.call_soon_threadsafe(self._queue.put_nowait, FEED_DONE)
+
+        try:
+            await asyncio.to_thread(pump)
+        except BaseException:
+            # Lets the thread exit instead of waiting for a consumer that is gone
+            self._stop.set()
+            raise
+
+    async def get(self) -> Any:
+        item = await self._queue.get()
+        if item is FEED_DONE:
+            # Leave the marker for the next consumer
+            self._queue.put_nowait(FEED_DONE)
+        else:
+            self._slots.release()
+        return item
+
+
+class RelationshipGate:
+    """
+    Holds relationships until both endpoints are committed, then releases
+    them in batches of ``batch_size``.
+
+    ``committed`` seeds ids already in the graph (nodes of datasets ingested
+    earlier). A waiting relationship is keyed by its first uncommitted
+    endpoint, as in MitreUCOConverter.process_dataset; whatever still waits
+    once all nodes are committed has a dangling endpoint.
+    """
+
+    def __init__(self, batch_size: int, committed: Optional[Iterable[str]] = None):
+        self.batch_size = batch_size
+        self.committed: Set[str] = set(committed or ())
+        self.waiting: Dict[str, List[Any]] = {}
+        self._ready: List[Any] = []
+
+    def _missing_endpoint(self, rel: Any) -> Optional[str]:
+        for ref in (rel.source_ref, rel.target_ref):
+            if ref not in self.committed:
+                return ref
+        return None
+
+    def _place(self, rel: Any) -> None:
+        missing = self._missing_endpoint(rel)
+        if missing is None:
+            self._ready.append(rel)
+        else:
+            self.waiting.setdefault(missing, []).append(rel)
+
+    def _full_batches(self) -> List[List[Any]]:
+        batches = []
+        while len(self._ready) >= self.batch_size:
+            batches.append(self._ready[:self.batch_size])
+            del self._ready[:self.batch_size]
+        return batches
+
+    def offer(self, relationships: Iterable[Any]) -> List[List[Any]]:
+        """Add converted relationships; returns the batches that became full"""
+        for rel in relationships:
+            self._place(rel)
+        return self._full_batches()
+
+    def commit(self, node_ids: Iterable[str]) -> List[List[Any]]:
+        """Record committed nodes; returns the batches that became full"""
+        for node_id in node_ids:
+            self.committed.add(node_id)
+            for rel in self.waiting.pop(node_id, ()):
+                self._place(rel)
+        return self._full_batches()
+
+    def flush(self) -> List[List[Any]]:
+        """Remaining released relationships, as a final partial batch"""
+        batches = [self._ready] if self._ready else []
+        self._ready = []
+        return batches
+
+    def dangling(self) -> List[Any]:
+        return [rel for waiting in self.waiting.values() for rel in waiting]
@@ -0,0 +1,92 @@
+"""
+Substring Index
+Aho-Corasick automaton for finding which short strings (technique names)
+occur inside other strings in time linear in the text scanned
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher over a fixed set of patterns"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        self.patterns: List[str] = []
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str) -> None:
+        pattern_id = len(self.patterns)
+        self.patterns.append(pattern)
+
+        state = 0
+        for ch in pattern:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append(pattern_id)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                link = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = link if link != next_state else 0
+                # Inherit matches that end at the failure state
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find_all(self, text: str) -> Set[int]:
+        """Return ids of all patterns occurring anywhere in text"""
+        found = set()
+        state = 0
+        goto, fail, output = self.goto, self.fail, self.output
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+def find_substring_pairs(left: Sequence[str], right: Sequence[str]) -> List[Tuple[int, int]]:
+    """
+    Return (i, j) index pairs where left[i] is a substring of right[j] or vice versa.
+
+    Empty strings never match. Pairs come back in row-major order, the same
+    order a nested ``for i ... for j ...`` loop would produce them.
+    """
+    pairs: Set[Tuple[int, int]] = set()
+
+    for patterns, texts, flip in ((left, right, False), (right, left, True)):
+        # Collapse duplicate pattern strings so each is inserted once
+        positions: Dict[str, List[int]] = {}
+        for i, pattern in enumerate(patterns):
+            if pattern:
+                positions.setdefault(pattern, []).append(i)
+
+        automaton = AhoCorasick(positions)
+        for j, text in enumerate(texts):
+            if not text:
+                continue
+            for pattern_id in automaton.find_all(text):
+                for i in positions[automaton.patterns[pattern_id]]:
+                    pairs.add((j, i) if flip else (i, j))
+
+    return sorted(pairs)
@@ -0,0 +1,166 @@
+"""
+Synthetic ATT&CK Bundle Generator
+Produces deterministic STIX bundles shaped like the MITRE ATT&CK Enterprise and
+ICS releases at arbitrary scale, for benchmarking the converter and analyzer
+"""
+
+import json
+import random
+import uuid
+from typing import Any, Dict, List
+
+WORDS = [
+    'access', 'account', 'alarm', 'application', 'automated', 'block', 'brute', 'collection',
+    'command', 'control', 'credential', 'data', 'default', 'denial', 'device', 'discovery',
+    'execution', 'exfiltration', 'exploit', 'firmware', 'force', 'hardware', 'injection',
+    'interface', 'lateral', 'loss', 'manipulation', 'modify', 'monitor', 'network', 'parameter',
+    'point', 'process', 'program', 'protocol', 'remote', 'replication', 'rogue', 'safety',
+    'scripting', 'service', 'spearphishing', 'system', 'transfer', 'unauthorized', 'view',
+    'adversaries', 'may', 'use', 'to', 'the', 'of', 'and', 'in', 'a', 'or', 'for', 'with',
+]
+
+PLATFORMS = {
+    'enterprise': ['Windows', 'Linux', 'macOS', 'Network', 'Containers', 'IaaS', 'SaaS', 'Office Suite'],
+    'ics': ['Windows', 'Control Server', 'Engineering Workstation', 'Field Controller/RTU/PLC/IED',
+            'Human-Machine Interface', 'Safety Instrumented System/Protection Relay', 'Data Historian'],
+}
+
+TACTICS = ['initial-access', 'execution', 'persistence', 'discovery', 'lateral-movement',
+           'collection', 'command-and-control', 'inhibit-response-function', 'impact']
+
+# Object counts per 1x scale, roughly a fifth of the real releases
+BASE_COUNTS = {
+    'enterprise': {'attack-pattern': 120, 'intrusion-set': 30, 'malware': 100, 'tool': 20,
+                   'course-of-action': 40, 'campaign': 6, 'x-mitre-tactic': 9, 'relationships': 3000},
+    'ics': {'attack-pattern': 40, 'intrusion-set': 8, 'malware': 12, 'tool': 2,
+            'course-of-action': 20, 'campaign': 3, 'x-mitre-tactic': 9, 'relationships': 600},
+}
+
+CREATED_BY = 'identity--c78cb6e5-0c4b-4611-8297-d1b8b55e40b5'
+MARKING = 'marking-definition--fa42a846-8d90-4e51-bc29-71d5b4802168'
+
+
+def _stix_id(rng: random.Random, stix_type: str) -> str:
+    return f'{stix_type}--{uuid.UUID(int=rng.getrandbits(128), version=4)}'
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _timestamp(rng: random.Random) -> str:
+    return f'20{rng.randint(17, 25):02d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00.000Z'
+
+
+def _base_object(rng: random.Random, stix_type: str, domain: str) -> Dict[str, Any]:
+    return {
+        'type': stix_type,
+        'id': _stix_id(rng, stix_type),
+        'created': _timestamp(rng),
+        'modified': _timestamp(rng),
+        'created_by_ref': CREATED_BY,
+        'object_marking_refs': [MARKING],
+        'spec_version': '2.1',
+        'x_mitre_attack_spec_version': '3.2.0',
+        'x_mitre_version': f'1.{rng.randint(0, 3)}',
+        'x_mitre_domains': [f'{domain}-attack'],
+        'x_mitre_modified_by_ref': CREATED_BY,
+    }
+
+
+def _external_references(rng: random.Random, mitre_id: str, kind: str) -> List[Dict[str, Any]]:
+    refs = [{'source_name': 'mitre-attack', 'external_id': mitre_id,
+             'url': f'https://attack.mitre.org/{kind}/{mitre_id}'}]
+    for _ in range(rng.randint(0, 3)):
+        refs.append({'source_name': f'Vendor {rng.randint(1, 40)}',
+                     'description': _sentence(rng, 8),
+                     'url': f'https://example.com/report/{rng.randint(1, 500)}'})
+    return refs
+
+
+def generate_bundle(domain: str = 'enterprise', scale: int = 1, seed: int = 0) -> Dict[str, Any]:
+    """Return an ATT&CK-shaped STIX bundle for 'enterprise' or 'ics' at the given scale"""
+    rng = random.Random(f'{domain}:{scale}:{seed}')
+    counts = {key: value * scale for key, value in BASE_COUNTS[domain].items()}
+    counts['x-mitre-tactic'] = BASE_COUNTS[domain]['x-mitre-tactic']
+    id_prefix = 'T0' if domain == 'ics' else 'T'
+    objects: List[Dict[str, Any]] = []
+    by_type: Dict[str, List[str]] = {}
+
+    def add(obj: Dict[str, Any]) -> None:
+        objects.append(obj)
+        by_type.setdefault(obj['type'], []).append(obj['id'])
+
+    for i, shortname in enumerate(TACTICS[:counts['x-mitre-tactic']]):
+        obj = _base_object(rng, 'x-mitre-tactic', domain)
+        obj.update(name=shortname.replace('-', ' ').title(), description=_sentence(rng, 30),
+                   x_mitre_shortname=shortname,
+                   external_references=_external_references(rng, f'TA{i:04d}', 'tactics'))
+        add(obj)
+
+    for i in range(counts['attack-pattern']):
+        obj = _base_object(rng, 'attack-pattern', domain)
+        obj.update(
+            name=' '.join(rng.choice(WORDS[:46]).title() for _ in range(rng.randint(1, 4))),
+            description=' '.join(_sentence(rng, rng.randint(10, 25)) for _ in range(rng.randint(2, 6))),
+            kill_chain_phases=[{'kill_chain_name': f'mitre-{domain}-attack', 'phase_name': rng.choice(TACTICS)}],
+            x_mitre_platforms=rng.sample(PLATFORMS[domain], rng.randint(1, 3)),
+            x_mitre_detection=_sentence(rng, 20),
+            x_mitre_is_subtechnique=rng.random() < 0.4,
+            external_references=_external_references(rng, f'{id_prefix}{i:04d}', 'techniques'),
+        )
+        add(obj)
+
+    for i in range(counts['intrusion-set']):
+        obj = _base_object(rng, 'intrusion-set', domain)
+        name = f'Group {rng.randint(1, counts["intrusion-set"] * 2)}'
+        obj.update(name=name, description=_sentence(rng, 40),
+                   aliases=[name] + [f'Alias {rng.randint(1, 500)}' for _ in range(rng.randint(0, 4))],
+                   external_references=_external_references(rng, f'G{i:04d}', 'groups'))
+        add(obj)
+
+    for stix_type, prefix in (('malware', 'S'), ('tool', 'S')):
+        for i in range(counts[stix_type]):
+            obj = _base_object(rng, stix_type, domain)
+            obj.update(name=f'{stix_type.title()} {rng.randint(1, counts[stix_type] * 3)}',
+                       description=_sentence(rng, 30), is_family=True,
+                       x_mitre_platforms=rng.sample(PLATFORMS[domain], rng.randint(1, 2)),
+                       x_mitre_aliases=[], external_references=_external_references(rng, f'{prefix}{i:04d}', 'software'))
+            add(obj)
+
+    for i in range(counts['course-of-action']):
+        obj = _base_object(rng, 'course-of-action', domain)
+        obj.update(name=' '.join(rng.choice(WORDS[:46]).title() for _ in range(2)),
+                   description=_sentence(rng, 30),
+                   external_references=_external_references(rng, f'M{i:04d}', 'mitigations'))
+        add(obj)
+
+    for i in range(counts['campaign']):
+        obj = _base_object(rng, 'campaign', domain)
+        obj.update(name=f'Campaign {i}', description=_sentence(rng, 30), aliases=[f'Campaign {i}'],
+                   first_seen=_timestamp(rng), last_seen=_timestamp(rng),
+                   external_references=_external_references(rng, f'C{i:04d}', 'campaigns'))
+        add(obj)
+
+    techniques = by_type['attack-pattern']
+    users = by_type['intrusion-set'] + by_type['malware'] + by_type['tool'] + by_type['campaign']
+    for _ in range(counts['relationships']):
+        roll = rng.random()
+        if roll < 0.75:
+            rel_type, source, target = 'uses', rng.choice(users), rng.choice(techniques)
+        elif roll < 0.95:
+            rel_type, source, target = 'mitigates', rng.choice(by_type['course-of-action']), rng.choice(techniques)
+        else:
+            rel_type, source, target = 'subtechnique-of', rng.choice(techniques), rng.choice(techniques)
+        obj = _base_object(rng, 'relationship', domain)
+        obj.update(relationship_type=rel_type, source_ref=source, target_ref=target,
+                   description=_sentence(rng, 15))
+        objects.append(obj)
+
+    return {'type': 'bundle', 'id': _stix_id(rng, 'bundle'), 'objects': objects}
+
+
+def write_bundle(path: str, domain: str = 'enterprise', scale: int = 1, seed: int = 0) -> str:
+    with open(path, 'w') as f:
+        json.dump(generate_bundle(domain, scale, seed), f, indent=4)
+    return path
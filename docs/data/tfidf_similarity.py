@@ -0,0 +1,216 @@
+"""
+TF-IDF Cosine Similarity Engine
+Sparse TF-IDF vectors and all-pairs cosine similarity via a sparse
+matrix product (numpy, with a pure-Python fallback), with bounded top-k
+selection per row
+"""
+
+import heapq
+import math
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the pure-Python product is always available
+    np = None
+
+SparseRow = Dict[int, float]
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def word_tokens(text: str) -> List[str]:
+    """Lowercased word unigrams and bigrams"""
+    words = _WORD_RE.findall(text.lower())
+    return words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+
+
+def char_ngrams(text: str, n: int = 3) -> List[str]:
+    """Lowercased character n-grams, padded so short names still produce grams"""
+    padded = f' {text.lower()} '
+    return [padded[i:i + n] for i in range(max(1, len(padded) - n + 1))]
+
+
+class TfidfVectorizer:
+    """Fits smoothed IDF weights over a corpus and maps documents to L2-normalized sparse rows"""
+
+    def __init__(self, tokenizer: Callable[[str], List[str]] = word_tokens):
+        self.tokenizer = tokenizer
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: List[float] = []
+
+    def fit(self, documents: Sequence[str]) -> 'TfidfVectorizer':
+        doc_freq: Dict[str, int] = {}
+        for doc in documents:
+            for term in set(self.tokenizer(doc)):
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+
+        n_docs = len(documents)
+        self.vocabulary = {term: i for i, term in enumerate(sorted(doc_freq))}
+        self.idf = [0.0] * len(self.vocabulary)
+        for term, i in self.vocabulary.items():
+            self.idf[i] = math.log((1 + n_docs) / (1 + doc_freq[term])) + 1
+        return self
+
+    def transform(self, documents: Sequence[str]) -> List[SparseRow]:
+        rows = []
+        for doc in documents:
+            counts: Dict[int, int] = {}
+            for term in self.tokenizer(doc):
+                i = self.vocabulary.get(term)
+                if i is not None:
+                    counts[i] = counts.get(i, 0) + 1
+            row = {i: tf * self.idf[i] for i, tf in counts.items()}
+            norm = math.sqrt(sum(w * w for w in row.values()))
+            rows.append({i: w / norm for i, w in row.items()} if norm else {})
+        return rows
+
+
+def _postings(rows: Sequence[SparseRow]) -> Dict[int, List[Tuple[int, float]]]:
+    """Column-major (term -> [(row, weight)]) view of a sparse matrix, i.e. its transpose"""
+    columns: Dict[int, List[Tuple[int, float]]] = {}
+    for j, row in enumerate(rows):
+        for term, weight in row.items():
+            columns.setdefault(term, []).append((j, weight))
+    return columns
+
+
+# Upper bound on the entries of one dense block of left x right^T scores
+_BLOCK_ENTRIES = 1 << 20
+
+TopKRows = List[List[Tuple[float, int, List[float]]]]
+
+
+def weighted_cosine_topk(fields: Sequence[Tuple[float, Sequence[SparseRow], Sequence[SparseRow]]],
+                         top_k: int, threshold: float,
+                         exclude: Optional[Callable[[int, int], bool]] = None,
+                         backend: str = 'auto') -> TopKRows:
+    """
+    Weighted sum of per-field cosine similarities between every left and right row.
+
+    ``fields`` is a list of ``(weight, left_rows, right_rows)``. For each
+    left row, returns up to ``top_k`` ``(score, right_index,
+    per_field_cosines)`` tuples with score above ``threshold``, best first.
+    Only pairs sharing at least one term are scored. Pairs for which
+    ``exclude(i, j)`` is true are dropped before selection.
+
+    ``backend`` is 'numpy', 'python' or 'auto' (numpy when installed). Both
+    compute the same sparse product left x right^T and return the same
+    matches, up to floating-point summation order.
+    """
+    if backend == 'auto':
+        backend = 'python' if np is None else 'numpy'
+    if backend == 'numpy':
+        if np is None:
+            raise ImportError("The numpy backend requires the numpy package")
+        return _weighted_cosine_topk_numpy(fields, top_k, threshold, exclude)
+    if backend == 'python':
+        return _weighted_cosine_topk_python(fields, top_k, threshold, exclude)
+    raise ValueError(f"Unknown cosine backend: {backend}")
+
+
+def _weighted_cosine_topk_python(fields, top_k: int, threshold: float,
+                                 exclude: Optional[Callable[[int, int], bool]]) -> TopKRows:
+    """Row-by-row product, accumulating over the right side's term postings"""
+    postings = [_postings(right_rows) for _, _, right_rows in fields]
+    n_left = len(fields[0][1])
+    results = []
+
+    for i in range(n_left):
+        per_field: List[Dict[int, float]] = []
+        for (_, left_rows, _), columns in zip(fields, postings):
+            dots: Dict[int, float] = {}
+            for term, weight in left_rows[i].items():
+                for j, other in columns.get(term, ()):
+                    dots[j] = dots.get(j, 0.0) + weight * other
+            per_field.append(dots)
+
+        combined: Dict[int, float] = {}
+        for (field_weight, _, _), dots in zip(fields, per_field):
+            for j, dot in dots.items():
+                combined[j] = combined.get(j, 0.0) + field_weight * dot
+
+        candidates = ((score, j) for j, score in combined.items()
+                      if score > threshold and not (exclude and exclude(i, j)))
+        best = heapq.nlargest(top_k, candidates, key=lambda item: (item[0], -item[1]))
+        results.append([(score, j, [dots.get(j, 0.0) for dots in per_field]) for score, j in best])
+
+    return results
+
+
+class _CSRRows:
+    """Sparse rows as numpy CSR arrays: row r's terms and weights are [ptr[r], ptr[r + 1])"""
+
+    def __init__(self, rows: Sequence[SparseRow]):
+        self.ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=self.ptr[1:])
+        self.terms = np.fromiter((term for row in rows for term in row), dtype=np.int64, count=self.ptr[-1])
+        self.weights = np.fromiter((w for row in rows for w in row.values()), dtype=np.float64, count=self.ptr[-1])
+
+
+class _Postings:
+    """Right rows transposed (CSC): entries sorted by term, with their row index and weight"""
+
+    def __init__(self, rows: Sequence[SparseRow]):
+        csr = _CSRRows(rows)
+        row_of = np.repeat(np.arange(len(rows), dtype=np.int64), np.diff(csr.ptr))
+        order = np.argsort(csr.terms, kind='stable')
+        self.terms = csr.terms[order]
+        self.rows = row_of[order]
+        self.weights = csr.weights[order]
+
+
+def _sparse_product_block(left: _CSRRows, right: _Postings, start: int, stop: int, n_right: int):
+    """Dense (stop - start) x n_right block of left x right^T and a mask of the pairs sharing a term"""
+    lo, hi = left.ptr[start], left.ptr[stop]
+    terms = left.terms[lo:hi]
+    rows = np.repeat(np.arange(stop - start, dtype=np.int64), np.diff(left.ptr[start:stop + 1]))
+    first = np.searchsorted(right.terms, terms, side='left')
+    counts = np.searchsorted(right.terms, terms, side='right') - first
+
+    # Expand every left entry into the postings of its term
+    total = int(counts.sum())
+    offsets = np.repeat(first - (np.cumsum(counts) - counts), counts) + np.arange(total, dtype=np.int64)
+    cells = np.repeat(rows, counts) * n_right + right.rows[offsets]
+    products = np.repeat(left.weights[lo:hi], counts) * right.weights[offsets]
+
+    size = (stop - start) * n_right
+    dots = np.bincount(cells, weights=products, minlength=size).reshape(stop - start, n_right)
+    touched = np.bincount(cells, minlength=size).reshape(stop - start, n_right) > 0
+    return dots, touched
+
+
+def _weighted_cosine_topk_numpy(fields, top_k: int, threshold: float,
+                                exclude: Optional[Callable[[int, int], bool]]) -> TopKRows:
+    """Sparse product in blocks of left rows: each left entry is joined with the right
+    postings of its term and the products are summed into a dense score block"""
+    lefts = [_CSRRows(left_rows) for _, left_rows, _ in fields]
+    rights = [_Postings(right_rows) for _, _, right_rows in fields]
+    n_left, n_right = len(fields[0][1]), len(fields[0][2])
+    block_rows = max(1, _BLOCK_ENTRIES // max(1, n_right))
+    results: TopKRows = []
+
+    for start in range(0, n_left, block_rows):
+        stop = min(n_left, start + block_rows)
+        per_field = []
+        combined = np.zeros((stop - start, n_right))
+        touched = np.zeros((stop - start, n_right), dtype=bool)
+        for (field_weight, _, _), left, right in zip(fields, lefts, rights):
+            dots, field_touched = _sparse_product_block(left, right, start, stop, n_right)
+            per_field.append(dots)
+            combined += field_weight * dots
+            touched |= field_touched
+
+        for r in range(stop - start):
+            i = start + r
+            scores = combined[r]
+            js = np.flatnonzero(touched[r] & (scores > threshold))
+            if exclude is not None:
+                js = js[[not exclude(i, int(j)) for j in js]] if len(js) else js
+            # Best score first, lower right index breaks ties
+            best = js[np.lexsort((js, -scores[js]))[:top_k]]
+            results.append([(float(scores[j]), int(j), [float(dots[r, j]) for dots in per_field])
+                            for j in best])
+
+    return results
@@ -6,19 +6,27 @@ Implements Graph-First architecture with event-driven synchronization
 import json
 import asyncio
 import logging
+import os
+import threading
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from pathlib import Path
 
 # Third-party imports (would be installed)
 # from neo4j import AsyncGraphDatabase
-# from redis.asyncio import Redis
 # import aiohttp
-# from qdrant_client import QdrantClient
 # from elasticsearch import AsyncElasticsearch
 
+from embedding_similarity import HashedNgramEmbedder
+from event_bus import EventPublisher, RedisStreamsEventBus
+from ingestion_checkpoint import IngestionCheckpoint, phase_fingerprint, run_key
 from mitre_uco_mapping import MitreUCOConverter, UCONode, UCORelationship
+from neo4j_bulk_export import BulkImportExport, export_bulk_import
+from neo4j_writer import (SCHEMA_PATH, Neo4jBatchWriter, Neo4jSink, load_schema_statements, neo4j_label,
+                          node_label_map)
+from stream_stages import FEED_DONE, RelationshipGate, ThreadFeed, gather_or_cancel
+from vectorization_worker import VECTOR_COLLECTIONS, QdrantVectorStore, VectorizationWorker
 
 @dataclass
 class IngestionConfig:
@@ -26,6 +34,27 @@ class IngestionConfig:
     neo4j_uri: str = "neo4j://localhost:7687"
     neo4j_user: str = "neo4j"
     neo4j_password: str = "password"
+    neo4j_database: Optional[str] = None
+    neo4j_write_concurrency: int = 4
+    neo4j_max_batch_size: int = 5000
+    neo4j_target_commit_seconds: float = 0.5
+    bulk_import_dir: str = "neo4j_import"
+    event_batch_size: int = 500
+    event_max_in_flight: int = 4
+    event_stream_maxlen: Optional[int] = None
+    vectorization_batch_size: int = 64
+    vectorization_max_wait: float = 0.5
+    vectorization_concurrency: int = 2
+    vector_cache_dir: Optional[str] = "vector_cache"
+    checkpoint_dir: Optional[str] = "ingest_checkpoints"
+    checkpoint_batch_size: int = 1000
+    parse_chunk_size: int = 500
+    stage_queue_size: int = 4
+    # Conversion mutates the shared converter and holds the GIL, so converter
+    # workers run one chunk at a time; more than 1 only overlaps their queue waits
+    convert_concurrency: int = 1
+    node_write_concurrency: int = 2
+    relationship_write_concurrency: int = 2
     redis_url: str = "redis://localhost:6379"
     elasticsearch_url: str = "http://localhost:9200"
     qdrant_url: str = "http://localhost:6333"
@@ -37,22 +66,57 @@ class IngestionConfig:
     batch_size: int = 100
     max_retries: int = 3
 
+NODE_EVENT_STREAMS = ("mitre_node_updates", "vectorization_queue", "elasticsearch_queue")
+RELATIONSHIP_EVENT_STREAMS = ("mitre_relationship_updates",)
+
 class UnifiedIngestionPipeline:
     """
     Main ingestion pipeline that implements the Graph-First architecture
     from FINAL.md with event-driven synchronization
     """
     
-    def __init__(self, config: IngestionConfig):
+    def __init__(self, config: IngestionConfig, neo4j_sink: Optional[Any] = None,
+                 event_bus: Optional[Any] = None, vector_store: Optional[Any] = None,
+                 embedder: Optional[Any] = None):
         self.config = config
         self.converter = MitreUCOConverter()
         self.logger = logging.getLogger(__name__)
         
+        # Graph writes go through the batched MERGE writer; pass a FakeNeo4jSink
+        # to run the pipeline without a server
+        if neo4j_sink is None:
+            neo4j_sink = Neo4jSink(config.neo4j_uri, config.neo4j_user, config.neo4j_password,
+                                   database=config.neo4j_database)
+        self.neo4j_writer = Neo4jBatchWriter(
+            neo4j_sink,
+            batch_size=config.batch_size,
+            max_retries=config.max_retries,
+            concurrency=config.neo4j_write_concurrency,
+            max_batch_size=config.neo4j_max_batch_size,
+            target_commit_seconds=config.neo4j_target_commit_seconds
+        )
+        
+        # Change events are batched onto Redis Streams; pass an InMemoryEventBus
+        # to run without Redis
+        if event_bus is None:
+            event_bus = RedisStreamsEventBus(config.redis_url, maxlen=config.event_stream_maxlen)
+        self.event_bus = event_bus
+        self.events = EventPublisher(event_bus, batch_size=config.event_batch_size,
+                                     max_in_flight=config.event_max_in_flight)
+        
+        # Vectors go to Qdrant unless an InMemoryVectorStore is passed. The default
+        # embedder is the offline hashed n-gram model; any object with .name,
+        # .dimensions and .encode(texts) can replace it
+        self.vector_store = vector_store or QdrantVectorStore(config.qdrant_url)
+        self.embedder = embedder or HashedNgramEmbedder(dimensions=config.embedding_dimensions)
+        self.vectorization_worker = None
+        # Set once the schema is applied and its required constraints verified
+        self._schema_ready = False
+        # Serializes streaming conversion: the converter's tables are not thread-safe
+        self._convert_lock = threading.Lock()
+        
         # Initialize connections (would be async in real implementation)
-        # self.neo4j_driver = AsyncGraphDatabase.driver(config.neo4j_uri, auth=(config.neo4j_user, config.neo4j_password))
-        # self.redis_client = Redis.from_url(config.redis_url)
         # self.es_client = AsyncElasticsearch([config.elasticsearch_url])
-        # self.qdrant_client = QdrantClient(url=config.qdrant_url)
         
         self.stats = {
             'nodes_processed': 0,
@@ -65,7 +129,7 @@ class UnifiedIngestionPipeline:
         """Initialize the quad-partite data infrastructure"""
         
         self.logger.info("Initializing Neo4j schema...")
-        await self._execute_neo4j_schema()
+        await self._ensure_schema()
         
         self.logger.info("Setting up Qdrant collections...")
         await self._setup_qdrant_collections()
@@ -78,56 +142,33 @@ class UnifiedIngestionPipeline:
         
         self.logger.info("Infrastructure initialization complete")
     
+    async def _ensure_schema(self) -> None:
+        """Apply the schema and check its required constraints, once, before the first write"""
+        if self._schema_ready:
+            return
+        await self._execute_neo4j_schema()
+        await self.neo4j_writer.verify_schema()
+        self._schema_ready = True
+    
     async def _execute_neo4j_schema(self) -> None:
-        """Execute the Neo4j schema DDL"""
-        schema_path = Path("neo4j_schema_ddl.cypher")
-        if schema_path.exists():
-            with open(schema_path) as f:
-                schema_ddl = f.read()
-            
-            # In real implementation:
-            # async with self.neo4j_driver.session() as session:
-            #     await session.run(schema_ddl)
-            
-            self.logger.info("Neo4j schema applied successfully")
-        else:
-            self.logger.warning("Schema file not found, skipping schema setup")
+        """Apply the Neo4j schema DDL statement by statement through the writer's sink"""
+        if not os.path.exists(SCHEMA_PATH):
+            self.logger.warning(f"Schema file {SCHEMA_PATH} not found, skipping schema setup")
+            return
+        
+        statements = load_schema_statements(SCHEMA_PATH)
+        failures = await self.neo4j_writer.apply_schema(statements)
+        for statement, error in failures:
+            self.logger.warning(f"Schema statement failed: {statement.splitlines()[0]} ({error})")
+        self.logger.info(f"Neo4j schema applied: {len(statements) - len(failures)} "
+                         f"of {len(statements)} statements")
     
     async def _setup_qdrant_collections(self) -> None:
         """Setup Qdrant collections for vector storage"""
-        collections = {
-            "attack_patterns": {
-                "size": self.config.embedding_dimensions,
-                "distance": "Cosine"
-            },
-            "threat_actors": {
-                "size": self.config.embedding_dimensions,
-                "distance": "Cosine"
-            },
-            "malware": {
-                "size": self.config.embedding_dimensions,
-                "distance": "Cosine"
-            },
-            "tools": {
-                "size": self.config.embedding_dimensions,
-                "distance": "Cosine"
-            },
-            "campaigns": {
-                "size": self.config.embedding_dimensions,
-                "distance": "Cosine"
-            },
-            "ics_assets": {
-                "size": self.config.embedding_dimensions,
-                "distance": "Cosine"
-            }
-        }
+        collections = sorted(set(VECTOR_COLLECTIONS.values()))
         
-        # In real implementation:
-        # for collection_name, config in collections.items():
-        #     self.qdrant_client.recreate_collection(
-        #         collection_name=collection_name,
-        #         vectors_config=VectorParams(size=config["size"], distance=config["distance"])
-        #     )
+        for collection_name in collections:
+            await self.vector_store.ensure_collection(collection_name, self.embedder.dimensions, "Cosine")
         
         self.logger.info(f"Created {len(collections)} Qdrant collections")
     
@@ -182,21 +223,39 @@ class UnifiedIngestionPipeline:
             "elasticsearch_queue"
         ]
         
-        # In real implementation:
-        # for stream in streams:
-        #     try:
-        #         await self.redis_client.xgroup_create(stream, "processors", id="0", mkstream=True)
-        #     except Exception as e:
-        #         if "BUSYGROUP" not in str(e):
-        #             raise
+        for stream in streams:
+            await self.event_bus.ensure_group(stream, "processors")
         
         self.logger.info(f"Configured {len(streams)} Redis streams")
     
-    async def ingest_dataset(self, dataset_path: str, dataset_name: str) -> Dict[str, int]:
+    async def ingest_dataset(self, dataset_path: str, dataset_name: str,
+                             previous_release: Optional[Any] = None,
+                             resume: bool = False) -> Dict[str, int]:
         """
         Ingest a complete MITRE dataset following the Graph-First approach
+
+        When ``previous_release`` (a converter, manifest dict or saved manifest
+        path for the prior ATT&CK release) is given, only the changeset against
+        it is written: added and changed entities are upserted and removed ones
+        deleted, so monthly refreshes scale with churn rather than corpus size.
+
+        Every committed write batch is recorded in a checkpoint under
+        ``config.checkpoint_dir``. With ``resume=True`` batches recorded by an
+        earlier, interrupted run of the same bundle are skipped; the batch
+        that was in flight is written again, which MERGE makes harmless.
         """
         self.logger.info(f"Starting ingestion of {dataset_name} dataset from {dataset_path}")
+        await self._ensure_schema()
+        
+        checkpoint = None
+        if self.config.checkpoint_dir:
+            checkpoint = IngestionCheckpoint(
+                os.path.join(self.config.checkpoint_dir, f"{dataset_name}.json"),
+                run_key(dataset_path, dataset_name),
+                resume=resume
+            )
+            if checkpoint.resumed:
+                self.logger.info(f"Resuming {dataset_name} ingestion: {checkpoint.summary()['phases']}")
         
         # Phase 1: Store raw data in object store (MinIO)
         raw_data_uri = await self._store_raw_data(dataset_path, dataset_name)
@@ -204,30 +263,261 @@ class UnifiedIngestionPipeline:
         # Phase 2: Convert to UCO format
         self.converter.process_dataset(dataset_path, dataset_name)
         
+        if previous_release is not None:
+            changeset = self.converter.compute_changeset(previous_release, datasets=[dataset_name])
+            nodes_to_write = changeset.added_nodes + changeset.changed_nodes
+            relationships_to_write = changeset.added_relationships + changeset.changed_relationships
+            removed_ids = changeset.removed_nodes + changeset.removed_relationships
+            await self._run_checkpointed(
+                "deletes", removed_ids, checkpoint,
+                lambda _: self._delete_neo4j_entities(changeset.removed_nodes, changeset.removed_relationships,
+                                                      changeset.removed_relationship_endpoints),
+                batch_size=max(1, len(removed_ids))
+            )
+        else:
+            changeset = None
+            nodes_to_write = self.converter.converted_nodes.values()
+            relationships_to_write = self.converter.converted_relationships
+        
+        # Validate relationship endpoints before anything is written: MATCH on a
+        # missing endpoint silently creates nothing, so those are dropped here
+        dangling = self.converter.find_dangling_references(relationships_to_write)
+        if dangling.missing or dangling.revoked:
+            self.logger.warning(f"Dangling references in {dataset_name}: {dangling.summary()}")
+        if dangling.missing:
+            skipped = dangling.missing_relationship_ids
+            relationships_to_write = [rel for rel in relationships_to_write if rel.id not in skipped]
+        
         # Phase 3: Batch process nodes (Graph-First)
-        node_stats = await self._process_nodes_batch(self.converter.converted_nodes.values())
+        node_stats = await self._process_nodes_batch(nodes_to_write, checkpoint)
         
         # Phase 4: Process relationships
-        rel_stats = await self._process_relationships_batch(self.converter.converted_relationships)
+        rel_stats = await self._process_relationships_batch(relationships_to_write, checkpoint)
         
         # Phase 5: Generate cross-dataset connections if this is the second dataset
         cross_stats = {"cross_references": 0}
         if len(set(node.source_dataset for node in self.converter.converted_nodes.values())) > 1:
             cross_connections = self.converter.get_cross_dataset_connections()
-            cross_stats = await self._process_relationships_batch(cross_connections)
+            written = await self._process_relationships_batch(cross_connections, checkpoint, phase="cross_references")
+            cross_stats = {"cross_references": written["relationships"]}
+        
+        # Everything written is announced before the dataset counts as ingested
+        await self.events.flush()
+        if checkpoint:
+            checkpoint.mark_complete()
         
         # Update statistics
         self.stats['nodes_processed'] += node_stats['nodes']
         self.stats['relationships_processed'] += rel_stats['relationships'] 
         self.stats['cross_references_created'] += cross_stats.get('cross_references', 0)
         
-        return {
+        result = {
             'dataset': dataset_name,
             'nodes': node_stats['nodes'],
             'relationships': rel_stats['relationships'],
             'cross_references': cross_stats.get('cross_references', 0),
             'raw_data_uri': raw_data_uri
         }
+        result['dangling_references'] = dangling.summary()
+        if changeset is not None:
+            result['changeset'] = changeset.summary()
+        if checkpoint:
+            result['checkpoint'] = checkpoint.summary()
+        return result
+    
+    async def ingest_dataset_streaming(self, dataset_path: str, dataset_name: str) -> Dict[str, Any]:
+        """
+        Ingest a dataset with overlapped stages instead of strict phases:
+        
+            parse (thread) -> convert -> write nodes -> write relationships
+        
+        Stages are connected by queues holding at most ``stage_queue_size``
+        chunks of ``parse_chunk_size`` objects, so parsing never runs far
+        ahead of the database. Each relationship is released to the writers
+        as soon as both of its endpoint nodes are committed; relationships
+        whose endpoints never arrive are dropped, as in ingest_dataset. The
+        number of workers per stage comes from ``convert_concurrency``,
+        ``node_write_concurrency`` and ``relationship_write_concurrency``;
+        converter workers share the converter, so they convert one chunk at
+        a time and extra ones only hide queue waits, not CPU time.
+        
+        Meant for full loads: changesets and checkpoints are only supported
+        by ingest_dataset.
+        
+        Relationships are not kept on the converter: each is dropped once
+        written, so they are absent from ``converted_relationships`` and
+        from release manifests and adjacency built from it. What stays
+        resident for the whole run:
+        
+        - every converted node in ``converter.converted_nodes``, needed for
+          cross-dataset connections and for later datasets' endpoints (with
+          ``lazy=True`` only ids, names, types and byte spans)
+        - the node id -> label map and the gate's set of committed ids
+        - relationships waiting for an endpoint that has not been committed
+          yet, and those whose endpoint never arrives
+        
+        Everything else is bounded by the stage queues.
+        """
+        from stix_stream import BundleSource, iter_bundle_objects_with_spans
+        
+        self.logger.info(f"Starting streaming ingestion of {dataset_name} dataset from {dataset_path}")
+        await self._ensure_schema()
+        raw_data_uri = await self._store_raw_data(dataset_path, dataset_name)
+        
+        config = self.config
+        source = BundleSource.open(dataset_path) if self.converter.lazy else None
+        # Nodes of previously ingested datasets are already in the graph
+        gate = RelationshipGate(config.checkpoint_batch_size, committed=self.converter.converted_nodes)
+        labels = node_label_map(self.converter.converted_nodes.values())
+        feed = ThreadFeed(config.stage_queue_size)
+        node_queue: asyncio.Queue = asyncio.Queue(config.stage_queue_size)
+        rel_queue: asyncio.Queue = asyncio.Queue(config.stage_queue_size)
+        busy = {'convert': 0.0, 'write_nodes': 0.0, 'write_relationships': 0.0}
+        counts = {'nodes': 0, 'relationships': 0}
+        
+        def parse_chunks():
+            chunk = []
+            for item in iter_bundle_objects_with_spans(dataset_path):
+                chunk.append(item)
+                if len(chunk) >= config.parse_chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        
+        def convert_chunk(chunk) -> Tuple[List[UCONode], List[UCORelationship]]:
+            nodes, relationships = [], []
+            with self._convert_lock:
+                for obj, start, end in chunk:
+                    if obj['type'] == 'relationship':
+                        relationships.append(
+                            self.converter.convert_mitre_relationship(obj, dataset_name, retain=False))
+                    else:
+                        node = self.converter.convert_mitre_object(obj, dataset_name,
+                                                                   span=(source, start, end) if source else None)
+                        if node is not None:
+                            nodes.append(node)
+            return nodes, relationships
+        
+        async def release(batches: List[List[UCORelationship]]) -> None:
+            for batch in batches:
+                await rel_queue.put(batch)
+        
+        async def converter_worker() -> None:
+            while True:
+                chunk = await feed.get()
+                if chunk is FEED_DONE:
+                    return
+                started = time.perf_counter()
+                nodes, relationships = await asyncio.to_thread(convert_chunk, chunk)
+                busy['convert'] += time.perf_counter() - started
+                for node in nodes:
+                    labels[node.id] = neo4j_label(node.mitre_type)
+                if nodes:
+                    await node_queue.put(nodes)
+                await release(gate.offer(relationships))
+        
+        async def node_writer() -> None:
+            while True:
+                nodes = await node_queue.get()
+                if nodes is None:
+                    return
+                started = time.perf_counter()
+                await self._create_neo4j_nodes(nodes)
+                await self._publish_node_events(nodes)
+                busy['write_nodes'] += time.perf_counter() - started
+                counts['nodes'] += len(nodes)
+                await release(gate.commit(node.id for node in nodes))
+        
+        async def relationship_writer() -> None:
+            while True:
+                relationships = await rel_queue.get()
+                if relationships is None:
+                    return
+                started = time.perf_counter()
+                await self._create_neo4j_relationships(relationships, labels)
+                await self._publish_relationship_events(relationships)
+                busy['write_relationships'] += time.perf_counter() - started
+                counts['relationships'] += len(relationships)
+        
+        async def convert_stage() -> None:
+            await gather_or_cancel(converter_worker() for _ in range(config.convert_concurrency))
+            for _ in range(config.node_write_concurrency):
+                await node_queue.put(None)
+        
+        async def node_stage() -> None:
+            await gather_or_cancel(node_writer() for _ in range(config.node_write_concurrency))
+            # Every node is committed: what is still waiting has a dangling endpoint
+            await release(gate.flush())
+            for _ in range(config.relationship_write_concurrency):
+                await rel_queue.put(None)
+        
+        async def relationship_stage() -> None:
+            await gather_or_cancel(relationship_writer() for _ in range(config.relationship_write_concurrency))
+        
+        started = time.perf_counter()
+        await gather_or_cancel([feed.run(parse_chunks), convert_stage(), node_stage(), relationship_stage()])
+        wall_seconds = time.perf_counter() - started
+        
+        dangling = gate.dangling()
+        if dangling:
+            self.logger.warning(f"Dropped {len(dangling)} relationships with missing endpoints in {dataset_name}")
+        
+        cross_stats = {"cross_references": 0}
+        if len(set(node.source_dataset for node in self.converter.converted_nodes.values())) > 1:
+            cross_connections = self.converter.get_cross_dataset_connections()
+            written = await self._process_relationships_batch(cross_connections)
+            cross_stats = {"cross_references": written["relationships"]}
+        
+        await self.events.flush()
+        
+        self.stats['nodes_processed'] += counts['nodes']
+        self.stats['relationships_processed'] += counts['relationships']
+        self.stats['cross_references_created'] += cross_stats['cross_references']
+        
+        return {
+            'dataset': dataset_name,
+            'nodes': counts['nodes'],
+            'relationships': counts['relationships'],
+            'cross_references': cross_stats['cross_references'],
+            'raw_data_uri': raw_data_uri,
+            'dangling_relationships': len(dangling),
+            'stages': {
+                'parsed_chunks': feed.items,
+                'busy_seconds': {stage: round(seconds, 3) for stage, seconds in busy.items()},
+                'wall_seconds': round(wall_seconds, 3)
+            }
+        }
+    
+    def export_bulk_import(self, datasets: List[Tuple[str, str]],
+                           out_dir: Optional[str] = None) -> BulkImportExport:
+        """
+        Export mode for cold loads: convert (dataset_path, dataset_name) bundles and
+        write neo4j-admin import CSVs instead of running Cypher transactions.
+        
+        The files cover every converted node, relationship and cross-dataset
+        connection; relationships with missing endpoints are dropped, as in
+        ingest_dataset. Load them with the generated import.sh into a stopped,
+        empty database, then start it and run apply_schema.sh (or
+        initialize_infrastructure): the import creates no constraints or indexes.
+        """
+        out_dir = out_dir or self.config.bulk_import_dir
+        for dataset_path, dataset_name in datasets:
+            self.converter.process_dataset(dataset_path, dataset_name)
+        
+        relationships = list(self.converter.converted_relationships)
+        if len(set(node.source_dataset for node in self.converter.converted_nodes.values())) > 1:
+            relationships.extend(self.converter.get_cross_dataset_connections())
+        
+        dangling = self.converter.find_dangling_references(relationships)
+        if dangling.missing:
+            self.logger.warning(f"Dropping relationships with missing endpoints: {dangling.summary()}")
+            skipped = dangling.missing_relationship_ids
+            relationships = [rel for rel in relationships if rel.id not in skipped]
+        
+        export = export_bulk_import(list(self.converter.converted_nodes.values()), relationships, out_dir)
+        self.logger.info(f"Wrote neo4j-admin import files to {out_dir}: {export.summary()}")
+        return export
     
     async def _store_raw_data(self, dataset_path: str, dataset_name: str) -> str:
         """Store raw dataset in object store (MinIO)"""
@@ -250,91 +540,76 @@ class UnifiedIngestionPipeline:
         self.logger.info(f"Stored raw data at {uri}")
         return uri
     
-    async def _process_nodes_batch(self, nodes: List[UCONode]) -> Dict[str, int]:
-        """Process nodes in batches using Graph-First approach"""
+    async def _run_checkpointed(self, phase: str, entities: List[Any],
+                                checkpoint: Optional[IngestionCheckpoint],
+                                process: Any, batch_size: Optional[int] = None) -> int:
+        """
+        Run ``process`` over ``entities`` in checkpoint batches (default
+        ``config.checkpoint_batch_size``), recording each batch once it has
+        committed and skipping batches an interrupted run already recorded.
+        ``entities`` are objects with an ``id`` or plain id strings. Returns
+        the number of entities covered, skipped batches included.
+        """
+        batch_size = batch_size or self.config.checkpoint_batch_size
+        batches = [entities[start:start + batch_size] for start in range(0, len(entities), batch_size)]
+        
+        if checkpoint:
+            ids = (entity if isinstance(entity, str) else entity.id for entity in entities)
+            done = checkpoint.begin_phase(phase, phase_fingerprint(ids, batch_size), len(batches))
+            if done:
+                self.logger.info(f"Skipping {done} of {len(batches)} {phase} batches committed by an earlier run")
+        
+        for index, batch in enumerate(batches):
+            if checkpoint and checkpoint.is_done(phase, index):
+                continue
+            await process(batch)
+            if checkpoint:
+                checkpoint.mark_done(phase, index)
+        
+        return len(entities)
+    
+    async def _process_nodes_batch(self, nodes: List[UCONode],
+                                   checkpoint: Optional[IngestionCheckpoint] = None,
+                                   phase: str = "nodes") -> Dict[str, int]:
+        """Process nodes using Graph-First approach: each batch is written, then announced"""
         
         processed = 0
-        batch = []
         
-        for node in nodes:
-            batch.append(node)
-            
-            if len(batch) >= self.config.batch_size:
-                await self._create_neo4j_nodes(batch)
-                await self._publish_node_events(batch)
-                processed += len(batch)
-                batch = []
-                
-                self.logger.info(f"Processed {processed} nodes...")
-        
-        # Process remaining nodes
-        if batch:
+        async def process(batch: List[UCONode]) -> None:
+            nonlocal processed
             await self._create_neo4j_nodes(batch)
             await self._publish_node_events(batch)
+            # The batch only counts as committed once its events are out too
+            await self.events.flush()
             processed += len(batch)
+            
+            self.logger.info(f"Processed {processed} nodes...")
         
-        return {"nodes": processed}
+        return {"nodes": await self._run_checkpointed(phase, list(nodes), checkpoint, process)}
     
     async def _create_neo4j_nodes(self, nodes: List[UCONode]) -> None:
-        """Create nodes in Neo4j (Graph-First)"""
+        """MERGE nodes into Neo4j (Graph-First), concurrently across labels"""
         
-        # Group nodes by type for efficient batch creation
-        nodes_by_type = {}
-        for node in nodes:
-            node_type = self._get_neo4j_label(node.mitre_type)
-            if node_type not in nodes_by_type:
-                nodes_by_type[node_type] = []
-            nodes_by_type[node_type].append(node)
-        
-        # Create nodes by type
-        for node_type, type_nodes in nodes_by_type.items():
-            cypher_query = self._build_node_creation_query(node_type, type_nodes)
-            
-            # In real implementation:
-            # async with self.neo4j_driver.session() as session:
-            #     await session.run(cypher_query, {"nodes": [asdict(node) for node in type_nodes]})
-            
-            self.logger.debug(f"Created {len(type_nodes)} {node_type} nodes in Neo4j")
+        written = await self.neo4j_writer.write_nodes(nodes)
+        self.logger.debug(f"Merged {written} nodes into Neo4j")
     
     def _get_neo4j_label(self, mitre_type: str) -> str:
         """Convert MITRE type to Neo4j label"""
-        label_mapping = {
-            'attack-pattern': 'AttackPattern',
-            'malware': 'Malware',
-            'intrusion-set': 'ThreatActor',
-            'course-of-action': 'Mitigation',
-            'tool': 'Tool',
-            'campaign': 'Campaign',
-            'x-mitre-tactic': 'Tactic',
-            'x-mitre-asset': 'ICSAsset',
-            'x-mitre-data-source': 'DataSource',
-            'x-mitre-data-component': 'DataComponent',
-            'x-mitre-matrix': 'Matrix',
-            'x-mitre-collection': 'Collection'
-        }
-        return label_mapping.get(mitre_type, 'MitreObject')
-    
-    def _build_node_creation_query(self, node_type: str, nodes: List[UCONode]) -> str:
-        """Build Cypher query for batch node creation"""
-        
-        return f"""
-        UNWIND $nodes AS nodeData
-        CREATE (n:{node_type} {{
-            id: nodeData.id,
-            mitre_id: nodeData.mitre_id,
-            name: nodeData.name,
-            description: nodeData.description,
-            mitre_type: nodeData.mitre_type,
-            uco_type: nodeData.uco_type,
-            source_dataset: nodeData.source_dataset,
-            created: datetime(),
-            properties: nodeData.properties
-        }})
-        SET n += nodeData.properties
-        """
+        return neo4j_label(mitre_type)
+    
+    async def _delete_neo4j_entities(self, node_ids: List[str], relationship_ids: List[str],
+                                     relationship_endpoints: Optional[Dict[str, List[str]]] = None) -> None:
+        """Delete nodes and relationships dropped from the dataset since the previous release"""
+        
+        await self.neo4j_writer.delete(node_ids, relationship_ids, relationship_endpoints)
+        
+        if relationship_ids:
+            self.logger.info(f"Deleted {len(relationship_ids)} relationships removed since previous release")
+        if node_ids:
+            self.logger.info(f"Deleted {len(node_ids)} nodes removed since previous release")
     
     async def _publish_node_events(self, nodes: List[UCONode]) -> None:
-        """Publish node creation events to Redis streams for async processing"""
+        """Queue node creation events for the node, vectorization and search streams"""
         
         for node in nodes:
             event_data = {
@@ -345,72 +620,35 @@ class UnifiedIngestionPipeline:
                 'source_dataset': node.source_dataset,
                 'timestamp': datetime.now().isoformat()
             }
-            
-            # In real implementation:
-            # await self.redis_client.xadd("mitre_node_updates", event_data)
-            # await self.redis_client.xadd("vectorization_queue", event_data)
-            # await self.redis_client.xadd("elasticsearch_queue", event_data)
-            
-            self.logger.debug(f"Published events for node {node.id}")
+            await self.events.publish(NODE_EVENT_STREAMS, event_data)
+        
+        self.logger.debug(f"Queued events for {len(nodes)} nodes")
     
-    async def _process_relationships_batch(self, relationships: List[UCORelationship]) -> Dict[str, int]:
-        """Process relationships in batches"""
+    async def _process_relationships_batch(self, relationships: List[UCORelationship],
+                                           checkpoint: Optional[IngestionCheckpoint] = None,
+                                           phase: str = "relationships") -> Dict[str, int]:
+        """Write relationships batch by batch, publishing each batch's events"""
         
-        processed = 0
-        batch = []
+        labels = node_label_map(self.converter.converted_nodes.values())
         
-        for rel in relationships:
-            batch.append(rel)
-            
-            if len(batch) >= self.config.batch_size:
-                await self._create_neo4j_relationships(batch)
-                await self._publish_relationship_events(batch)
-                processed += len(batch)
-                batch = []
-        
-        # Process remaining relationships
-        if batch:
-            await self._create_neo4j_relationships(batch)
+        async def process(batch: List[UCORelationship]) -> None:
+            await self._create_neo4j_relationships(batch, labels)
             await self._publish_relationship_events(batch)
-            processed += len(batch)
+            await self.events.flush()
         
-        return {"relationships": processed}
+        return {"relationships": await self._run_checkpointed(phase, list(relationships), checkpoint, process)}
     
-    async def _create_neo4j_relationships(self, relationships: List[UCORelationship]) -> None:
-        """Create relationships in Neo4j"""
-        
-        # Group relationships by type for efficient creation
-        rels_by_type = {}
-        for rel in relationships:
-            rel_type = rel.relationship_type.upper().replace('-', '_')
-            if rel_type not in rels_by_type:
-                rels_by_type[rel_type] = []
-            rels_by_type[rel_type].append(rel)
-        
-        # Create relationships by type
-        for rel_type, type_rels in rels_by_type.items():
-            cypher_query = f"""
-            UNWIND $relationships AS relData
-            MATCH (source {{id: relData.source_ref}})
-            MATCH (target {{id: relData.target_ref}})
-            CREATE (source)-[r:{rel_type} {{
-                id: relData.id,
-                relationship_type: relData.relationship_type,
-                uco_relationship_type: relData.uco_relationship_type,
-                source_dataset: relData.source_dataset,
-                created: datetime()
-            }}]->(target)
-            SET r += relData.properties
-            """
-            
-            # In real implementation:
-            # async with self.neo4j_driver.session() as session:
-            #     await session.run(cypher_query, {"relationships": [asdict(rel) for rel in type_rels]})
-            
-            self.logger.debug(f"Created {len(type_rels)} {rel_type} relationships in Neo4j")
+    async def _create_neo4j_relationships(self, relationships: List[UCORelationship],
+                                          labels: Optional[Dict[str, str]] = None) -> None:
+        """MERGE relationships into Neo4j, concurrently across (source label, type, target label) groups"""
+        
+        if labels is None:
+            labels = node_label_map(self.converter.converted_nodes.values())
+        written = await self.neo4j_writer.write_relationships(relationships, labels)
+        self.logger.debug(f"Merged {written} relationships into Neo4j")
     
     async def _publish_relationship_events(self, relationships: List[UCORelationship]) -> None:
-        """Publish relationship events for downstream processing"""
+        """Queue relationship events for downstream processing"""
         
         for rel in relationships:
             event_data = {
@@ -422,11 +660,9 @@ class UnifiedIngestionPipeline:
                 'source_dataset': rel.source_dataset,
                 'timestamp': datetime.now().isoformat()
             }
-            
-            # In real implementation:
-            # await self.redis_client.xadd("mitre_relationship_updates", event_data)
-            
-            self.logger.debug(f"Published event for relationship {rel.id}")
+            await self.events.publish(RELATIONSHIP_EVENT_STREAMS, event_data)
+        
+        self.logger.debug(f"Queued events for {len(relationships)} relationships")
     
     async def run_async_workers(self) -> None:
         """Start asynchronous workers for vectorization and indexing"""
@@ -440,25 +676,25 @@ class UnifiedIngestionPipeline:
         
         await asyncio.gather(*workers)
     
-    async def _vectorization_worker(self) -> None:
-        """Worker for generating embeddings and storing in Qdrant"""
+    async def _vectorization_worker(self, stop: Optional[asyncio.Event] = None,
+                                    idle_timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Worker for generating embeddings and storing them in the vector store"""
         self.logger.info("Vectorization worker started")
         
-        # In real implementation:
-        # while True:
-        #     try:
-        #         messages = await self.redis_client.xreadgroup(
-        #             "processors", "vectorization", {"vectorization_queue": ">"}, count=10, block=1000
-        #         )
-        #         
-        #         for stream, msgs in messages:
-        #             for msg_id, fields in msgs:
-        #                 await self._process_vectorization_event(fields)
-        #                 await self.redis_client.xack("vectorization_queue", "processors", msg_id)
-        #     
-        #     except Exception as e:
-        #         self.logger.error(f"Vectorization worker error: {e}")
-        #         await asyncio.sleep(5)
+        self.vectorization_worker = VectorizationWorker(
+            self.event_bus,
+            self.embedder,
+            self.vector_store,
+            batch_size=self.config.vectorization_batch_size,
+            max_wait=self.config.vectorization_max_wait,
+            concurrency=self.config.vectorization_concurrency,
+            cache_dir=self.config.vector_cache_dir
+        )
+        report = await self.vectorization_worker.run(stop=stop, idle_timeout=idle_timeout)
+        
+        self.logger.info(f"Vectorization worker stopped: {report['upserted']} vectors, "
+                         f"{report['vectors_per_second']} vectors/sec")
+        return report
     
     async def _elasticsearch_worker(self) -> None:
         """Worker for indexing content in Elasticsearch"""
@@ -485,14 +721,25 @@ class UnifiedIngestionPipeline:
             'total_relationships': self.stats['relationships_processed'],
             'enterprise_nodes': 0,  # Query Neo4j
             'ics_nodes': 0,         # Query Neo4j
-            'cross_references': self.stats['cross_references_created']
+            'cross_references': self.stats['cross_references_created'],
+            'writes': self.neo4j_writer.stats.summary()
         }
         
         return {
             'neo4j': neo4j_stats,
+            'events': dict(self.events.stats),
+            'vectorization': self.vectorization_worker.report() if self.vectorization_worker else None,
             'processing_stats': self.stats,
             'timestamp': datetime.now().isoformat()
         }
+    
+    async def close(self) -> None:
+        """Flush pending events and close the Neo4j, event bus and vector store connections"""
+        try:
+            await self.events.close()
+        finally:
+            await self.neo4j_writer.close()
+            await self.vector_store.close()
 
 async def main():
     """Main execution function for testing"""
@@ -528,6 +775,8 @@ async def main():
     except Exception as e:
         logging.error(f"Pipeline error: {e}")
         raise
+    finally:
+        await pipeline.close()
 
 if __name__ == "__main__":
     # Test the UCO conversion
@@ -0,0 +1,329 @@
+"""
+Vectorization Worker
+Consumes node events from the event bus in size- and time-bounded
+micro-batches, embeds only content without a stored vector, and upserts the
+vectors to the vector store in bulk
+"""
+
+import asyncio
+import time
+import uuid
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from embedding_similarity import VectorCache, encode_cached, text_key
+
+# Neo4j label -> vector store collection; events for other labels are acknowledged and skipped
+VECTOR_COLLECTIONS = {
+    'AttackPattern': 'attack_patterns',
+    'ThreatActor': 'threat_actors',
+    'Malware': 'malware',
+    'Tool': 'tools',
+    'Campaign': 'campaigns',
+    'ICSAsset': 'ics_assets'
+}
+
+
+def embedding_model_key(embedder: Any) -> str:
+    """Vectors are only interchangeable between identical model name and dimension"""
+    return f'{embedder.name}/{embedder.dimensions}'
+
+
+@dataclass
+class VectorPoint:
+    """One node's vector and the payload stored alongside it"""
+    node_id: str
+    vector: Sequence[float]
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+class InMemoryVectorStore:
+    """Vector store stand-in for tests and single-node runs: collection -> node id -> point"""
+
+    def __init__(self):
+        self.collections: Dict[str, Dict[str, VectorPoint]] = {}
+        self.upsert_calls = 0
+
+    async def ensure_collection(self, name: str, size: int, distance: str = 'Cosine') -> None:
+        self.collections.setdefault(name, {})
+
+    async def upsert(self, collection: str, points: List[VectorPoint]) -> None:
+        self.upsert_calls += 1
+        stored = self.collections.setdefault(collection, {})
+        for point in points:
+            stored[point.node_id] = point
+
+    async def find_vectors(self, collection: str, content_hashes: Sequence[str],
+                           model: str) -> Dict[str, Sequence[float]]:
+        """Stored vectors by content hash, for points embedded with ``model``"""
+        wanted = set(content_hashes)
+        return {point.payload['content_hash']: point.vector
+                for point in self.collections.get(collection, {}).values()
+                if point.payload.get('model') == model and point.payload.get('content_hash') in wanted}
+
+    async def close(self) -> None:
+        pass
+
+
+class QdrantVectorStore:
+    """
+    Qdrant backend. Point ids are UUIDs derived from node ids, so replayed
+    events overwrite instead of duplicating. Collections get keyword
+    payload indexes on content_hash and model for find_vectors. The client
+    is created on first use, so building a pipeline does not require
+    qdrant-client.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                from qdrant_client import AsyncQdrantClient
+            except ImportError as exc:
+                raise ImportError("QdrantVectorStore requires the qdrant-client package") from exc
+            self._client = AsyncQdrantClient(url=self.url)
+        return self._client
+
+    async def ensure_collection(self, name: str, size: int, distance: str = 'Cosine') -> None:
+        from qdrant_client.models import Distance, PayloadSchemaType, VectorParams
+        client = self._get_client()
+        if not await client.collection_exists(name):
+            await client.create_collection(name, vectors_config=VectorParams(size=size, distance=Distance(distance)))
+            for key in ('content_hash', 'model'):
+                await client.create_payload_index(name, field_name=key, field_schema=PayloadSchemaType.KEYWORD)
+
+    async def upsert(self, collection: str, points: List[VectorPoint]) -> None:
+        from qdrant_client.models import PointStruct
+        await self._get_client().upsert(
+            collection_name=collection,
+            points=[PointStruct(id=str(uuid.uuid5(uuid.NAMESPACE_URL, point.node_id)),
+                                vector=list(point.vector), payload=dict(point.payload, node_id=point.node_id))
+                    for point in points],
+            wait=True
+        )
+
+    async def find_vectors(self, collection: str, content_hashes: Sequence[str],
+                           model: str) -> Dict[str, Sequence[float]]:
+        """Stored vectors by content hash, for points embedded with ``model``"""
+        from qdrant_client.models import FieldCondition, Filter, MatchAny, MatchValue
+        if not content_hashes:
+            return {}
+        query = Filter(must=[FieldCondition(key='content_hash', match=MatchAny(any=list(content_hashes))),
+                             FieldCondition(key='model', match=MatchValue(value=model))])
+        found: Dict[str, Sequence[float]] = {}
+        offset = None
+        while True:
+            points, offset = await self._get_client().scroll(
+                collection_name=collection, scroll_filter=query, limit=256, offset=offset,
+                with_payload=['content_hash'], with_vectors=True)
+            for point in points:
+                found[point.payload['content_hash']] = point.vector
+            if offset is None:
+                return found
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class VectorizationWorker:
+    """
+    Turns node events on ``stream`` into stored vectors.
+
+    Events are read through a consumer group into micro-batches that close
+    at ``batch_size`` events or ``max_wait`` seconds after their first
+    event, whichever comes first. Up to ``concurrency`` batches are in
+    progress at once; embedding runs in a thread so a slow or remote model
+    does not stall reading. Texts whose SHA-256 already has a vector for
+    this model and dimension are not embedded again: the local VectorCache
+    under ``cache_dir`` is checked first, then the store (``find_vectors``
+    on the content_hash and model payload), so workers on other hosts or
+    with a fresh cache reuse what is already stored. Each batch is upserted
+    with one call per collection and acknowledged only after the upsert
+    succeeds.
+
+    Unacknowledged events stay pending for this ``consumer``: ``run``
+    first replays the consumer's pending entries, so a worker restarted
+    under the same consumer name picks up what a crash or a failed batch
+    left behind. A failed batch stops the run: batches in progress are
+    finished and the first error is raised.
+    """
+
+    def __init__(self, bus: Any, embedder: Any, store: Any, stream: str = 'vectorization_queue',
+                 group: str = 'processors', consumer: str = 'vectorizer-1', batch_size: int = 64,
+                 max_wait: float = 0.5, concurrency: int = 2, cache_dir: Optional[str] = 'vector_cache',
+                 poll_ms: int = 1000):
+        self.bus = bus
+        self.embedder = embedder
+        self.store = store
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.poll_ms = poll_ms
+        self.model_key = embedding_model_key(embedder)
+        self.cache = VectorCache(cache_dir, self.model_key)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._last_done = 0.0
+        # Id after which to replay this consumer's pending entries; None once they are drained
+        self._pending_cursor: Optional[str] = None
+        self.stats = {
+            'events': 0,
+            'batches': 0,
+            'embedded': 0,
+            'deduplicated': 0,
+            'store_hits': 0,
+            'skipped': 0,
+            'upserted': 0,
+            'embed_seconds': 0.0,
+            'elapsed_seconds': 0.0
+        }
+
+    async def _next_batch(self) -> List[Tuple[str, Dict[str, str]]]:
+        """Events until the batch is full or max_wait has passed since its first event;
+        empty if nothing arrived within one poll"""
+        if self._pending_cursor is not None:
+            entries = await self.bus.read_group(self.stream, self.group, self.consumer,
+                                                count=self.batch_size, pending_after=self._pending_cursor)
+            if entries:
+                self._pending_cursor = entries[-1][0]
+                return entries
+            self._pending_cursor = None
+
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[str, Dict[str, str]]] = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            if deadline is None:
+                block_ms = self.poll_ms
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                block_ms = max(1, int(remaining * 1000))  # 0 would block forever on Redis
+            entries = await self.bus.read_group(self.stream, self.group, self.consumer,
+                                                count=self.batch_size - len(batch), block_ms=block_ms)
+            if entries:
+                batch.extend(entries)
+                if deadline is None:
+                    deadline = loop.time() + self.max_wait
+            elif deadline is None:
+                break
+        return batch
+
+    async def _process(self, batch: List[Tuple[str, Dict[str, str]]]) -> None:
+        try:
+            events = [(fields, VECTOR_COLLECTIONS.get(fields.get('neo4j_label')))
+                      for _, fields in batch]
+            wanted = [(fields, collection) for fields, collection in events
+                      if collection and fields.get('content')]
+            texts = [fields['content'] for fields, _ in wanted]
+            keys = [text_key(text) for text in texts]
+            store_hits = await self._fetch_stored(wanted, keys)
+
+            started = time.perf_counter()
+            vectors, encoded = await asyncio.to_thread(
+                encode_cached, self.embedder, texts, self.cache, self.batch_size, False)
+            self.stats['embed_seconds'] += time.perf_counter() - started
+
+            by_collection: Dict[str, List[VectorPoint]] = {}
+            for (fields, collection), key, vector in zip(wanted, keys, vectors):
+                payload = {
+                    'neo4j_label': fields.get('neo4j_label'),
+                    'source_dataset': fields.get('source_dataset'),
+                    'content_hash': key,
+                    'model': self.model_key
+                }
+                by_collection.setdefault(collection, []).append(VectorPoint(fields['node_id'], vector, payload))
+            for collection, points in by_collection.items():
+                await self.store.upsert(collection, points)
+
+            await self.bus.ack(self.stream, self.group, [entry_id for entry_id, _ in batch])
+            self.stats['events'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['embedded'] += encoded
+            # Texts repeated within the batch, cached or already stored were not embedded
+            self.stats['deduplicated'] += len(texts) - encoded
+            self.stats['store_hits'] += store_hits
+            self.stats['skipped'] += len(batch) - len(wanted)
+            self.stats['upserted'] += len(wanted)
+        finally:
+            self._last_done = asyncio.get_running_loop().time()
+            self._slots.release()
+
+    async def _fetch_stored(self, wanted: List[Tuple[Dict[str, str], str]], keys: List[str]) -> int:
+        """Copy vectors the store already holds for uncached texts into the cache; returns how many"""
+        lookups: Dict[str, set] = {}
+        for (_, collection), key in zip(wanted, keys):
+            if key not in self.cache:
+                lookups.setdefault(collection, set()).add(key)
+        found = 0
+        for collection, hashes in lookups.items():
+            stored = await self.store.find_vectors(collection, sorted(hashes), self.model_key)
+            for key, vector in stored.items():
+                if key not in self.cache:
+                    self.cache.put(key, array('f', vector))
+                    found += 1
+        return found
+
+    async def run(self, stop: Optional[asyncio.Event] = None, idle_timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Process events until ``stop`` is set, or until no event arrived for
+        ``idle_timeout`` seconds (drain mode). Returns the throughput report;
+        its run time counts from the first event to the last finished batch,
+        so idle polling does not dilute vectors/sec. Re-raises the first
+        batch failure once the batches in progress have finished; the failed
+        events stay pending for the next run.
+        """
+        await self.bus.ensure_group(self.stream, self.group)
+        self._pending_cursor = '0'
+        loop = asyncio.get_running_loop()
+        last_event = loop.time()
+        first_event = None
+        tasks: set = set()
+        errors: List[BaseException] = []
+
+        def finished(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())
+
+        try:
+            while (stop is None or not stop.is_set()) and not errors:
+                batch = await self._next_batch()
+                if not batch:
+                    if idle_timeout is not None and loop.time() - last_event >= idle_timeout:
+                        break
+                    continue
+                last_event = loop.time()
+                if first_event is None:
+                    first_event = last_event
+                await self._slots.acquire()
+                task = asyncio.ensure_future(self._process(batch))
+                tasks.add(task)
+                task.add_done_callback(finished)
+        finally:
+            if tasks:
+                # Failures land in errors through finished()
+                await asyncio.gather(*list(tasks), return_exceptions=True)
+            self.cache.save()
+            if first_event is not None:
+                self.stats['elapsed_seconds'] += max(0.0, self._last_done - first_event)
+        if errors:
+            raise errors[0]
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        """Counters plus vectors/sec over wall-clock run time and over embedding time alone"""
+        report = dict(self.stats)
+        elapsed = self.stats['elapsed_seconds']
+        embed_seconds = self.stats['embed_seconds']
+        report['vectors_per_second'] = round(self.stats['upserted'] / elapsed, 1) if elapsed else 0.0
+        report['embedded_per_second'] = round(self.stats['embedded'] / embed_seconds, 1) if embed_seconds else 0.0
+        return report